@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the debug agent
+
+Runs debug_client.py commands as separate processes, the way they're run
+from a shell, once with the agent disabled (DEBUG_CLIENT_NO_AGENT) and once
+forwarded to a warm agent on a temporary socket, and reports the median and
+p90 wall time of each.
+
+By default it runs against an in-process stand-in server (mock_server.py)
+with optional added latency; --server targets a real debug server instead.
+
+Usage:
+  python3 benchmarks/bench_agent.py [--runs N] [--latency SPEC]
+  python3 benchmarks/bench_agent.py --server http://localhost:3000/api/debug-server
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from debug_client import Colors
+from mock_server import MockServerState, start_server
+
+CLIENT = os.path.join(ROOT, "debug_client.py")
+AGENT = os.path.join(ROOT, "debug_agent.py")
+
+def time_command(argv: List[str], env: Dict[str, str], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLIENT] + argv, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    return {"median": timings[len(timings) // 2], "p90": timings[min(len(timings) - 1, int(len(timings) * 0.9))]}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold vs. agent-forwarded debug_client.py benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Runs of each command in each mode")
+    parser.add_argument("--latency", help="Added stand-in latency per request, e.g. fixed:20")
+    parser.add_argument("--server", help="Debug server URL (default: in-process stand-in)")
+    args = parser.parse_args()
+
+    server: Optional[Any] = None
+    server_url = args.server
+    if not server_url:
+        server, base_url = start_server(state=MockServerState(latency=args.latency))
+        server_url = f"{base_url}/api/debug-server"
+
+    workdir = tempfile.mkdtemp(prefix="bench-agent-")
+    socket = os.path.join(workdir, "agent.sock")
+    cache = ["--server", server_url, "--cache-dir", os.path.join(workdir, "cache")]
+    commands = {
+        "help": ["help"],
+        "test": ["--server", server_url, "test"],
+        "logs": cache + ["logs", "--limit", "20"],
+        "logs --no-cache": ["--server", server_url, "logs", "--no-cache", "--limit", "20"],
+    }
+    env = dict(os.environ, DEBUG_AGENT_SOCKET=socket)
+    cold_env = dict(env, DEBUG_CLIENT_NO_AGENT="1")
+
+    print(f"{Colors.BOLD}Running each command {args.runs} times against {server_url}{Colors.RESET}")
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    try:
+        for name, argv in commands.items():
+            results[name] = {"cold": summarize(time_command(argv, cold_env, args.runs))}
+        subprocess.run([sys.executable, AGENT, "start", "--socket", socket],
+                       env=env, stdout=subprocess.DEVNULL, check=True)
+        try:
+            for name, argv in commands.items():
+                time_command(argv, env, 1)  # first forwarded run opens the agent's connection
+                results[name]["agent"] = summarize(time_command(argv, env, args.runs))
+        finally:
+            subprocess.run([sys.executable, AGENT, "stop", "--socket", socket], env=env, stdout=subprocess.DEVNULL)
+    finally:
+        if server:
+            server.shutdown()
+
+    print(f"  {'command':<16} {'cold p50':>9} {'p90':>7} {'agent p50':>10} {'p90':>7}")
+    for name, result in results.items():
+        cold, agent = result["cold"], result["agent"]
+        print(f"  {name:<16} {cold['median']:>7.0f}ms {cold['p90']:>5.0f}ms "
+              f"{agent['median']:>8.0f}ms {agent['p90']:>5.0f}ms  "
+              f"{Colors.GREEN}{cold['median'] / agent['median']:.1f}x{Colors.RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for log ingestion
+
+Sends the same entries to the debug server one request per entry
+(DebugServerClient.add_log) and through BatchingLogger (log_batch), and
+reports entries/sec and requests made for each mode.
+
+By default it runs against an in-process stand-in server (mock_server.py)
+with optional added latency; --server targets a real debug server instead.
+
+Usage:
+  python3 benchmarks/bench_ingest.py [--entries N] [--batch-size N] [--latency SPEC]
+  python3 benchmarks/bench_ingest.py --server http://localhost:3000/api/debug-server
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from debug_client import DEFAULT_API_KEY, Colors, DebugServerClient
+from log_batch import DEFAULT_BATCH_SIZE
+from mock_server import MockServerState, start_server
+
+def make_entries(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"type": "info", "message": f"Diagnostic step {i}", "data": {"step": i, "form_name": "contactPage"}}
+        for i in range(count)
+    ]
+
+def run_single(client: DebugServerClient, entries: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for entry in entries:
+        client.add_log(entry["type"], entry["message"], entry["data"])
+    return time.perf_counter() - start
+
+def run_batched(client: DebugServerClient, entries: List[Dict[str, Any]], batch_size: int) -> float:
+    start = time.perf_counter()
+    with client.batch_logger(batch_size=batch_size) as logger:
+        for entry in entries:
+            logger.log(entry["type"], entry["message"], entry["data"])
+    return time.perf_counter() - start
+
+def measure(server_url: str, api_key: str, mode: str, entries: List[Dict[str, Any]], batch_size: int) -> Dict[str, Any]:
+    with DebugServerClient(server_url, api_key) as client:
+        if mode == "single":
+            elapsed = run_single(client, entries)
+        else:
+            elapsed = run_batched(client, entries, batch_size)
+        requests_made = client.connection_stats()["requests"]
+    return {"elapsed": elapsed, "rate": len(entries) / elapsed, "requests": requests_made}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single vs. batched log ingestion benchmark")
+    parser.add_argument("--entries", type=int, default=2000, help="Entries to send in each mode")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="BatchingLogger batch size")
+    parser.add_argument("--latency", help="Added stand-in latency per request, e.g. fixed:5")
+    parser.add_argument("--server", help="Debug server URL (default: in-process stand-in)")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="API key for the debug server")
+    args = parser.parse_args()
+
+    server: Optional[Any] = None
+    server_url = args.server
+    if not server_url:
+        server, base_url = start_server(state=MockServerState(latency=args.latency, max_logs=args.entries))
+        server_url = f"{base_url}/api/debug-server"
+
+    entries = make_entries(args.entries)
+    print(f"{Colors.BOLD}Ingesting {args.entries} entries into {server_url}{Colors.RESET}")
+    try:
+        results = {mode: measure(server_url, args.api_key, mode, entries, args.batch_size)
+                   for mode in ("single", "batched")}
+    finally:
+        if server:
+            server.shutdown()
+
+    for mode, result in results.items():
+        print(f"  {mode:>8}: {result['rate']:>10,.0f} entries/sec  "
+              f"{result['requests']:>6} requests  {result['elapsed']:.2f}s")
+    speedup = results["batched"]["rate"] / results["single"]["rate"]
+    print(f"  {Colors.GREEN}{speedup:.1f}x{Colors.RESET} faster with batch size {args.batch_size}")
+
+if __name__ == "__main__":
+    main()
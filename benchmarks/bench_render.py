@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for log rendering
+
+Compares the original per-entry format_log_entry/print loop used by
+`debug_client.py logs` with log_render.LogRenderer on a synthetic corpus,
+and reports entries/sec for compact and --verbose output.
+
+Usage:
+  python3 benchmarks/bench_render.py [--entries N] [--data-size BYTES]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_render import Colors, LogRenderer, orjson
+
+def make_corpus(count: int, data_size: int = 200, seed: int = 1) -> List[Dict[str, Any]]:
+    """Synthetic log entries shaped like the debug server's, newest first"""
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    types = ["info", "success", "error", "warn"]
+    logs = []
+    for i in range(count):
+        moment = start + timedelta(milliseconds=i * 750)
+        log_type = rng.choice(types)
+        logs.append({
+            "id": str(int(moment.timestamp() * 1000)),
+            "timestamp": moment.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "type": log_type,
+            "message": f"FormSpree response for contactPage: {rng.choice([200, 400, 422, 500])}",
+            "data": {
+                "form_name": "contactPage",
+                "status": rng.choice([200, 400, 422, 500]),
+                "form_data": {
+                    "name": "Test User",
+                    "email": f"user{rng.randint(1, 5000)}@example.com",
+                    "message": "x" * data_size,
+                },
+            },
+        })
+    logs.reverse()
+    return logs
+
+# The rendering path as it was before log_render, kept as the baseline
+def _legacy_terminal_width() -> int:
+    try:
+        import shutil
+        return shutil.get_terminal_size().columns
+    except:
+        return 80
+
+def _legacy_format_log_entry(log: Dict[str, Any], verbose: bool = False) -> str:
+    timestamp = datetime.fromisoformat(log.get("timestamp", "").replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
+    log_type = log.get("type", "unknown")
+    type_color = Colors.GRAY
+    if log_type == "error":
+        type_color = Colors.RED
+    elif log_type == "success":
+        type_color = Colors.GREEN
+    elif log_type == "info":
+        type_color = Colors.BLUE
+    elif log_type == "warn":
+        type_color = Colors.YELLOW
+    message = log.get("message", "No message")
+    result = f"{Colors.GRAY}{timestamp}{Colors.RESET} [{type_color}{log_type.upper()}{Colors.RESET}] {message}"
+    if verbose and log.get("data"):
+        data_str = json.dumps(log["data"], indent=2)
+        indent = " " * 4
+        data_formatted = "\n".join(f"{indent}{line}" for line in data_str.split("\n"))
+        result += f"\n{Colors.GRAY}{data_formatted}{Colors.RESET}"
+    return result
+
+def legacy_render(logs: List[Dict[str, Any]], verbose: bool, out: io.StringIO) -> None:
+    for log in logs:
+        print(_legacy_format_log_entry(log, verbose), file=out)
+        print("-" * _legacy_terminal_width(), file=out)
+
+def fast_render(logs: List[Dict[str, Any]], verbose: bool, out: io.StringIO) -> None:
+    LogRenderer(verbose=verbose, width=80).write(logs, out)
+
+def measure(render: Callable[[List[Dict[str, Any]], bool, io.StringIO], None], logs: List[Dict[str, Any]],
+            verbose: bool, repeat: int = 3) -> float:
+    """Best-of-N entries/sec"""
+    best = float("inf")
+    for _ in range(repeat):
+        out = io.StringIO()
+        start = time.perf_counter()
+        render(logs, verbose, out)
+        best = min(best, time.perf_counter() - start)
+    return len(logs) / best
+
+def run(entries: int = 20000, data_size: int = 200) -> Dict[str, Any]:
+    logs = make_corpus(entries, data_size)
+    results = {}
+    for verbose in (False, True):
+        label = "verbose" if verbose else "compact"
+        before = measure(legacy_render, logs, verbose)
+        after = measure(fast_render, logs, verbose)
+        results[label] = {"before": before, "after": after, "speedup": after / before}
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Log rendering micro-benchmark")
+    parser.add_argument("--entries", type=int, default=20000, help="Number of synthetic entries")
+    parser.add_argument("--data-size", type=int, default=200, help="Size of each entry's message payload")
+    args = parser.parse_args()
+
+    print(f"{Colors.BOLD}Rendering {args.entries} entries "
+          f"(orjson {'available' if orjson else 'not installed'}){Colors.RESET}")
+    for label, result in run(args.entries, args.data_size).items():
+        print(f"  {label:>8}: {result['before']:>10,.0f} -> {result['after']:>10,.0f} entries/sec "
+              f"({Colors.GREEN}{result['speedup']:.1f}x{Colors.RESET})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env node
+/**
+ * Server-side cost of the /api/speed-test/download payload
+ *
+ * Times each way of producing one download body, per request:
+ *
+ *   math-random  the original per-byte Math.random loop into a new buffer
+ *   random-fill  crypto.randomFillSync into a new buffer
+ *   cached       a view of a block filled once (src/lib/speed-test-payload.ts)
+ *
+ * alone, and together with wrapping it in a Response and reading that back,
+ * which is roughly what a request costs the route beyond the socket writes.
+ *
+ * Usage:
+ *   node benchmarks/bench_speed_payload.mjs [--size MB] [--repeat N]
+ */
+import { randomFillSync } from "crypto";
+
+function option(name, fallback) {
+  const index = process.argv.indexOf(name);
+  return index === -1 ? fallback : Number(process.argv[index + 1]);
+}
+
+const size = Math.round(option("--size", 5) * 1024 * 1024);
+const repeat = option("--repeat", 10);
+
+let block = null;
+
+const strategies = {
+  "math-random": () => {
+    const view = new Uint8Array(size);
+    for (let i = 0; i < size; i++) {
+      view[i] = Math.floor(Math.random() * 256);
+    }
+    return view;
+  },
+  "random-fill": () => randomFillSync(new Uint8Array(size)),
+  cached: () => {
+    if (!block) {
+      block = randomFillSync(new Uint8Array(size));
+    }
+    return block.subarray(0, size);
+  },
+};
+
+// Median of `repeat` timings in milliseconds
+async function time(func) {
+  const samples = [];
+  for (let i = 0; i < repeat; i++) {
+    const start = process.hrtime.bigint();
+    await func();
+    samples.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  samples.sort((a, b) => a - b);
+  return samples[Math.floor(samples.length / 2)];
+}
+
+console.log(
+  `Download payload of ${(size / 1024 / 1024).toFixed(1)} MB, median of ${repeat} runs`,
+);
+console.log(
+  `  ${"strategy".padEnd(12)} ${"generate ms".padStart(12)} ${"total ms".padStart(10)} ${"req/s/core".padStart(11)}`,
+);
+for (const [name, generate] of Object.entries(strategies)) {
+  generate(); // warm up (and fill the cache)
+  const generateMs = await time(generate);
+  const totalMs = await time(async () => {
+    await new Response(generate()).arrayBuffer();
+  });
+  const perSecond = 1000 / totalMs;
+  console.log(
+    `  ${name.padEnd(12)} ${generateMs.toFixed(2).padStart(12)} ${totalMs.toFixed(2).padStart(10)} ${perSecond.toFixed(1).padStart(11)}`,
+  );
+}
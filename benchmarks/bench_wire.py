@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Wire format benchmark for get_logs
+
+Serves a synthetic corpus from the in-process stand-in (or --server) and
+pages through all of it with each combination of body encoding (JSON,
+MessagePack), compression (none, gzip, brotli) and field selection (full
+entries, or the id/timestamp/type/message that non-verbose `logs` shows).
+Reports bytes on the wire, client-side decode time (decompress + parse)
+and end-to-end fetch time through DebugServerClient.
+
+MessagePack and brotli rows need the msgpack and brotli packages.
+
+Usage:
+  python3 benchmarks/bench_wire.py [--entries N] [--data-size BYTES] [--server URL]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_render import make_corpus
+from debug_client import DEFAULT_API_KEY, MSGPACK_TYPE, SUMMARY_FIELDS, Colors, DebugServerClient
+from mock_server import MAX_PAGE_SIZE, MockServerState, brotli, msgpack, start_server
+
+ENCODINGS = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+FORMATS = ["json"] + (["msgpack"] if msgpack is not None else [])
+WORDS = ("please", "call", "me", "about", "the", "quote", "for", "our", "office", "move", "next", "week",
+         "thanks", "budget", "is", "flexible", "can", "you", "send", "details", "on", "pricing", "timeline")
+
+def make_wire_corpus(count: int, data_size: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """bench_render's corpus with varied message text, so compression isn't flattered by repetition"""
+    rng = random.Random(seed)
+    logs = make_corpus(count, data_size, seed)
+    for log in logs:
+        words = []
+        while sum(len(word) + 1 for word in words) < data_size:
+            words.append(rng.choice(WORDS))
+        log["data"]["form_data"]["message"] = " ".join(words)
+        log["data"]["form_data"]["name"] = f"User {rng.randint(1, 99999)}"
+    return logs
+
+def decode(body: bytes, content_type: str, content_encoding: Optional[str]) -> Any:
+    if content_encoding == "gzip":
+        body = gzip.decompress(body)
+    elif content_encoding == "br":
+        body = brotli.decompress(body)
+    if content_type.startswith(MSGPACK_TYPE):
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+def fetch_raw(client: DebugServerClient, fields: Optional[List[str]]) -> List[Tuple[bytes, str, Optional[str]]]:
+    """Every page as it came off the wire: (body, Content-Type, Content-Encoding)"""
+    pages = []
+    cursor = None
+    while True:
+        request_data: Dict[str, Any] = {"limit": MAX_PAGE_SIZE, "before_id": cursor, "fields": fields}
+        response = client.session.post(client.server_url, json={"action": "get_logs", "data": request_data},
+                                       timeout=client.timeout, stream=True)
+        response.raise_for_status()
+        page = (response.raw.read(decode_content=False), response.headers.get("Content-Type", ""),
+                response.headers.get("Content-Encoding"))
+        pages.append(page)
+        cursor = decode(*page).get("next_cursor")
+        if not cursor:
+            return pages
+
+def best_of(repeat: int, func: Any) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure(server_url: str, api_key: str, body_format: str, encoding: str, fields: Optional[List[str]],
+            entries: int, repeat: int) -> Dict[str, Any]:
+    with DebugServerClient(server_url, api_key, accept_msgpack=body_format == "msgpack") as client:
+        client.session.headers["Accept-Encoding"] = encoding
+        pages = fetch_raw(client, fields)
+        decoded = sum(len(decode(*page)["logs"]) for page in pages)
+        if decoded != entries:
+            raise RuntimeError(f"expected {entries} entries, decoded {decoded}")
+        decode_time = best_of(repeat, lambda: [decode(*page) for page in pages])
+        fetch_time = best_of(repeat, lambda: list(client.iter_logs(page_size=MAX_PAGE_SIZE, fields=fields)))
+    return {
+        "bytes": sum(len(body) for body, _, _ in pages),
+        "decode": decode_time,
+        "fetch": fetch_time,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="get_logs wire format benchmark")
+    parser.add_argument("--entries", type=int, default=10000, help="Number of synthetic entries")
+    parser.add_argument("--data-size", type=int, default=200, help="Size of each entry's message payload")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per combination (best is kept)")
+    parser.add_argument("--server", help="Debug server URL already holding --entries entries "
+                                         "(default: in-process stand-in)")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="API key for the debug server")
+    args = parser.parse_args()
+
+    server: Optional[Any] = None
+    server_url = args.server
+    if not server_url:
+        state = MockServerState(max_logs=args.entries)
+        state.logs = make_wire_corpus(args.entries, args.data_size)
+        server, base_url = start_server(state=state)
+        server_url = f"{base_url}/api/debug-server"
+
+    print(f"{Colors.BOLD}Fetching {args.entries} entries from {server_url}{Colors.RESET}")
+    missing = [name for name, module in (("msgpack", msgpack), ("brotli", brotli)) if module is None]
+    if missing:
+        print(f"{Colors.GRAY}Skipping {' and '.join(missing)} (not installed){Colors.RESET}")
+    print(f"  {'fields':<8} {'format':<8} {'encoding':<9} {'bytes':>12} {'ratio':>7} "
+          f"{'decode ms':>10} {'fetch ms':>10}")
+    baseline = None
+    try:
+        for label, fields in (("full", None), ("summary", SUMMARY_FIELDS)):
+            for body_format in FORMATS:
+                for encoding in ENCODINGS:
+                    result = measure(server_url, args.api_key, body_format, encoding, fields,
+                                     args.entries, args.repeat)
+                    baseline = baseline or result["bytes"]
+                    print(f"  {label:<8} {body_format:<8} {encoding:<9} {result['bytes']:>12,} "
+                          f"{baseline / result['bytes']:>6.1f}x {result['decode'] * 1000:>10.1f} "
+                          f"{result['fetch'] * 1000:>10.1f}")
+    finally:
+        if server:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
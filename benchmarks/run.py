@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression suite for the Python tooling
+
+Runs the hot paths of debug_client.py and its log_* modules over synthetic
+log corpora of 1k, 100k and 1M entries, entirely offline (round-trips go
+to an in-process mock_server.py):
+
+  parse     JSON lines, timestamps
+  filter    log cache inserts and queries, search index builds and queries
+  render    LogRenderer compact/verbose, format_log_entry, clean_ansi
+  export    JSONL, gzipped JSONL, CSV and columnar exports
+  stats     log_stats aggregation
+  request   send_request round-trips, paging through get_logs
+  monitor   the cmd_monitor loop: poll new entries with a cursor and display
+            them; a flood through the coalescing display
+
+Corpora are generated deterministically in chunks, so memory stays flat
+at 1M entries; only the measured work is timed. Each case reports
+items/sec, the best of at least --repeat runs (quick cases are repeated
+for a second) within --max-time per case. Cases that
+keep every entry in memory or on the stand-in are capped and skipped for
+larger corpora.
+
+Results can be saved as a JSON baseline and later runs compared with it;
+a case more than --threshold slower than its baseline is a regression and
+makes the run exit with status 1. Baselines are only comparable on the
+same machine.
+
+Usage:
+  python3 benchmarks/run.py [--sizes 1k,100k] [--cases PREFIX ...]
+                            [--save-baseline] [--baseline PATH] [--threshold F]
+
+Examples:
+  python3 benchmarks/run.py --save-baseline
+  python3 benchmarks/run.py
+  python3 benchmarks/run.py --sizes 1k,100k,1m
+  python3 benchmarks/run.py --cases render export --sizes 1m
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from debug_client import DEFAULT_API_KEY, Colors, DebugServerClient, clean_ansi, format_log_entry
+from log_cache import LogCache
+from log_export import export_pages
+from log_monitor import MonitorDisplay
+from log_render import LogRenderer
+from log_search import LogSearchIndex
+from log_stats import LogStats, parse_timestamp
+from mock_server import MockServerState, start_server
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,100k"  # 1m takes several minutes
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.2  # fraction slower than the baseline that counts as a regression
+DEFAULT_REPEAT = 3
+MIN_TIME = 1.0  # keep repeating quick cases for this many seconds, so small corpora aren't noise
+DEFAULT_MAX_TIME = 5.0  # seconds per case and size; at least one run is always made
+CHUNK_SIZE = 10_000
+
+# Corpus shape
+BASE_ID = 1_714_521_600_000  # 2024-05-01T00:00:00Z in milliseconds
+ENTRY_INTERVAL_MS = 750
+FORMS = ("contactPage", "quoteRequest", "newsletter", "callback")
+STATUSES = (200, 200, 200, 200, 200, 400, 422, 500)
+WORDS = ("please", "call", "me", "about", "the", "quote", "for", "our", "office", "move", "next", "week",
+         "thanks", "budget", "is", "flexible", "can", "you", "send", "details", "on", "pricing", "timeline")
+
+# Work per case that doesn't scale with the corpus
+QUERIES_PER_RUN = 100
+REQUESTS_PER_RUN = 1_000
+MONITOR_POLL_SIZE = 100  # new entries per monitor poll
+
+class Corpus:
+    """Deterministic synthetic log entries in ascending id order, generated in chunks"""
+
+    def __init__(self, size: int, seed: int = 1, chunk_size: int = CHUNK_SIZE):
+        self.size = size
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def entry(self, i: int, rng: random.Random) -> Dict[str, Any]:
+        ms = BASE_ID + i * ENTRY_INTERVAL_MS
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ms // 1000)) + f".{ms % 1000:03d}Z"
+        form_name = rng.choice(FORMS)
+        kind = rng.random()
+        if kind < 0.4:
+            status = rng.choice(STATUSES)
+            return {
+                "id": str(ms), "timestamp": timestamp, "type": "success" if status < 400 else "error",
+                "message": f"FormSpree response for {form_name}: {status}",
+                "data": {"form_name": form_name, "status": status, "duration_ms": round(rng.lognormvariate(5, 0.5), 1),
+                         "response_data": {"ok": status < 400, "next": "/thanks"}},
+            }
+        if kind < 0.8:
+            return {
+                "id": str(ms), "timestamp": timestamp, "type": "info", "message": "Form submission attempt",
+                "data": {"form_name": form_name, "form_data": {
+                    "name": f"User {rng.randint(1, 99999)}",
+                    "email": f"user{rng.randint(1, 5000)}@example.com",
+                    "message": " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))),
+                }},
+            }
+        if kind < 0.95:
+            return {"id": str(ms), "timestamp": timestamp, "type": "warn",
+                    "message": f"Slow response from FormSpree ({rng.randint(1000, 9000)} ms)", "data": None}
+        return {"id": str(ms), "timestamp": timestamp, "type": "error",
+                "message": f"Error submitting {form_name}: connection reset",
+                "data": {"form_name": form_name, "error": "ECONNRESET", "attempt": rng.randint(1, 3)}}
+
+    def chunks(self, limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        size = min(self.size, limit) if limit else self.size
+        for start in range(0, size, self.chunk_size):
+            rng = random.Random(self.seed * 1_000_003 + start)
+            yield [self.entry(i, rng) for i in range(start, min(start + self.chunk_size, size))]
+
+    def lines(self) -> Iterator[List[str]]:
+        for chunk in self.chunks():
+            yield [json.dumps(log) for log in chunk]
+
+class Stopwatch:
+    """Accumulates the time spent inside `with stopwatch:` blocks"""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.started = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.elapsed += time.perf_counter() - self.started
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        """Stop timing inside a `with stopwatch:` block"""
+        self.__exit__()
+        try:
+            yield
+        finally:
+            self.__enter__()
+
+class NullWriter(io.TextIOBase):
+    """Text stream that discards output, so rendering isn't measured with terminal I/O"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+# Cases: each takes the corpus and a stopwatch, times only its own work and
+# returns how many items (entries, queries or requests) it processed
+
+def bench_parse_jsonl(corpus: Corpus, watch: Stopwatch) -> int:
+    for lines in corpus.lines():
+        with watch:
+            for line in lines:
+                json.loads(line)
+    return corpus.size
+
+def bench_parse_timestamp(corpus: Corpus, watch: Stopwatch) -> int:
+    for chunk in corpus.chunks():
+        timestamps = [log["timestamp"] for log in chunk]
+        with watch:
+            for timestamp in timestamps:
+                parse_timestamp(timestamp)
+    return corpus.size
+
+def _filled_cache(corpus: Corpus, directory: str) -> LogCache:
+    cache = LogCache(os.path.join(directory, "cache.sqlite3"), max_bytes=1 << 40, max_age_days=0)
+    for chunk in corpus.chunks():
+        cache.add(chunk)
+    cache.db.commit()
+    return cache
+
+def bench_cache_insert(corpus: Corpus, watch: Stopwatch) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        with LogCache(os.path.join(directory, "cache.sqlite3"), max_bytes=1 << 40, max_age_days=0) as cache:
+            for chunk in corpus.chunks():
+                with watch:
+                    cache.add(chunk)
+            with watch:
+                cache.db.commit()
+    return corpus.size
+
+def bench_cache_query(corpus: Corpus, watch: Stopwatch) -> int:
+    queries = [{"log_type": "error"}, {"search": "quoteRequest"}, {"log_type": "warn", "search": "slow"},
+               {"search": "no such entry"}]
+    with tempfile.TemporaryDirectory() as directory:
+        with _filled_cache(corpus, directory) as cache:
+            with watch:
+                for i in range(QUERIES_PER_RUN):
+                    cache.query(limit=100, **queries[i % len(queries)])
+    return QUERIES_PER_RUN
+
+def bench_search_index(corpus: Corpus, watch: Stopwatch) -> int:
+    index = LogSearchIndex()
+    for chunk in corpus.chunks():
+        with watch:
+            index.add_many(chunk)
+    return corpus.size
+
+def bench_search_query(corpus: Corpus, watch: Stopwatch) -> int:
+    queries = ["type:error", "data.form_name:quoteRequest budget", "formspree -type:success",
+               '"connection reset"', "user12*", "no-such-term"]
+    index = LogSearchIndex()
+    for chunk in corpus.chunks():
+        index.add_many(chunk)
+    with watch:
+        for i in range(QUERIES_PER_RUN):
+            index.search(queries[i % len(queries)], limit=100)
+    return QUERIES_PER_RUN
+
+def _bench_renderer(corpus: Corpus, watch: Stopwatch, verbose: bool) -> int:
+    renderer = LogRenderer(verbose=verbose, width=80)
+    out = NullWriter()
+    for chunk in corpus.chunks():
+        with watch:
+            renderer.write(chunk, out)
+    return corpus.size
+
+def bench_render_compact(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_renderer(corpus, watch, verbose=False)
+
+def bench_render_verbose(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_renderer(corpus, watch, verbose=True)
+
+def bench_format_log_entry(corpus: Corpus, watch: Stopwatch) -> int:
+    for chunk in corpus.chunks():
+        with watch:
+            for log in chunk:
+                format_log_entry(log)
+    return corpus.size
+
+def bench_clean_ansi(corpus: Corpus, watch: Stopwatch) -> int:
+    renderer = LogRenderer(verbose=True, width=80)
+    for chunk in corpus.chunks():
+        lines = [renderer.render(log) for log in chunk]
+        with watch:
+            for line in lines:
+                clean_ansi(line)
+    return corpus.size
+
+def _bench_export(corpus: Corpus, watch: Stopwatch, fmt: str, compression: str = "none") -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"export.{fmt}")
+        chunks = corpus.chunks()
+
+        def pages() -> Iterator[List[Dict[str, Any]]]:
+            while True:
+                with watch.paused():
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        with watch:
+            export_pages(pages(), path, fmt=fmt, compression=compression,
+                         text_formatter=lambda log: format_log_entry(log, color=False))
+    return corpus.size
+
+def bench_export_jsonl(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_export(corpus, watch, "jsonl")
+
+def bench_export_jsonl_gzip(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_export(corpus, watch, "jsonl", "gzip")
+
+def bench_export_csv(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_export(corpus, watch, "csv")
+
+def bench_export_columnar(corpus: Corpus, watch: Stopwatch) -> int:
+    return _bench_export(corpus, watch, "columnar")
+
+def bench_stats(corpus: Corpus, watch: Stopwatch) -> int:
+    stats = LogStats()
+    for chunk in corpus.chunks():
+        with watch:
+            stats.add_many(chunk)
+    with watch:
+        stats.to_dict()
+    return corpus.size
+
+def _stand_in(logs: List[Dict[str, Any]]) -> Tuple[Any, DebugServerClient]:
+    state = MockServerState(max_logs=max(len(logs), 1))
+    state.logs = logs
+    server, base_url = start_server(state=state)
+    return server, DebugServerClient(f"{base_url}/api/debug-server", DEFAULT_API_KEY, exit_on_error=False)
+
+def bench_send_request(corpus: Corpus, watch: Stopwatch) -> int:
+    logs = next(corpus.chunks(limit=MONITOR_POLL_SIZE), [])
+    server, client = _stand_in(logs[::-1])
+    count = min(corpus.size, REQUESTS_PER_RUN)
+    try:
+        with watch:
+            for _ in range(count):
+                client.get_logs(limit=1, fields=["id"])
+    finally:
+        client.close()
+        server.shutdown()
+    return count
+
+def bench_get_logs_pages(corpus: Corpus, watch: Stopwatch) -> int:
+    logs = [log for chunk in corpus.chunks() for log in chunk]
+    logs.reverse()
+    server, client = _stand_in(logs)
+    try:
+        with watch:
+            fetched = sum(len(page) for page in client.iter_log_pages(page_size=500))
+    finally:
+        client.close()
+        server.shutdown()
+    return fetched
+
+def bench_monitor_poll(corpus: Corpus, watch: Stopwatch) -> int:
+    server, client = _stand_in([])
+    state = server.state
+    display = MonitorDisplay(LogRenderer(width=80), stream=NullWriter())
+    cursor = "0"
+    delivered = 0
+    try:
+        for chunk in corpus.chunks():
+            for start in range(0, len(chunk), MONITOR_POLL_SIZE):
+                with state.lock:
+                    state.logs[:0] = reversed(chunk[start:start + MONITOR_POLL_SIZE])
+                # One poll as in cmd_monitor: fetch past the cursor, hand entries to the display, redraw
+                with watch:
+                    for log in client.iter_logs(after_id=cursor):
+                        cursor = log.get("id", cursor)
+                        display.add(log)
+                        delivered += 1
+                    display.flush()
+    finally:
+        client.close()
+        server.shutdown()
+    return delivered
+
+def bench_monitor_display(corpus: Corpus, watch: Stopwatch) -> int:
+    # A flood through the monitor display, redrawn every MONITOR_POLL_SIZE entries
+    display = MonitorDisplay(LogRenderer(width=80), summary=True, stream=NullWriter())
+    for chunk in corpus.chunks():
+        with watch:
+            for start in range(0, len(chunk), MONITOR_POLL_SIZE):
+                for log in chunk[start:start + MONITOR_POLL_SIZE]:
+                    display.add(log)
+                display.flush()
+    with watch:
+        display.close()
+    return corpus.size
+
+# (name, function, unit, largest corpus the case runs on or None)
+CASES: List[Tuple[str, Callable[[Corpus, Stopwatch], int], str, Optional[int]]] = [
+    ("parse.jsonl", bench_parse_jsonl, "entries", None),
+    ("parse.timestamp", bench_parse_timestamp, "entries", None),
+    ("filter.cache_insert", bench_cache_insert, "entries", None),
+    ("filter.cache_query", bench_cache_query, "queries", None),
+    ("filter.search_index", bench_search_index, "entries", 100_000),
+    ("filter.search_query", bench_search_query, "queries", 100_000),
+    ("render.compact", bench_render_compact, "entries", None),
+    ("render.verbose", bench_render_verbose, "entries", None),
+    ("render.format_log_entry", bench_format_log_entry, "entries", None),
+    ("render.clean_ansi", bench_clean_ansi, "entries", None),
+    ("export.jsonl", bench_export_jsonl, "entries", None),
+    ("export.jsonl_gzip", bench_export_jsonl_gzip, "entries", None),
+    ("export.csv", bench_export_csv, "entries", None),
+    ("export.columnar", bench_export_columnar, "entries", None),
+    ("stats.aggregate", bench_stats, "entries", None),
+    ("request.send_request", bench_send_request, "requests", 1_000),
+    ("request.get_logs_pages", bench_get_logs_pages, "entries", 10_000),
+    ("monitor.poll", bench_monitor_poll, "entries", 10_000),
+    ("monitor.display", bench_monitor_display, "entries", None),
+]
+
+def measure(func: Callable[[Corpus, Stopwatch], int], corpus: Corpus, repeat: int,
+            max_time: float) -> Dict[str, Any]:
+    """Best rate of at least `repeat` runs (and MIN_TIME seconds), stopping once max_time has been spent"""
+    best: Optional[Tuple[float, int]] = None
+    started = time.perf_counter()
+    runs = 0
+    while True:
+        watch = Stopwatch()
+        items = func(corpus, watch)
+        runs += 1
+        if best is None or watch.elapsed < best[0]:
+            best = (watch.elapsed, items)
+        spent = time.perf_counter() - started
+        if spent > max_time or (runs >= repeat and spent >= MIN_TIME):
+            break
+    elapsed, items = best
+    return {"items": items, "seconds": elapsed, "rate": items / elapsed if elapsed else 0.0, "runs": runs}
+
+def compare(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Relative change in rate against the baseline (negative = slower), or None without one"""
+    if not baseline or not baseline.get("rate"):
+        return None
+    return result["rate"] / baseline["rate"] - 1
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]], merge_into: Dict[str, Any]) -> None:
+    """Write results to the baseline, keeping entries for cases and sizes that weren't run"""
+    merged = merge_into.get("results", {})
+    for name, sizes in results.items():
+        merged.setdefault(name, {}).update(sizes)
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "results": merged,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def parse_sizes(text: str) -> List[Tuple[str, int]]:
+    sizes = []
+    for label in text.lower().split(","):
+        label = label.strip()
+        if label in SIZES:
+            sizes.append((label, SIZES[label]))
+        elif label:
+            try:
+                sizes.append((label, int(label)))
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"unknown corpus size '{label}' (use {', '.join(SIZES)} or a number)")
+    return sizes
+
+def format_rate(rate: float) -> str:
+    if rate >= 1_000_000:
+        return f"{rate / 1_000_000:.2f}M"
+    if rate >= 1_000:
+        return f"{rate / 1_000:.1f}k"
+    return f"{rate:.0f}"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark and regression suite for the Python tooling")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes(DEFAULT_SIZES),
+                        help=f"Comma-separated corpus sizes: {', '.join(SIZES)} or entry counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--cases", nargs="+", metavar="PREFIX",
+                        help="Only run cases whose name starts with one of these (e.g. render export.csv)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per case and size; the best is kept")
+    parser.add_argument("--max-time", type=float, default=DEFAULT_MAX_TIME,
+                        help="Stop repeating a case once this many seconds were spent on it")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run's results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fraction slower than the baseline that counts as a regression (default: 0.2)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.cases or any(case[0].startswith(prefix) for prefix in args.cases)]
+    if args.list:
+        for name, _, unit, cap in cases:
+            print(f"  {name:<26} {unit}{f' (up to {cap:,} entries)' if cap else ''}")
+        return
+    if not cases:
+        parser.error("no cases match --cases")
+
+    baseline = load_baseline(args.baseline)
+    baseline_results = baseline.get("results", {})
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = []
+
+    if not args.json:
+        source = f"against {args.baseline}" if baseline_results else "(no baseline)"
+        print(f"{Colors.BOLD}Running {len(cases)} cases on {', '.join(label for label, _ in args.sizes)} "
+              f"entries {source}{Colors.RESET}")
+    for label, size in args.sizes:
+        corpus = Corpus(size)
+        if not args.json:
+            print(f"\n{Colors.BOLD}{label} ({size:,} entries){Colors.RESET}")
+        for name, func, unit, cap in cases:
+            if cap is not None and size > cap:
+                if not args.json:
+                    print(f"  {name:<26} {Colors.GRAY}skipped (runs on up to {cap:,} entries){Colors.RESET}")
+                continue
+            result = measure(func, corpus, args.repeat, args.max_time)
+            result["unit"] = unit
+            results.setdefault(name, {})[label] = result
+            change = compare(result, baseline_results.get(name, {}).get(label))
+            regressed = change is not None and change < -args.threshold
+            if regressed:
+                regressions.append((name, label, change))
+            if not args.json:
+                if change is None:
+                    note = ""
+                else:
+                    color = Colors.RED if regressed else Colors.GREEN if change > args.threshold else Colors.GRAY
+                    note = f"  {color}{change:+.0%} vs baseline{' REGRESSION' if regressed else ''}{Colors.RESET}"
+                print(f"  {name:<26} {format_rate(result['rate']):>8} {unit}/s  "
+                      f"{result['seconds'] * 1000:>9.1f} ms{note}")
+
+    if args.json:
+        print(json.dumps({"results": results,
+                          "regressions": [{"case": name, "size": label, "change": change}
+                                          for name, label, change in regressions]}, indent=2))
+    if args.save_baseline:
+        save_baseline(args.baseline, results, baseline)
+        if not args.json:
+            print(f"\n{Colors.GREEN}Baseline saved to {args.baseline}{Colors.RESET}")
+    elif regressions:
+        if not args.json:
+            print(f"\n{Colors.RED}{len(regressions)} regression(s) beyond {args.threshold:.0%}:{Colors.RESET}")
+            for name, label, change in regressions:
+                print(f"  {name} ({label}): {change:+.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
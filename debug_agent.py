@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Debug Agent - Keeps debug_client.py warm between invocations.
+
+A background process that holds debug server connections, the local log
+cache and loaded search indexes, and runs debug_client.py commands sent to
+it over a Unix socket. While it runs, debug_client.py forwards each command
+to it and only prints the streamed output, so a command costs one socket
+round trip instead of interpreter startup, imports and a new connection.
+
+Commands that need the terminal (monitor, clear without --force) or report
+at exit (--stats, --metrics-file, --statsd) still run locally, as does
+everything when the agent isn't running. Set DEBUG_CLIENT_NO_AGENT=1 to
+bypass a running agent. Restart the agent after updating the scripts.
+
+The socket's directory must be a directory (not a symlink) owned by you
+with mode 0700, and the socket a socket owned by you. Otherwise the agent
+refuses to start and debug_client.py runs commands itself, so another
+user can't plant a socket that receives your commands and API key.
+
+Usage:
+  python3 debug_agent.py [command] [options]
+
+Commands:
+  start         - Start the agent in the background
+  serve         - Run the agent in the foreground
+  stop          - Stop a running agent
+  status        - Show the running agent's connections and counters
+
+Options:
+  --socket PATH     Socket path (default: $DEBUG_AGENT_SOCKET, or debug-agent.sock in
+                    $XDG_RUNTIME_DIR or a private directory under /tmp)
+  --idle-timeout S  Exit after S seconds without commands (default: 1800, 0 = never)
+
+Examples:
+  python3 debug_agent.py start
+  for i in $(seq 20); do python3 debug_client.py logs --limit 5 --type error; done
+  python3 debug_agent.py stop
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Output frames: a channel byte and a payload length, then the payload
+FRAME_HEADER = struct.Struct("!cI")
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+FALLBACK = b"f"
+
+DEFAULT_IDLE_TIMEOUT = 1800.0  # seconds
+START_TIMEOUT = 10.0  # seconds to wait for a started agent to answer
+MAX_REQUEST_BYTES = 1024 * 1024
+OUTPUT_BUFFER_BYTES = 64 * 1024
+
+def socket_path() -> str:
+    """Agent socket path, in a directory only this user can enter"""
+    if os.environ.get("DEBUG_AGENT_SOCKET"):
+        return os.environ["DEBUG_AGENT_SOCKET"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+        os.environ.get("TMPDIR", "/tmp"), f"form-tools-{os.getuid()}")
+    return os.path.join(runtime_dir, "debug-agent.sock")
+
+def check_socket(path: str) -> Optional[str]:
+    """Why the socket at path (or its directory) can't be trusted, or None"""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode):
+            return f"{directory} is not a directory"
+        if st.st_uid != os.getuid():
+            return f"{directory} is owned by another user"
+        if st.st_mode & 0o077:
+            return f"{directory} has mode {stat.S_IMODE(st.st_mode):o}, not 700"
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        return str(e)
+    if not stat.S_ISSOCK(st.st_mode):
+        return f"{path} is not a socket"
+    if st.st_uid != os.getuid():
+        return f"{path} is owned by another user"
+    return None
+
+def _connect(path: str) -> Optional[socket.socket]:
+    if not os.path.exists(path):
+        return None
+    reason = check_socket(path)
+    if reason:
+        print(f"debug_agent: not using {path}: {reason}", file=sys.stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def _terminal_columns() -> Optional[int]:
+    if os.environ.get("COLUMNS"):
+        return int(os.environ["COLUMNS"])
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return None
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """Run a debug_client.py command in the agent, copying its output here.
+
+    Returns the command's exit code, or None if no agent is running or the
+    agent can't run this command, in which case the caller runs it itself.
+    """
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        request = {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "columns": _terminal_columns(),
+            "base_url": os.environ.get("FORM_TOOLS_BASE_URL"),
+        }
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        except OSError:
+            return None
+        reader = sock.makefile("rb")
+        started = False
+        while True:
+            header = reader.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                if not started:
+                    return None
+                print("debug_client: the debug agent stopped before the command finished", file=sys.stderr)
+                return 1
+            channel, length = FRAME_HEADER.unpack(header)
+            payload = reader.read(length)
+            if channel == FALLBACK:
+                return None
+            if channel == EXIT:
+                return int(payload)
+            started = True
+            stream = sys.stdout if channel == STDOUT else sys.stderr
+            stream.buffer.write(payload)
+            stream.flush()
+
+def control(action: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Send a control request (status, stop); None if no agent is running"""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        try:
+            sock.sendall(json.dumps({"control": action}).encode("utf-8") + b"\n")
+            return json.loads(sock.makefile("rb").readline() or b"null")
+        except OSError:
+            return None  # agent shutting down
+
+class FrameWriter:
+    """Text stream that sends what's written to a forwarding client as frames"""
+
+    encoding = "utf-8"
+
+    def __init__(self, conn: socket.socket, channel: bytes):
+        self.conn = conn
+        self.channel = channel
+        self.pending: List[bytes] = []
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self.pending.append(data)
+        self.size += len(data)
+        if self.size >= OUTPUT_BUFFER_BYTES:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        data = b"".join(self.pending)
+        self.pending, self.size = [], 0
+        self.conn.sendall(FRAME_HEADER.pack(self.channel, len(data)) + data)
+
+    def isatty(self) -> bool:
+        return False
+
+def send_frame(conn: socket.socket, channel: bytes, payload: bytes = b"") -> None:
+    conn.sendall(FRAME_HEADER.pack(channel, len(payload)) + payload)
+
+class DebugAgent:
+    """Runs forwarded commands one at a time with long-lived clients"""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        import threading
+
+        import debug_client
+        self.debug_client = debug_client
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.last_used = time.time()
+        self.commands = 0
+        self.fallbacks = 0
+        # Commands change the working directory and COLUMNS, so they run one at a time
+        self.lock = threading.Lock()
+        self.clients: Dict[Tuple[Any, ...], Any] = {}
+        self.base_url = os.environ.get("FORM_TOOLS_BASE_URL")
+
+    def client_factory(self, args: Any, server_url: Optional[str] = None, exit_on_error: bool = True) -> Any:
+        """Same as debug_client.make_client, but reuses clients across commands"""
+        store = os.path.abspath(args.store) if args.store else None
+        key = (store, server_url or args.server or self.debug_client.DEFAULT_SERVER_URL, args.api_key,
+               args.connect_timeout, args.timeout, args.retries, args.pool_size, exit_on_error)
+        client = self.clients.get(key)
+        if client is None:
+            client = self.clients[key] = self.debug_client.make_client(args, server_url, exit_on_error)
+        return client
+
+    def fallback_reason(self, args: Any, request: Dict[str, Any]) -> Optional[str]:
+        if args.command == "monitor":
+            return "monitor runs until interrupted"
+        if args.command == "clear" and not args.force:
+            return "clear asks for confirmation"
+        if args.command == "replay" and not (args.force or args.dry_run):
+            return "replay may ask for confirmation"
+        if args.stats or args.metrics_file or args.statsd:
+            return "metrics are reported when the process exits"
+        if request.get("base_url") != self.base_url:
+            return "FORM_TOOLS_BASE_URL differs from the agent's"
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        clients = []
+        for key, client in self.clients.items():
+            info = {"server": client.server_url}
+            if not client.server_url.startswith("store:"):
+                info.update(client.connection_stats())
+            clients.append(info)
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "commands": self.commands,
+            "fallbacks": self.fallbacks,
+            "clients": clients,
+        }
+
+    def run_command(self, conn: socket.socket, request: Dict[str, Any]) -> None:
+        from contextlib import redirect_stderr, redirect_stdout
+        import traceback
+
+        debug_client = self.debug_client
+        out = FrameWriter(conn, STDOUT)
+        err = FrameWriter(conn, STDERR)
+        with self.lock:
+            self.last_used = time.time()
+            saved_cwd = os.getcwd()
+            saved_columns = os.environ.get("COLUMNS")
+            exit_code = 0
+            try:
+                os.chdir(request.get("cwd") or saved_cwd)
+                if request.get("columns"):
+                    os.environ["COLUMNS"] = str(request["columns"])
+                with redirect_stdout(out), redirect_stderr(err):
+                    try:
+                        parser = debug_client.build_parser()
+                        args = parser.parse_args(request.get("argv", []))
+                        if not args.command:
+                            parser.print_help()
+                        elif args.command == "help":
+                            debug_client.cmd_help(args)
+                        else:
+                            if self.fallback_reason(args, request):
+                                self.fallbacks += 1
+                                send_frame(conn, FALLBACK)
+                                return
+                            self.commands += 1
+                            debug_client.execute(args, self.client_factory)
+                    except SystemExit as e:
+                        if isinstance(e.code, str):
+                            print(e.code, file=sys.stderr)
+                        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return  # the client went away
+                    except Exception:
+                        traceback.print_exc()
+                        exit_code = 1
+                out.flush()
+                err.flush()
+                send_frame(conn, EXIT, str(exit_code).encode("ascii"))
+            except OSError:
+                pass  # the client went away
+            finally:
+                os.chdir(saved_cwd)
+                if saved_columns is None:
+                    os.environ.pop("COLUMNS", None)
+                else:
+                    os.environ["COLUMNS"] = saved_columns
+
+    def close(self) -> None:
+        for client in self.clients.values():
+            client.close()
+        self.clients.clear()
+
+def serve(path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    import signal
+    import socketserver
+    import threading
+
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    reason = check_socket(path)
+    if reason:
+        print(f"Refusing to serve on {path}: {reason}", file=sys.stderr)
+        sys.exit(1)
+    if _connect(path) is not None:
+        print(f"A debug agent is already listening on {path}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.lexists(path):
+        os.unlink(path)  # left behind by an agent that didn't shut down cleanly
+
+    agent = DebugAgent(idle_timeout)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            try:
+                request = json.loads(line)
+            except ValueError:
+                return
+            action = request.get("control")
+            if action == "status":
+                self.wfile.write(json.dumps(agent.status()).encode("utf-8") + b"\n")
+            elif action == "stop":
+                self.wfile.write(b'{"stopping": true}\n')
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            elif "argv" in request:
+                agent.run_command(self.connection, request)
+
+    old_umask = os.umask(0o177)  # socket readable and writable by this user only
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+
+    def watch_idle() -> None:
+        while True:
+            time.sleep(min(idle_timeout, 30.0))
+            if time.time() - agent.last_used > idle_timeout and not agent.lock.locked():
+                server.shutdown()
+                return
+
+    if idle_timeout:
+        threading.Thread(target=watch_idle, daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"Debug agent listening on {path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        agent.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def start(path: str, idle_timeout: float) -> None:
+    import subprocess
+
+    reason = check_socket(path)
+    if reason:
+        print(f"Refusing to start on {path}: {reason}", file=sys.stderr)
+        sys.exit(1)
+    status = control("status", path)
+    if status:
+        print(f"Debug agent already running (pid {status['pid']}, socket {path})")
+        return
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--socket", path, "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            print(f"Debug agent exited during startup (status {process.returncode})", file=sys.stderr)
+            sys.exit(1)
+        status = control("status", path)
+        if status:
+            print(f"Debug agent running (pid {status['pid']}, socket {path})")
+            return
+        time.sleep(0.05)
+    print("Debug agent did not start in time", file=sys.stderr)
+    sys.exit(1)
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Keep debug_client.py warm between invocations")
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"], help="What to do")
+    parser.add_argument("--socket", default=socket_path(), help="Socket path")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Exit after this many idle seconds (0 = never)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.idle_timeout)
+    elif args.command == "start":
+        start(args.socket, args.idle_timeout)
+    elif args.command == "stop":
+        if not control("stop", args.socket):
+            print("No debug agent is running")
+            return
+        deadline = time.time() + START_TIMEOUT
+        while os.path.exists(args.socket) and time.time() < deadline:
+            time.sleep(0.05)
+        print("Debug agent stopped")
+    else:
+        status = control("status", args.socket)
+        if status is None:
+            print("No debug agent is running")
+            sys.exit(1)
+        print(f"Debug agent pid {status['pid']}, up {status['uptime']:.0f}s, "
+              f"{status['commands']} commands served, {status['fallbacks']} run locally")
+        for client in status["clients"]:
+            stats = (f": {client['opened']} connections opened, {client['reused']} reused"
+                     if "opened" in client else "")
+            print(f"  {client['server']}{stats}")
+
+if __name__ == "__main__":
+    main()
@@ -8,61 +8,106 @@ Usage:
 
 Commands:
   logs          - Fetch and display logs
+  search        - Full-text search over logs, including data payloads
+  export        - Export logs to JSONL, CSV, text or a columnar file
   clear         - Clear all logs
   test          - Test FormSpree connectivity
   env           - Get server environment information
   monitor       - Start a live monitor for form submissions
-  replay        - Replay a form submission to test
+  stats         - Entry counts per time bucket, error rate, top messages and latency
+  replay        - Re-send logged form submissions and compare the responses
   help          - Show this help message
 
 Options:
   --limit N     - Limit results to N entries
   --type TYPE   - Filter logs by type (info, error, success, etc.)
   --search TEXT - Search for text in logs
+  --no-cache    - Query the server directly instead of the local log cache
+  --store DIR   - Read logs from the server's log store directory instead of over HTTP
   --verbose     - Show more detailed output
   --json        - Output raw JSON instead of formatted text
+  --max-data N  - Truncate verbose data payloads longer than N characters (0 = no limit)
+  --timeout S   - Read timeout in seconds (connect timeout: --connect-timeout)
+  --retries N   - Retry connection errors N times, and read errors and 5xx
+                  responses too for get_logs and check_environment
+  --pool-size N - Maximum pooled keep-alive connections
+  --server URL[,URL...]
+                - Debug server URL; several comma-separated URLs (optionally name=url)
+                  query all of them at once
+  --targets FILE
+                - Query every deployment listed in FILE (see targets.py)
+  --stats       - Print request latency percentiles (DNS/connect/TTFB/total) at exit
+  --metrics-file PATH
+                - Write Prometheus text-format request metrics to PATH at exit
+  --statsd HOST:PORT
+                - Send request timings to StatsD
+
+Commands are forwarded to a running debug agent (python3 debug_agent.py start),
+which keeps imports and connections warm between invocations. Set
+DEBUG_CLIENT_NO_AGENT=1 to always run in this process.
 
 Examples:
   python3 debug_client.py logs --limit 10 --type error
+  python3 debug_client.py search 'type:error data.email:test@example.com'
   python3 debug_client.py test
-  python3 debug_client.py monitor
+  python3 debug_client.py monitor --summary
+  python3 debug_client.py export -o logs.jsonl.gz
+  python3 debug_client.py stats --since 1d --bucket 1h
+  python3 debug_client.py replay --failed --since 2h --speed 10 --url http://127.0.0.1:8765
+  python3 debug_client.py --store debug-server-logs logs --type error
+  python3 debug_client.py --targets deployments.txt logs --type error
+  python3 debug_client.py --server staging=https://staging.example.com,prod=https://example.com test
 """
 
 import os
 import sys
 import json
+import functools
+import heapq
+import math
+import threading
 import time
 import argparse
-import requests
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
 import textwrap
-import signal
 import re
 
+from log_render import DEFAULT_MAX_DATA_CHARS, Colors, LogRenderer, get_terminal_width
+
+# requests, instrumentation and the other log_* modules are imported where
+# they're used, so `help` and commands answered by debug_agent.py start
+# without loading them
+
 # Configuration
-DEFAULT_SERVER_URL = "http://localhost:3000/api/debug-server"
+# FORM_TOOLS_BASE_URL points every script at another deployment or a local stand-in (mock_server.py)
+BASE_URL = os.environ.get("FORM_TOOLS_BASE_URL", "http://localhost:3000").rstrip("/")
+DEFAULT_SERVER_URL = f"{BASE_URL}/api/debug-server"
 DEFAULT_API_KEY = "debug-server-key"
 
-# Terminal colors
-class Colors:
-    RESET = "\033[0m"
-    RED = "\033[91m"
-    GREEN = "\033[92m"
-    YELLOW = "\033[93m"
-    BLUE = "\033[94m"
-    PURPLE = "\033[95m"
-    CYAN = "\033[96m"
-    GRAY = "\033[90m"
-    BOLD = "\033[1m"
-
-# Helper for terminal width
-def get_terminal_width() -> int:
-    try:
-        import shutil
-        return shutil.get_terminal_size().columns
-    except:
-        return 80
+# Connection defaults
+DEFAULT_CONNECT_TIMEOUT = 3.05  # seconds
+DEFAULT_READ_TIMEOUT = 15.0  # seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, doubled on each retry
+DEFAULT_POOL_SIZE = 4
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# Actions that are safe to send again after the server may already have
+# received them (a read timeout or a dropped response); the others append
+# log entries or submit to FormSpree
+IDEMPOTENT_ACTIONS = frozenset(["get_logs", "check_environment"])
+
+# Monitor defaults
+DEFAULT_POLL_INTERVAL = 1.0  # seconds between polls when streaming is unavailable
+DEFAULT_PAGE_SIZE = 100
+STREAM_IDLE_TIMEOUT = 45.0  # seconds without any data (including heartbeats)
+STREAM_RECONNECT_DELAY = 1.0  # seconds
+
+# Wire format. get_logs pages come as MessagePack when msgpack is installed,
+# and compressed as requests negotiates (gzip, or brotli when it's installed)
+MSGPACK_TYPE = "application/msgpack"
+SUMMARY_FIELDS = ["id", "timestamp", "type", "message"]  # all that non-verbose output shows
 
 # Helper for formatting JSON
 def format_json(data: Any) -> str:
@@ -74,47 +119,130 @@ def clean_ansi(text: str) -> str:
     return ansi_escape.sub('', text)
 
 # Helper to format log entries nicely
-def format_log_entry(log: Dict[str, Any], verbose: bool = False) -> str:
-    timestamp = datetime.fromisoformat(log.get("timestamp", "")).strftime("%Y-%m-%d %H:%M:%S")
-    
-    log_type = log.get("type", "unknown")
-    type_color = Colors.GRAY
-    if log_type == "error":
-        type_color = Colors.RED
-    elif log_type == "success":
-        type_color = Colors.GREEN
-    elif log_type == "info":
-        type_color = Colors.BLUE
-    elif log_type == "warn":
-        type_color = Colors.YELLOW
-    
-    message = log.get("message", "No message")
-    log_id = log.get("id", "")
-    
-    # Basic info line
-    result = f"{Colors.GRAY}{timestamp}{Colors.RESET} [{type_color}{log_type.upper()}{Colors.RESET}] {message}"
-    
-    # Add data details if verbose
-    if verbose and log.get("data"):
-        data_str = format_json(log["data"])
-        indent = " " * 4
-        data_lines = data_str.split("\n")
-        data_formatted = "\n".join(f"{indent}{line}" for line in data_lines)
-        result += f"\n{Colors.GRAY}{data_formatted}{Colors.RESET}"
-    
-    return result
+@functools.lru_cache(maxsize=None)
+def _cached_renderer(verbose: bool, color: bool, max_data_chars: Optional[int]) -> LogRenderer:
+    return LogRenderer(verbose=verbose, color=color, max_data_chars=max_data_chars)
+
+def format_log_entry(log: Dict[str, Any], verbose: bool = False, color: bool = True,
+                     max_data_chars: Optional[int] = None) -> str:
+    return _cached_renderer(verbose, color, max_data_chars).render(log)
+
+# Numeric value of a log id, used to compare cursors
+def log_id_value(log: Dict[str, Any]) -> int:
+    try:
+        return int(log.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def is_read_error(error: Exception) -> bool:
+    """Whether a requests error happened after the request was sent (the server may have acted on it)"""
+    import requests
+    from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+    if isinstance(error, requests.exceptions.ReadTimeout):
+        return True
+    cause = error.args[0] if error.args else None
+    if isinstance(cause, MaxRetryError):
+        cause = cause.reason
+    return isinstance(cause, (ReadTimeoutError, ProtocolError))
+
+# Raised when the server doesn't offer a log stream
+class StreamingUnavailable(Exception):
+    pass
 
 # Debug server client class
 class DebugServerClient:
-    def __init__(self, server_url: str = DEFAULT_SERVER_URL, api_key: str = DEFAULT_API_KEY):
+    def __init__(
+        self,
+        server_url: str = DEFAULT_SERVER_URL,
+        api_key: str = DEFAULT_API_KEY,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        exit_on_error: bool = True,
+        accept_msgpack: bool = True,
+    ):
         self.server_url = server_url
+        self.exit_on_error = exit_on_error
         self.api_key = api_key
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        
+        # Ask for MessagePack only if it can be decoded; servers that don't
+        # support it keep answering with JSON
+        self._msgpack = None
+        if accept_msgpack:
+            try:
+                import msgpack
+                self._msgpack = msgpack
+                self.headers["Accept"] = f"{MSGPACK_TYPE}, application/json;q=0.9"
+            except ImportError:
+                pass
+        
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        from instrumentation import instrument_session
+        
+        # One pooled, keep-alive session for the lifetime of the client.
+        # Retries cover connection errors and 5xx responses with exponential
+        # backoff (backoff, 2*backoff, 4*backoff, ...). Every action is a
+        # POST, and a read error or 5xx after it was sent may come from a
+        # server that already acted on it, so for POSTs only connection
+        # errors are retried here; post_action retries the rest for
+        # IDEMPOTENT_ACTIONS only.
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+        instrument_session(self.session)
+    
+    def close(self) -> None:
+        self.session.close()
+    
+    def __enter__(self) -> "DebugServerClient":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def connection_stats(self) -> Dict[str, int]:
+        """Return how many connections were opened vs. reused by the pool"""
+        opened = 0
+        requests_made = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_made += pool.num_requests
+        return {
+            "requests": requests_made,
+            "opened": opened,
+            "reused": max(requests_made - opened, 0),
+        }
     
-    def send_request(self, action: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+    def post_action(self, action: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send one action and return the JSON response, raising requests exceptions on failure"""
         payload = {
             "action": action
         }
@@ -122,32 +250,185 @@ class DebugServerClient:
         if data:
             payload.update(data)
         
+        import requests
+        from instrumentation import timed
+        attempts = self.retries + 1 if action in IDEMPOTENT_ACTIONS else 1
+        for attempt in range(attempts):
+            try:
+                with timed(f"debug_server.{action}") as timing:
+                    response = timing.set_response(self.session.post(self.server_url, json=payload, timeout=self.timeout))
+                    response.raise_for_status()
+                    return self.decode(response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout) as e:
+                if attempt + 1 == attempts or not is_read_error(e):
+                    raise
+            except requests.exceptions.HTTPError as e:
+                if attempt + 1 == attempts or e.response.status_code not in RETRY_STATUS_CODES:
+                    raise
+            time.sleep(self.backoff * 2 ** attempt)
+    
+    def decode(self, response: Any) -> Any:
+        """Response body as JSON or MessagePack, according to its Content-Type"""
+        if self._msgpack is not None and response.headers.get("Content-Type", "").startswith(MSGPACK_TYPE):
+            return self._msgpack.unpackb(response.content, raw=False)
+        return response.json()
+    
+    def send_request(self, action: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send one action, printing the error and exiting on failure (or raising, with exit_on_error=False)"""
+        import requests
         try:
-            response = requests.post(self.server_url, json=payload, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self.post_action(action, data)
         except requests.exceptions.RequestException as e:
+            if not self.exit_on_error:
+                raise
             print(f"{Colors.RED}Error connecting to debug server: {e}{Colors.RESET}")
-            if hasattr(e, 'response') and e.response:
+            if hasattr(e, 'response') and e.response is not None:
                 try:
                     print(f"{Colors.GRAY}Server response: {e.response.text}{Colors.RESET}")
                 except:
                     pass
             sys.exit(1)
     
-    def get_logs(self, limit: int = 100, log_type: Optional[str] = None, search: Optional[str] = None) -> Dict[str, Any]:
+    def get_logs(self, limit: int = 100, log_type: Optional[str] = None, search: Optional[str] = None,
+                 after_id: Optional[str] = None, before_id: Optional[str] = None,
+                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch one page of logs.
+        
+        Entries come newest first, starting below before_id if given. With
+        after_id, only entries newer than the cursor are returned, oldest
+        first. The response's next_cursor continues the same direction.
+        fields limits each entry to those keys (id is always included).
+        """
         filter_data = {}
         if log_type:
             filter_data["type"] = log_type
         if search:
             filter_data["search"] = search
         
-        return self.send_request("get_logs", {
-            "data": {
-                "filter": filter_data if filter_data else None,
-                "limit": limit
-            }
-        })
+        request_data = {
+            "filter": filter_data if filter_data else None,
+            "limit": limit
+        }
+        if after_id is not None:
+            request_data["after_id"] = after_id
+        if before_id is not None:
+            request_data["before_id"] = before_id
+        if fields is not None:
+            request_data["fields"] = fields
+        
+        return self.send_request("get_logs", {"data": request_data})
+    
+    def iter_log_pages(self, after_id: Optional[str] = None, before_id: Optional[str] = None,
+                       page_size: int = DEFAULT_PAGE_SIZE, log_type: Optional[str] = None,
+                       search: Optional[str] = None, fields: Optional[List[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lazily yield pages of logs, following next_cursor until the server runs out.
+        
+        Pages run newest first, or oldest first when after_id is given.
+        """
+        ascending = after_id is not None
+        cursor = after_id if ascending else before_id
+        while True:
+            cursor_args = {"after_id": cursor} if ascending else {"before_id": cursor}
+            result = self.get_logs(limit=page_size, log_type=log_type, search=search, fields=fields, **cursor_args)
+            logs = result.get("logs", [])
+            
+            if "next_cursor" not in result:
+                # Servers without pagination answer with a single newest-first page
+                if ascending:
+                    logs = [log for log in reversed(logs) if log_id_value(log) > log_id_value({"id": after_id})]
+                elif before_id is not None:
+                    logs = [log for log in logs if log_id_value(log) < log_id_value({"id": before_id})]
+                if logs:
+                    yield logs
+                return
+            
+            if logs:
+                yield logs
+            cursor = result.get("next_cursor")
+            if not cursor or not logs:
+                return
+    
+    def iter_logs(self, limit: Optional[int] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                  **page_args: Any) -> Iterator[Dict[str, Any]]:
+        """Lazily yield individual entries across pages, stopping after limit entries"""
+        if limit is not None:
+            page_size = min(page_size, max(limit, 1))
+        count = 0
+        for page in self.iter_log_pages(page_size=page_size, **page_args):
+            for log in page:
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield log
+            if limit is not None and count >= limit:
+                return
+    
+    def stream_logs(self, since_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield new log entries from the server's Server-Sent Events stream.
+        
+        Raises StreamingUnavailable if the server doesn't offer a stream, and
+        requests exceptions if the connection drops.
+        """
+        response = self.session.get(
+            self.server_url,
+            params={"stream": "1", "since_id": since_id},
+            headers={"Accept": "text/event-stream"},
+            # The server sends a heartbeat every 15s, so a longer silence means a dead stream
+            timeout=(self.timeout[0], max(self.timeout[1], STREAM_IDLE_TIMEOUT)),
+            stream=True,
+        )
+        with response:
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200 or not content_type.startswith("text/event-stream"):
+                raise StreamingUnavailable(f"status {response.status_code}, content type '{content_type}'")
+            
+            event_data = []
+            # chunk_size=None yields each chunk as soon as the server flushes it
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if line:
+                    if line.startswith("data:"):
+                        event_data.append(line[5:].lstrip())
+                    continue
+                # A blank line dispatches the event; heartbeats carry no data
+                if event_data:
+                    yield json.loads("\n".join(event_data))
+                    event_data = []
+    
+    def poll_logs(self, since_id: str, interval: float = DEFAULT_POLL_INTERVAL) -> Iterator[Dict[str, Any]]:
+        """Yield new log entries by polling get_logs with an after_id cursor"""
+        cursor = since_id
+        while True:
+            for log in self.iter_logs(after_id=cursor):
+                cursor = log.get("id", cursor)
+                yield log
+            time.sleep(interval)
+    
+    def follow_logs(self, since_id: str, interval: float = DEFAULT_POLL_INTERVAL,
+                    use_stream: bool = True,
+                    notify: Optional[Callable[[str], None]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every log entry after since_id, streaming when the server supports it.
+        
+        Falls back to cursor polling when streaming is unavailable. Dropped
+        streams are resumed from the last delivered id, so no entries are lost.
+        Fallback and reconnect notices are printed, or passed to notify.
+        """
+        import requests
+        if notify is None:
+            notify = lambda message: print(f"{Colors.GRAY}{message}{Colors.RESET}")
+        cursor = since_id
+        while use_stream:
+            try:
+                for log in self.stream_logs(cursor):
+                    cursor = log.get("id", cursor)
+                    yield log
+            except StreamingUnavailable as e:
+                notify(f"Log streaming unavailable ({e}), polling every {interval}s")
+                break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                notify(f"Log stream interrupted ({e}), reconnecting...")
+            time.sleep(STREAM_RECONNECT_DELAY)
+        
+        yield from self.poll_logs(cursor, interval)
     
     def clear_logs(self) -> Dict[str, Any]:
         return self.send_request("clear_logs")
@@ -165,17 +446,91 @@ class DebugServerClient:
             "data": data
         })
     
+    def add_logs(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Append many entries (oldest first) with one log_batch request.
+        
+        Raises requests exceptions instead of exiting, so background senders
+        can handle failures.
+        """
+        return self.post_action("log_batch", {"entries": entries})
+    
+    def batch_logger(self, **kwargs: Any) -> "BatchingLogger":
+        """Return a BatchingLogger that sends entries through this client"""
+        from log_batch import BatchingLogger
+        return BatchingLogger(self, **kwargs)
+    
     def server_status(self) -> Dict[str, Any]:
+        import requests
+        from instrumentation import timed
         try:
-            response = requests.get(self.server_url)
+            with timed("debug_server.status") as timing:
+                response = timing.set_response(self.session.get(self.server_url, timeout=self.timeout))
             return response.json()
         except requests.exceptions.RequestException as e:
+            if not self.exit_on_error:
+                raise
             print(f"{Colors.RED}Error connecting to debug server: {e}{Colors.RESET}")
             sys.exit(1)
 
+class LogStoreClient(DebugServerClient):
+    """Reads logs straight from a debug server's log store directory (--store).
+    
+    Only log queries are served locally; actions that need the server exit
+    with an error.
+    """
+    
+    def __init__(self, store_dir: str):
+        from log_store import LogStore
+        super().__init__(server_url=f"store:{os.path.abspath(store_dir)}")
+        self.store = LogStore(store_dir)
+    
+    def close(self) -> None:
+        self.store.close()
+        super().close()
+    
+    def get_logs(self, limit: int = 100, log_type: Optional[str] = None, search: Optional[str] = None,
+                 after_id: Optional[str] = None, before_id: Optional[str] = None,
+                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        # Nothing goes over the wire, so fields is ignored
+        return self.store.get_logs(limit=limit, log_type=log_type, search=search, after_id=after_id, before_id=before_id)
+    
+    def stream_logs(self, since_id: str) -> Iterator[Dict[str, Any]]:
+        raise StreamingUnavailable("reading a local log store")
+    
+    def send_request(self, action: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        print(f"{Colors.RED}Error: '{action}' needs the debug server and is not available with --store{Colors.RESET}")
+        sys.exit(1)
+
+# Helper to report connection pool usage
+def print_connection_stats(client: DebugServerClient) -> None:
+    stats = client.connection_stats()
+    print(f"{Colors.GRAY}Connections: {stats['opened']} opened, {stats['reused']} reused "
+          f"({stats['requests']} requests){Colors.RESET}")
+
+# Helper to fetch the newest matching logs for the logs command
+def fetch_logs(client: DebugServerClient, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from log_cache import LogCache
+    if args.no_cache or args.store:
+        # Pull pages lazily, only as many entries as will be shown, without
+        # data payloads unless they will be shown or saved
+        fields = None if args.verbose or args.json or args.save else SUMMARY_FIELDS
+        return list(client.iter_logs(limit=args.limit, log_type=args.type, search=args.search, fields=fields))
+    # Fetch only new entries, then answer the query from the local cache
+    with LogCache.for_server(client.server_url, args.cache_dir) as cache:
+        cache.sync(client)
+        return cache.query(limit=args.limit, log_type=args.type, search=args.search)
+
+# Helper to write logs to a plain-text file for the logs --save option
+def save_logs(logs: List[Dict[str, Any]], filename: str, target_width: int = 0) -> None:
+    with open(filename, "w") as f:
+        f.write(f"Debug Server Logs - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 80 + "\n\n")
+        LogRenderer(verbose=True, color=False, max_data_chars=None, width=80, target_width=target_width).write(logs, f)
+    print(f"{Colors.GREEN}Logs saved to {filename}{Colors.RESET}")
+
 # Command functions
 def cmd_logs(client: DebugServerClient, args: argparse.Namespace) -> None:
-    result = client.get_logs(limit=args.limit, log_type=args.type, search=args.search)
+    result = {"logs": fetch_logs(client, args)}
     
     if args.json:
         print(format_json(result))
@@ -187,23 +542,332 @@ def cmd_logs(client: DebugServerClient, args: argparse.Namespace) -> None:
         print(f"{Colors.YELLOW}No logs found matching your criteria.{Colors.RESET}")
         return
     
+    renderer = LogRenderer(verbose=args.verbose, max_data_chars=args.max_data)
     print(f"{Colors.BOLD}Found {len(logs)} log entries:{Colors.RESET}")
-    print("-" * get_terminal_width())
-    
-    for log in logs:
-        print(format_log_entry(log, args.verbose))
-        print("-" * get_terminal_width())
+    print(renderer.separator)
+    renderer.write(logs)
     
     # Optionally save logs to file
     if args.save:
-        filename = args.save
-        with open(filename, "w") as f:
-            f.write(f"Debug Server Logs - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-            for log in logs:
-                f.write(clean_ansi(format_log_entry(log, verbose=True)) + "\n")
-                f.write("-" * 80 + "\n")
-        print(f"{Colors.GREEN}Logs saved to {filename}{Colors.RESET}")
+        save_logs(logs, args.save)
+
+# Loaded search indexes by path and file mtime, reused while the file is
+# unchanged (across commands when running inside debug_agent.py)
+_search_indexes: Dict[str, Tuple[Optional[int], Any]] = {}
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def load_search_index(path: str) -> "LogSearchIndex":
+    from log_search import LogSearchIndex
+    mtime = _mtime(path)
+    cached = _search_indexes.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _search_indexes[path] = (mtime, LogSearchIndex.load(path))
+    return cached[1]
+
+def save_search_index(index: "LogSearchIndex", path: str) -> None:
+    index.save(path)
+    _search_indexes[path] = (_mtime(path), index)
+
+def cmd_search(client: DebugServerClient, args: argparse.Namespace) -> None:
+    from log_cache import LogCache, cache_path
+    from log_search import LogSearchIndex
+    query = " ".join(args.query)
+    
+    if args.no_cache:
+        # Build a throwaway index from whatever the server returns
+        index = LogSearchIndex()
+        for page in client.iter_log_pages(after_id="0"):
+            index.add_many(page)
+    else:
+        # Bring the cache up to date, then index only entries the saved index hasn't seen
+        index_path = cache_path(client.server_url, args.cache_dir, "index")
+        index = load_search_index(index_path)
+        with LogCache.for_server(client.server_url, args.cache_dir) as cache:
+            cache.sync(client)
+            rebuild = index.generation != cache.generation
+            if rebuild:
+                # The server cleared or dropped entries the index still holds
+                index = LogSearchIndex()
+                index.generation = cache.generation
+            if index.add_many(cache.iter_after(index.max_id)) or rebuild:
+                save_search_index(index, index_path)
+    
+    start = time.perf_counter()
+    logs = index.search(query, limit=args.limit, after=args.since, before=args.until)
+    elapsed = time.perf_counter() - start
+    
+    if args.json:
+        print(format_json({"logs": logs}))
+        return
+    
+    if not logs:
+        print(f"{Colors.YELLOW}No logs found matching '{query}'.{Colors.RESET}")
+        return
+    
+    renderer = LogRenderer(verbose=args.verbose, max_data_chars=args.max_data)
+    print(f"{Colors.BOLD}Found {len(logs)} log entries{Colors.RESET} "
+          f"{Colors.GRAY}({len(index)} indexed, {elapsed * 1000:.1f} ms){Colors.RESET}")
+    print(renderer.separator)
+    renderer.write(logs)
+
+def cmd_export(client: DebugServerClient, args: argparse.Namespace) -> None:
+    from log_export import export_pages, infer_compression
+    compression = args.compress or infer_compression(args.output)
+    print(f"{Colors.BOLD}Exporting logs to {args.output} ({args.format}, {compression})...{Colors.RESET}")
+    
+    def progress(written: int) -> None:
+        print(f"\r{Colors.GRAY}{written} entries written{Colors.RESET}", end="", flush=True)
+    
+    try:
+        written = export_pages(
+            client.iter_log_pages(after_id=args.since_id, page_size=args.page_size),
+            args.output,
+            fmt=args.format,
+            compression=compression,
+            text_formatter=LogRenderer(verbose=True, color=False, max_data_chars=None, width=80).render,
+            on_page=None if args.json else progress,
+        )
+    except RuntimeError as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        sys.exit(1)
+    
+    if args.json:
+        print(format_json({"success": True, "entries": written, "output": args.output}))
+    else:
+        print(f"\n{Colors.GREEN}Exported {written} entries to {args.output}{Colors.RESET}")
+
+# Helper to stream entries in a time range for stats and replay. Entries
+# outside the range may be included; reading from the server runs newest
+# first so it can stop at since.
+def iter_logs_in_range(client: DebugServerClient, args: argparse.Namespace,
+                       since: Optional[float], until: Optional[float], log_type: Optional[str] = None,
+                       search: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    from log_cache import LogCache
+    from log_stats import format_timestamp, parse_timestamp
+    if args.no_cache or args.store:
+        for page in client.iter_log_pages(log_type=log_type, search=search):
+            yield from page
+            oldest = parse_timestamp(page[-1].get("timestamp"))
+            if since is not None and oldest is not None and oldest < since:
+                return
+        return
+    search = search.lower() if search else None
+    with LogCache.for_server(client.server_url, args.cache_dir) as cache:
+        cache.sync(client)
+        for log in cache.iter_range(since=format_timestamp(since) if since is not None else None,
+                                    until=format_timestamp(until) if until is not None else None,
+                                    log_type=log_type):
+            if search and search not in log["message"].lower() and search not in log["type"].lower():
+                continue
+            yield log
+
+def format_number(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.1f}" if abs(value) < 10 else f"{value:,.0f}"
+
+def print_stats(result: Dict[str, Any], table: bool = False) -> None:
+    from log_stats import format_duration, merge_buckets, sparkline
+
+    def local_time(iso: str) -> str:
+        return datetime.fromisoformat(iso.replace("Z", "+00:00")).astimezone().strftime("%Y-%m-%d %H:%M")
+
+    if not result["entries"]:
+        print(f"{Colors.YELLOW}No logs found matching your criteria.{Colors.RESET}")
+        return
+
+    bucket = format_duration(result["bucket_seconds"])
+    print(f"{Colors.BOLD}{result['entries']:,} log entries{Colors.RESET} from {local_time(result['first'])} "
+          f"to {local_time(result['last'])} {Colors.GRAY}({bucket} buckets){Colors.RESET}")
+
+    buckets = result["buckets"]
+    types = sorted({log_type for b in buckets for log_type in b["types"]})
+    errors = sum(b["types"].get("error", 0) for b in buckets)
+    type_colors = {"error": Colors.RED, "success": Colors.GREEN, "info": Colors.BLUE, "warning": Colors.YELLOW}
+
+    if table:
+        header = f"{'Bucket':<17} {'Total':>7}" + "".join(f" {log_type[:9]:>9}" for log_type in types) + f" {'Error %':>7}"
+        print(f"\n{Colors.BOLD}{header}{Colors.RESET}")
+        for b in buckets:
+            rate = "-" if b["error_rate"] is None else f"{b['error_rate'] * 100:.1f}%"
+            print(f"{local_time(b['start']):<17} {b['total']:>7}"
+                  + "".join(f" {b['types'].get(log_type, 0):>9}" for log_type in types) + f" {rate:>7}")
+    else:
+        # One character per bucket, merging buckets to fit the terminal
+        step = math.ceil(len(buckets) / max(10, get_terminal_width() - 32))
+        merged = merge_buckets(buckets, step)
+        print(f"\n{Colors.BOLD}Entries per {format_duration(result['bucket_seconds'] * step)}{Colors.RESET}")
+        print(f"  {'total':<10} {sparkline([b['total'] for b in merged])} {result['entries']:>8,}")
+        for log_type in types:
+            counts = [b["types"].get(log_type, 0) for b in merged]
+            color = type_colors.get(log_type, Colors.GRAY)
+            print(f"  {color}{log_type[:10]:<10} {sparkline(counts)}{Colors.RESET} {sum(counts):>8,}")
+        rates = [b["error_rate"] for b in merged]
+        print(f"  {Colors.RED}{'error rate':<10} {sparkline(rates)}{Colors.RESET} {errors / result['entries'] * 100:>7.1f}%")
+        if errors:
+            peak = max(merged, key=lambda b: b["error_rate"] or 0)
+            print(f"  {Colors.GRAY}peak {peak['error_rate'] * 100:.1f}% "
+                  f"({peak['types'].get('error', 0)} of {peak['total']}) at {local_time(peak['start'])}{Colors.RESET}")
+
+    if result["top_messages"]:
+        print(f"\n{Colors.BOLD}Top messages{Colors.RESET}")
+        for item in result["top_messages"]:
+            overcount = f" {Colors.GRAY}(+/-{item['error']}){Colors.RESET}" if item["error"] else ""
+            color = type_colors.get(item["type"], Colors.GRAY)
+            print(f"  {item['count']:>8,}{overcount}  {color}{item['type'][:8]:<8}{Colors.RESET} {item['message']}")
+
+    if result["latency"]:
+        print(f"\n{Colors.BOLD}{'Latency field':<18} {'Form':<20} {'Count':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8}{Colors.RESET}")
+        for row in result["latency"]:
+            print(f"{row['field'][:18]:<18} {row['form'][:20]:<20} {row['count']:>7,} "
+                  + " ".join(f"{format_number(row[key]):>8}" for key in ("p50", "p90", "p99", "max")))
+
+    if result["skipped"]:
+        print(f"\n{Colors.GRAY}{result['skipped']} entries without a timestamp were skipped{Colors.RESET}")
+
+def cmd_stats(client: DebugServerClient, args: argparse.Namespace) -> None:
+    from log_stats import DEFAULT_LATENCY_FIELDS, LogStats, parse_duration, parse_when
+    try:
+        since, until = parse_when(args.since), parse_when(args.until)
+        bucket = parse_duration(args.bucket)
+    except ValueError as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        sys.exit(1)
+
+    stats = LogStats(bucket_seconds=bucket, top=args.top, since=since, until=until,
+                     latency_fields=args.latency_field or DEFAULT_LATENCY_FIELDS)
+    stats.add_many(iter_logs_in_range(client, args, since, until, log_type=args.type, search=args.search))
+
+    if args.json:
+        print(format_json(stats.to_dict()))
+    else:
+        print_stats(stats.to_dict(), table=args.table)
+
+def format_replay_mode(speed: float, concurrency: int, max_gap: Optional[float]) -> str:
+    if not speed:
+        return f"as fast as possible, max {concurrency} in flight"
+    pace = "original timing" if speed == 1 else f"{speed:g}x original speed"
+    gaps = f", gaps capped at {max_gap:g}s" if max_gap is not None else ""
+    return f"{pace}{gaps}, max {concurrency} in flight"
+
+def print_replay_result(result: "ReplayResult", verbose: bool = False) -> None:
+    outcome_colors = {"same": Colors.GRAY, "fixed": Colors.GREEN, "regressed": Colors.RED,
+                      "changed": Colors.YELLOW, "new": Colors.BLUE}
+    submission = result.submission
+    color = Colors.GREEN if result.ok else Colors.RED
+    when = datetime.fromtimestamp(submission.timestamp).strftime("%H:%M:%S")
+    lines = [f"  {Colors.GRAY}{when}{Colors.RESET} {submission.form_name[:20]:<20} "
+             f"{color}{result.transition:<14}{Colors.RESET} "
+             f"{outcome_colors[result.outcome]}{result.outcome:<9}{Colors.RESET} {result.latency * 1000:>7.0f}ms"]
+    if result.error:
+        lines.append(f"      {Colors.RED}{result.error}{Colors.RESET}")
+    if result.diff and (verbose or result.outcome != "same"):
+        lines.extend(f"      {Colors.GRAY}{line}{Colors.RESET}" for line in result.diff[:None if verbose else 3])
+    print("\n".join(lines), flush=True)
+
+def print_replay_report(report: Dict[str, Any]) -> None:
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:.0f}ms"
+
+    outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(report["outcomes"].items(), key=lambda item: -item[1]))
+    print(f"\n{Colors.BOLD}Replayed {report['requests']} submissions in {report['duration']:.2f}s "
+          f"({report['throughput']:.1f} req/s){Colors.RESET}: {outcomes}")
+    latency = report["latency"]
+    print(f"  Latency:     p50 {ms(latency['p50'])}, p90 {ms(latency['p90'])}, "
+          f"p99 {ms(latency['p99'])}, max {ms(latency['max'])}")
+    if report["original_latency"]:
+        original = report["original_latency"]
+        print(f"  {Colors.GRAY}Originally:  p50 {ms(original['p50'])}, p90 {ms(original['p90'])}, "
+              f"p99 {ms(original['p99'])}, max {ms(original['max'])}{Colors.RESET}")
+    print(f"  Status:      " + ", ".join(f"{transition}: {count}" for transition, count in report["transitions"].items()))
+    if report["max_lateness"] and report["max_lateness"] > 0.05:
+        print(f"  {Colors.YELLOW}Sending fell behind the schedule by up to {ms(report['max_lateness'])} "
+              f"(raise --concurrency to keep up){Colors.RESET}")
+    failed_color = Colors.GREEN if not report["failed"] else Colors.RED
+    print(f"  {failed_color}{report['failed']} of {report['requests']} replayed submissions failed{Colors.RESET}")
+
+def cmd_replay(client: DebugServerClient, args: argparse.Namespace) -> None:
+    from urllib.parse import urlsplit
+    from log_stats import parse_when
+    from replay import Replayer, extract_submissions, submission_label
+    from targets import parse_target
+    try:
+        since, until = parse_when(args.since), parse_when(args.until)
+    except ValueError as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        sys.exit(1)
+
+    submissions = [
+        submission for submission in extract_submissions(iter_logs_in_range(client, args, since, until))
+        if (since is None or submission.timestamp >= since) and (until is None or submission.timestamp < until)
+        and (not args.form or submission.form_name == args.form)
+        and (not args.failed or submission.ok is False)
+        and (not args.id or submission.log_id in args.id)
+    ]
+    if args.limit:
+        submissions = submissions[-args.limit:]
+    if not submissions:
+        print(f"{Colors.YELLOW}No logged submissions match your criteria.{Colors.RESET}")
+        return
+
+    if args.dry_run:
+        if args.json:
+            print(format_json({"submissions": [submission.to_dict() for submission in submissions]}))
+            return
+        print(f"{Colors.BOLD}{len(submissions)} submissions would be replayed:{Colors.RESET}")
+        for submission in submissions:
+            when = datetime.fromtimestamp(submission.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            fields = ", ".join(sorted(submission.form_data))
+            print(f"  {Colors.GRAY}{when}{Colors.RESET} {submission.form_name[:20]:<20} "
+                  f"{submission_label(submission.status, submission.error):<6} {Colors.GRAY}id {submission.log_id}: {fields}{Colors.RESET}")
+        return
+
+    if args.url:
+        url = args.url
+    elif args.target == "formspree":
+        from test_single_form import FORMSPREE_ENDPOINT
+        url = FORMSPREE_ENDPOINT
+    else:
+        url = BASE_URL if args.store else parse_target(client.server_url).base_url
+    speed = 0.0 if args.fast else args.speed
+    mode = format_replay_mode(speed, args.concurrency, args.max_gap)
+
+    # Replayed submissions are real submissions unless they go to a local stand-in
+    if not args.force and urlsplit(url).hostname not in ("localhost", "127.0.0.1", "::1"):
+        confirm = input(f"{Colors.YELLOW}Replay {len(submissions)} submissions to {url}? (y/N): {Colors.RESET}")
+        if confirm.lower() != "y":
+            print("Operation cancelled.")
+            return
+
+    if not args.json:
+        span = submissions[-1].timestamp - submissions[0].timestamp
+        print(f"{Colors.BOLD}Replaying {len(submissions)} submissions ({span:.1f}s of traffic) "
+              f"to {url} via {args.target}{Colors.RESET} {Colors.GRAY}({mode}){Colors.RESET}")
+    print_lock = threading.Lock()
+
+    def on_result(result: "ReplayResult") -> None:
+        with print_lock:
+            print_replay_result(result, args.verbose)
+
+    replayer = Replayer(url, target=args.target, speed=speed, concurrency=args.concurrency,
+                        max_gap=args.max_gap, on_result=None if args.json else on_result)
+    try:
+        report = replayer.run(submissions)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Replay interrupted.{Colors.RESET}")
+        sys.exit(130)
+
+    if args.json:
+        print(format_json(report))
+    else:
+        print_replay_report(report)
+    if report["failed"]:
+        sys.exit(1)
 
 def cmd_clear(client: DebugServerClient, args: argparse.Namespace) -> None:
     if not args.force:
@@ -214,6 +878,14 @@ def cmd_clear(client: DebugServerClient, args: argparse.Namespace) -> None:
     
     result = client.clear_logs()
     
+    if result.get("success"):
+        from log_cache import LogCache, cache_path
+        with LogCache.for_server(client.server_url, args.cache_dir) as cache:
+            cache.clear()
+        index_path = cache_path(client.server_url, args.cache_dir, "index")
+        if os.path.exists(index_path):
+            os.remove(index_path)
+    
     if args.json:
         print(format_json(result))
         return
@@ -272,68 +944,271 @@ def cmd_env(client: DebugServerClient, args: argparse.Namespace) -> None:
         if "error" in result:
             print(f"{Colors.RED}Error: {result['error']}{Colors.RESET}")
 
+# Helper to create the coalescing, rate-limited display for the monitor commands
+def make_monitor_display(args: argparse.Namespace, target_width: int = 0) -> "MonitorDisplay":
+    from log_monitor import MonitorDisplay
+    renderer = LogRenderer(verbose=args.verbose, max_data_chars=args.max_data, target_width=target_width)
+    return MonitorDisplay(renderer, window=args.coalesce, refresh=args.refresh, backlog=args.backlog,
+                          summary=args.summary)
+
+# Entry shown in the monitor for the follower's own messages
+def monitor_entry(log_type: str, message: str, **fields: Any) -> Dict[str, Any]:
+    return {"type": log_type, "message": message, "timestamp": datetime.now().astimezone().isoformat(), **fields}
+
+# Entry shown in the monitor when following a server fails
+def monitor_error(e: Exception, **fields: Any) -> Dict[str, Any]:
+    return monitor_entry("error", f"Error during monitoring: {e}", **fields)
+
 def cmd_monitor(client: DebugServerClient, args: argparse.Namespace) -> None:
     print(f"{Colors.BOLD}Starting log monitor...{Colors.RESET}")
     print(f"{Colors.GRAY}Press Ctrl+C to stop{Colors.RESET}")
     print("-" * get_terminal_width())
     
-    last_log_id = None
+    display = make_monitor_display(args)
     
-    # Handle Ctrl+C gracefully
-    def signal_handler(sig, frame):
-        print(f"\n{Colors.YELLOW}Monitor stopped.{Colors.RESET}")
-        sys.exit(0)
+    # Start after the newest existing entry without displaying it
+    latest = client.get_logs(limit=1, fields=["id"]).get("logs", [])
+    last_log_id = latest[0].get("id") if latest else "0"
+    print(f"{Colors.GRAY}Monitoring for new logs...{Colors.RESET}")
     
-    signal.signal(signal.SIGINT, signal_handler)
+    # Follow in the background; this thread only redraws, so a flood of
+    # entries can't make the display fall behind the server. The follower
+    # raises errors instead of exiting (which would only end its thread),
+    # and reports them through the display.
+    follower = make_client(args, client.server_url, exit_on_error=False)
     
+    def follow() -> None:
+        nonlocal last_log_id
+        while True:
+            try:
+                for log in follower.follow_logs(last_log_id, interval=args.interval, use_stream=not args.no_stream,
+                                                notify=lambda message: display.add(monitor_entry("warn", message))):
+                    last_log_id = log.get("id", last_log_id)
+                    display.add(log)
+            except Exception as e:
+                display.add(monitor_error(e))
+                time.sleep(5)  # Wait longer after an error
+    
+    threading.Thread(target=follow, daemon=True).start()
     try:
+        display.run()
+    except KeyboardInterrupt:
+        display.close()
+        print(f"\n{Colors.YELLOW}Monitor stopped.{Colors.RESET}")
+        if args.verbose:
+            print_connection_stats(follower)
+    finally:
+        follower.close()
+
+# Multi-target commands (several --server URLs or --targets FILE)
+
+# Helper to describe a per-target failure in one line
+def describe_error(error: BaseException) -> str:
+    import requests
+    if isinstance(error, SystemExit):
+        return "failed"
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    return str(error) or type(error).__name__
+
+# Helper to print the targets that failed, after the merged output
+def print_target_errors(results: List[Tuple["Target", Any, Optional[BaseException]]]) -> None:
+    for target, _, error in results:
+        if error is not None:
+            print(f"{Colors.RED}{target.name}: {describe_error(error)}{Colors.RESET}")
+
+def target_summary(results: List[Tuple["Target", Any, Optional[BaseException]]]) -> Dict[str, Any]:
+    return {target.name: {"url": target.debug_server_url, "success": error is None,
+                          **({"error": describe_error(error)} if error is not None else {})}
+            for target, _, error in results}
+
+def cmd_logs_multi(clients: Dict[str, DebugServerClient], targets: List["Target"], args: argparse.Namespace) -> None:
+    from targets import fan_out
+    results = fan_out(targets, lambda target: fetch_logs(clients[target.name], args))
+    
+    # Each target's logs are newest first; interleave them by timestamp
+    tagged = [[dict(log, target=target.name) for log in logs] for target, logs, error in results if error is None]
+    logs = list(islice(heapq.merge(*tagged, key=lambda log: log.get("timestamp", ""), reverse=True), args.limit))
+    
+    if args.json:
+        print(format_json({"logs": logs, "targets": target_summary(results)}))
+        return
+    
+    target_width = max(len(target.name) for target in targets)
+    if logs:
+        renderer = LogRenderer(verbose=args.verbose, max_data_chars=args.max_data, target_width=target_width)
+        print(f"{Colors.BOLD}Found {len(logs)} log entries across {len(tagged)} targets:{Colors.RESET}")
+        print(renderer.separator)
+        renderer.write(logs)
+    else:
+        print(f"{Colors.YELLOW}No logs found matching your criteria.{Colors.RESET}")
+    print_target_errors(results)
+    
+    if args.save and logs:
+        save_logs(logs, args.save, target_width)
+
+def cmd_test_multi(clients: Dict[str, DebugServerClient], targets: List["Target"], args: argparse.Namespace) -> None:
+    print(f"{Colors.BOLD}Testing FormSpree connectivity on {len(targets)} targets...{Colors.RESET}")
+    
+    def run(target: "Target") -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = clients[target.name].test_formspree()
+        result["elapsed"] = time.perf_counter() - start
+        return result
+    
+    from targets import fan_out
+    results = fan_out(targets, run)
+    if args.json:
+        print(format_json({target.name: result if error is None else {"success": False, "error": describe_error(error)}
+                           for target, result, error in results}))
+        return
+    
+    width = max(len(target.name) for target in targets)
+    print(f"{Colors.BOLD}{'Target':<{width}}  Result  Status    Time{Colors.RESET}")
+    for target, result, error in results:
+        result = result or {"success": False, "error": describe_error(error)}
+        passed = result.get("success")
+        status_text = f"{Colors.GREEN}PASSED{Colors.RESET}" if passed else f"{Colors.RED}FAILED{Colors.RESET}"
+        elapsed = f"{result['elapsed']:.2f}s" if "elapsed" in result else "-"
+        line = f"{target.name:<{width}}  {status_text}  {str(result.get('status', '-')):>6}  {elapsed:>6}"
+        if not passed and result.get("error"):
+            line += f"  {Colors.RED}{result['error']}{Colors.RESET}"
+        print(line)
+    
+    if not all(error is None and result.get("success") for _, result, error in results):
+        sys.exit(1)
+
+def cmd_env_multi(clients: Dict[str, DebugServerClient], targets: List["Target"], args: argparse.Namespace) -> None:
+    from targets import fan_out
+    results = fan_out(targets, lambda target: clients[target.name].check_environment())
+    if args.json:
+        print(format_json({target.name: result if error is None else {"success": False, "error": describe_error(error)}
+                           for target, result, error in results}))
+        return
+    
+    width = max(len(target.name) for target in targets)
+    print(f"{Colors.BOLD}{'Target':<{width}}  {'Node.js':<10} {'Environment':<12} {'Uptime':>10}  PID{Colors.RESET}")
+    for target, result, error in results:
+        env = (result or {}).get("environment")
+        if error is not None or not env:
+            reason = describe_error(error) if error is not None else (result or {}).get("error", "no environment")
+            print(f"{target.name:<{width}}  {Colors.RED}{reason}{Colors.RESET}")
+            continue
+        print(f"{target.name:<{width}}  {Colors.CYAN}{env.get('node_version', '-'):<10} {env.get('env', '-'):<12} "
+              f"{env.get('uptime', 0):>9.0f}s  {env.get('process_id', '-')}{Colors.RESET}")
+
+def cmd_clear_multi(clients: Dict[str, DebugServerClient], targets: List["Target"], args: argparse.Namespace) -> None:
+    if not args.force:
+        names = ", ".join(target.name for target in targets)
+        confirm = input(f"{Colors.YELLOW}Are you sure you want to clear all logs on {names}? (y/N): {Colors.RESET}")
+        if confirm.lower() != "y":
+            print("Operation cancelled.")
+            return
+    
+    from log_cache import LogCache
+    from targets import fan_out
+    
+    def clear(target: "Target") -> Dict[str, Any]:
+        client = clients[target.name]
+        result = client.clear_logs()
+        if result.get("success"):
+            with LogCache.for_server(client.server_url, args.cache_dir) as cache:
+                cache.clear()
+        return result
+    
+    results = fan_out(targets, clear)
+    if args.json:
+        print(format_json(target_summary(results)))
+        return
+    for target, result, error in results:
+        if error is None and result.get("success"):
+            print(f"{Colors.GREEN}{target.name}: all logs have been cleared.{Colors.RESET}")
+        else:
+            print(f"{Colors.RED}{target.name}: failed to clear logs"
+                  f"{f' ({describe_error(error)})' if error is not None else ''}.{Colors.RESET}")
+
+def cmd_monitor_multi(clients: Dict[str, DebugServerClient], targets: List["Target"], args: argparse.Namespace) -> None:
+    print(f"{Colors.BOLD}Starting log monitor for {len(targets)} targets...{Colors.RESET}")
+    print(f"{Colors.GRAY}Press Ctrl+C to stop{Colors.RESET}")
+    print("-" * get_terminal_width())
+    
+    # One follower thread per target feeds the display; only this thread prints
+    display = make_monitor_display(args, target_width=max(len(target.name) for target in targets))
+    
+    def follow(target: "Target") -> None:
+        client = clients[target.name]
+        last_log_id = "0"
+        notify = lambda message: display.add(monitor_entry("warn", message, target=target.name))
         while True:
             try:
-                # Get latest logs
-                logs_result = client.get_logs(limit=10)
-                logs = logs_result.get("logs", [])
-                
-                if logs:
-                    # Check if we have new logs
-                    newest_log_id = logs[0].get("id")
-                    
-                    if newest_log_id != last_log_id and last_log_id is not None:
-                        # Find all new logs
-                        new_logs = []
-                        for log in logs:
-                            if log.get("id") == last_log_id:
-                                break
-                            new_logs.append(log)
-                        
-                        # Display new logs
-                        for log in reversed(new_logs):
-                            print(format_log_entry(log, args.verbose))
-                            print("-" * get_terminal_width())
-                    
-                    # Update the last seen log ID
-                    last_log_id = newest_log_id
-                
-                # On first run, just save the latest log ID without displaying
-                if last_log_id is None and logs:
-                    last_log_id = logs[0].get("id")
-                    print(f"{Colors.GRAY}Monitoring for new logs...{Colors.RESET}")
-                
-                # Wait before checking again
-                time.sleep(2)
-            
+                if last_log_id == "0":
+                    latest = client.get_logs(limit=1, fields=["id"]).get("logs", [])
+                    last_log_id = latest[0].get("id", "0") if latest else "0"
+                for log in client.follow_logs(last_log_id, interval=args.interval, use_stream=not args.no_stream,
+                                              notify=notify):
+                    last_log_id = log.get("id", last_log_id)
+                    display.add(dict(log, target=target.name))
             except Exception as e:
-                print(f"{Colors.RED}Error during monitoring: {e}{Colors.RESET}")
+                display.add(monitor_error(e, target=target.name))
                 time.sleep(5)  # Wait longer after an error
     
+    for target in targets:
+        threading.Thread(target=follow, args=(target,), daemon=True).start()
+    
+    print(f"{Colors.GRAY}Monitoring for new logs...{Colors.RESET}")
+    try:
+        display.run()
     except KeyboardInterrupt:
+        display.close()
         print(f"\n{Colors.YELLOW}Monitor stopped.{Colors.RESET}")
 
-def cmd_help(args: argparse.Namespace) -> None:
+MULTI_TARGET_COMMANDS = {
+    "logs": cmd_logs_multi,
+    "test": cmd_test_multi,
+    "env": cmd_env_multi,
+    "clear": cmd_clear_multi,
+    "monitor": cmd_monitor_multi,
+}
+
+def run_multi_target(targets: List["Target"], args: argparse.Namespace, client_factory: Callable[..., DebugServerClient]) -> None:
+    command = MULTI_TARGET_COMMANDS.get(args.command)
+    if command is None:
+        print(f"{Colors.RED}Error: '{args.command}' works with one server at a time; "
+              f"multiple targets support {', '.join(MULTI_TARGET_COMMANDS)}{Colors.RESET}")
+        sys.exit(1)
+    
+    clients = {target.name: client_factory(args, target.debug_server_url, exit_on_error=False) for target in targets}
+    command(clients, targets, args)
+
+def cmd_help(args: Optional[argparse.Namespace] = None) -> None:
     print(__doc__)
 
-def main() -> None:
+def make_client(args: argparse.Namespace, server_url: Optional[str] = None,
+                exit_on_error: bool = True) -> DebugServerClient:
+    """Client for the connection options in args (a LogStoreClient with --store)"""
+    if args.store:
+        return LogStoreClient(args.store)
+    return DebugServerClient(
+        server_url=server_url or args.server or DEFAULT_SERVER_URL,
+        api_key=args.api_key,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.timeout,
+        retries=args.retries,
+        pool_size=args.pool_size,
+        exit_on_error=exit_on_error,
+    )
+
+def build_parser() -> argparse.ArgumentParser:
+    from instrumentation import add_instrumentation_arguments
+    from log_cache import DEFAULT_CACHE_DIR
+    from log_export import COMPRESSIONS, FORMATS
+    from log_monitor import DEFAULT_BACKLOG, DEFAULT_REFRESH, DEFAULT_WINDOW
+    from log_stats import DEFAULT_BUCKET, DEFAULT_TOP
+    from replay import DEFAULT_CONCURRENCY as DEFAULT_REPLAY_CONCURRENCY, DEFAULT_TARGET, REPLAY_TARGETS
+    
     # Configure argument parser
     parser = argparse.ArgumentParser(
+        prog="debug_client.py",
         description="FormSpree Debug Client",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=textwrap.dedent("""
@@ -345,12 +1220,21 @@ def main() -> None:
     )
     
     # Server connection arguments
-    parser.add_argument("--server", default=DEFAULT_SERVER_URL, help="Debug server URL")
+    parser.add_argument("--server", help="Debug server URL, or several comma-separated [name=]URLs")
+    parser.add_argument("--targets", help="File listing deployments to query at once (see targets.py)")
     parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="API key for the debug server")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT, help="Connect timeout in seconds")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_READ_TIMEOUT, help="Read timeout in seconds")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries on connection errors and 5xx responses")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE, help="Maximum pooled connections to the server")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the local log cache")
+    parser.add_argument("--store", help="Read logs directly from a log store directory instead of the server")
     
     # Global output arguments
     parser.add_argument("--verbose", action="store_true", help="Show detailed output")
     parser.add_argument("--json", action="store_true", help="Output raw JSON")
+    parser.add_argument("--max-data", type=int, default=DEFAULT_MAX_DATA_CHARS, help="Truncate --verbose data payloads longer than this (0 = no limit)")
+    add_instrumentation_arguments(parser)
     
     # Create subcommands
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -361,6 +1245,23 @@ def main() -> None:
     logs_parser.add_argument("--type", help="Filter logs by type")
     logs_parser.add_argument("--search", help="Search for text in logs")
     logs_parser.add_argument("--save", help="Save logs to file")
+    logs_parser.add_argument("--no-cache", action="store_true", help="Query the server directly instead of the local cache")
+    
+    # search command
+    search_parser = subparsers.add_parser("search", help="Full-text search over logs, including data payloads")
+    search_parser.add_argument("query", nargs="+", help='Query, e.g. type:error data.email:foo "bad request" form*')
+    search_parser.add_argument("--limit", type=int, default=20, help="Limit number of results")
+    search_parser.add_argument("--since", help="Only entries at or after this ISO timestamp")
+    search_parser.add_argument("--until", help="Only entries before this ISO timestamp")
+    search_parser.add_argument("--no-cache", action="store_true", help="Search the server's current logs without the local cache")
+    
+    # export command
+    export_parser = subparsers.add_parser("export", help="Export logs to JSONL, CSV, text or a columnar file")
+    export_parser.add_argument("-o", "--output", required=True, help="Output file")
+    export_parser.add_argument("--format", choices=FORMATS, default="jsonl", help="Output format")
+    export_parser.add_argument("--compress", choices=COMPRESSIONS, help="Compression (default: from file extension)")
+    export_parser.add_argument("--since-id", default="0", help="Only export entries newer than this log id")
+    export_parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Entries fetched per request")
     
     # clear command
     clear_parser = subparsers.add_parser("clear", help="Clear all logs")
@@ -374,29 +1275,91 @@ def main() -> None:
     
     # monitor command
     monitor_parser = subparsers.add_parser("monitor", help="Start a live monitor for form submissions")
+    monitor_parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Polling interval in seconds when streaming is unavailable")
+    monitor_parser.add_argument("--no-stream", action="store_true", help="Poll with a cursor instead of streaming")
+    monitor_parser.add_argument("--coalesce", type=float, default=DEFAULT_WINDOW, metavar="SECONDS",
+                                help="Count repeats of an entry within this many seconds on one line (0 = off)")
+    monitor_parser.add_argument("--refresh", type=float, default=DEFAULT_REFRESH, help="Maximum redraws per second")
+    monitor_parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG,
+                                help="Entries kept waiting for a redraw before the oldest are dropped")
+    monitor_parser.add_argument("--summary", action="store_true", help="Show a live pane of per-type rates")
+    
+    # stats command
+    stats_parser = subparsers.add_parser("stats", help="Entry counts per time bucket, error rate, top messages and latency")
+    stats_parser.add_argument("--since", help="Only entries at or after this ISO time or age (e.g. 1d)")
+    stats_parser.add_argument("--until", help="Only entries before this ISO time or age")
+    stats_parser.add_argument("--bucket", default=DEFAULT_BUCKET, help="Time bucket width, e.g. 5m, 1h, 1d")
+    stats_parser.add_argument("--type", help="Only entries of this type")
+    stats_parser.add_argument("--search", help="Only entries whose message or type contains this text")
+    stats_parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of top messages to show")
+    stats_parser.add_argument("--latency-field", action="append",
+                              help="Numeric data field to summarize, e.g. duration_ms or timings.total (repeatable)")
+    stats_parser.add_argument("--table", action="store_true", help="Print a row per bucket instead of sparklines")
+    stats_parser.add_argument("--no-cache", action="store_true", help="Read from the server instead of the local cache")
+    
+    # replay command
+    replay_parser = subparsers.add_parser("replay", help="Re-send logged form submissions and compare the responses")
+    replay_parser.add_argument("--form", help="Only submissions of this form")
+    replay_parser.add_argument("--failed", action="store_true", help="Only submissions that originally failed")
+    replay_parser.add_argument("--id", action="append", help="Only the submission logged with this id (repeatable)")
+    replay_parser.add_argument("--since", help="Only submissions at or after this ISO time or age (e.g. 2h)")
+    replay_parser.add_argument("--until", help="Only submissions before this ISO time or age")
+    replay_parser.add_argument("--limit", type=int, default=100, help="Replay at most the newest N submissions (0 = all)")
+    replay_parser.add_argument("--target", choices=sorted(REPLAY_TARGETS), default=DEFAULT_TARGET,
+                               help="Endpoint to send to (default: the form proxy the site uses)")
+    replay_parser.add_argument("--url", help="Site URL, or the FormSpree endpoint with --target formspree "
+                                             "(default: the site of --server)")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Replay N times faster than the original timing")
+    replay_parser.add_argument("--fast", action="store_true", help="Ignore the original timing and send as fast as possible")
+    replay_parser.add_argument("--max-gap", type=float, help="Cap pauses between submissions at this many seconds")
+    replay_parser.add_argument("--concurrency", type=int, default=DEFAULT_REPLAY_CONCURRENCY, help="Maximum requests in flight")
+    replay_parser.add_argument("--dry-run", action="store_true", help="List the submissions without sending them")
+    replay_parser.add_argument("--force", action="store_true", help="Don't ask before replaying to a non-local URL")
+    replay_parser.add_argument("--no-cache", action="store_true", help="Read from the server instead of the local cache")
     
     # help command
     help_parser = subparsers.add_parser("help", help="Show help message")
     
-    # Parse arguments
-    args = parser.parse_args()
-    
-    # Show help if no command specified
-    if not args.command:
-        parser.print_help()
-        return
+    return parser
+
+def execute(args: argparse.Namespace, client_factory: Callable[..., DebugServerClient] = make_client) -> None:
+    """Run a parsed command.
     
-    # Handle help command specially
-    if args.command == "help":
-        cmd_help(args)
+    Clients come from client_factory(args, server_url=None, exit_on_error=True)
+    and are closed by the caller, so a long-lived caller (debug_agent.py) can
+    keep them warm between commands.
+    """
+    # Several deployments: query them all at once and merge the output
+    if args.targets or (args.server and "," in args.server):
+        from targets import load_targets
+        if args.store:
+            print(f"{Colors.RED}Error: --store can't be combined with multiple targets{Colors.RESET}")
+            sys.exit(1)
+        try:
+            targets = load_targets(args.server, args.targets)
+        except OSError as e:
+            print(f"{Colors.RED}Error reading targets: {e}{Colors.RESET}")
+            sys.exit(1)
+        if not targets:
+            print(f"{Colors.RED}Error: no targets given{Colors.RESET}")
+            sys.exit(1)
+        run_multi_target(targets, args, client_factory)
         return
     
     # Create client
-    client = DebugServerClient(server_url=args.server, api_key=args.api_key)
+    try:
+        client = client_factory(args)
+    except FileNotFoundError as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        sys.exit(1)
     
     # Dispatch to command handler
     if args.command == "logs":
         cmd_logs(client, args)
+    elif args.command == "search":
+        cmd_search(client, args)
+    elif args.command == "export":
+        cmd_export(client, args)
     elif args.command == "clear":
         cmd_clear(client, args)
     elif args.command == "test":
@@ -405,9 +1368,60 @@ def main() -> None:
         cmd_env(client, args)
     elif args.command == "monitor":
         cmd_monitor(client, args)
+    elif args.command == "stats":
+        cmd_stats(client, args)
+    elif args.command == "replay":
+        cmd_replay(client, args)
     else:
         print(f"{Colors.RED}Unknown command: {args.command}{Colors.RESET}")
+    
+    if args.verbose and not args.json:
+        print_connection_stats(client)
+
+def main() -> None:
+    argv = sys.argv[1:]
+    
+    # Answer help before loading anything else
+    if argv[:1] == ["help"]:
+        cmd_help()
+        return
+    
+    # Hand the command to a running debug_agent.py, which keeps warm connections
+    if not os.environ.get("DEBUG_CLIENT_NO_AGENT"):
+        from debug_agent import forward
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+    
+    # Parse arguments
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    # Show help if no command specified
+    if not args.command:
         parser.print_help()
+        return
+    
+    # Handle help command specially
+    if args.command == "help":
+        cmd_help(args)
+        return
+    
+    from instrumentation import setup_instrumentation
+    setup_instrumentation(args)
+    
+    clients: List[DebugServerClient] = []
+    
+    def client_factory(*factory_args: Any, **factory_kwargs: Any) -> DebugServerClient:
+        client = make_client(*factory_args, **factory_kwargs)
+        clients.append(client)
+        return client
+    
+    try:
+        execute(args, client_factory)
+    finally:
+        for client in clients:
+            client.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Form Test History - Stores every form test result and reports trends.
+
+Each form has its own file (<form>.bin) of fixed 16-byte
+little-endian records: timestamp (epoch ms, int64), latency (seconds,
+float32), HTTP status (uint16) and error id (uint16, 0 = passed). Error
+messages are kept once in errors.json. form_test.py and form_monitor.py
+append to the store; imports merge older results in by timestamp and
+replace the file, so the records stay sorted and range queries can
+binary-search the timestamps, reading only the requested window. Writers
+hold a lock file in the directory (where fcntl is available). numpy is used for the analytics when it is
+installed (pip install numpy); otherwise the same results are computed in
+pure Python, more slowly.
+
+Usage:
+  python form_history.py [command] [options]
+  python form_test.py history [command] [options]
+
+Commands:
+  summary       - Success rate and latency percentiles per form (default)
+  trend         - Success rate and latency per time bucket
+  regressions   - Points where latency or failure rate shifted
+  import FILE   - Import the server's form-test-results.json
+
+Options:
+  --dir DIR         History directory (default: $FORM_HISTORY_DIR or form-test-history)
+  --form FORM       Only this form (repeatable)
+  --since WHEN      Start of the window: ISO date/time or an age like 7d, 12h, 30m (default: 7d)
+  --until WHEN      End of the window (default: now)
+  --bucket SIZE     Bucket size for trend, e.g. 1h, 1d (default: 1h)
+  --window N        Runs on each side of a candidate change point (default: 120)
+  --threshold Z     Minimum z-score for a change point (default: 4.5)
+  --json            Print JSON instead of tables
+
+Examples:
+  python form_test.py history
+  python form_test.py history trend --form contactPage --since 30d --bucket 1d
+  python form_test.py history regressions --since 7d
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers aren't serialized
+    fcntl = None
+
+RECORD = struct.Struct("<qfHH")  # ts ms, latency s, HTTP status, error id (0 = passed)
+RECORD_DTYPE = [("ts", "<i8"), ("latency", "<f4"), ("status", "<u2"), ("error", "<u2")]
+ERRORS_FILE = "errors.json"
+LOCK_FILE = ".lock"
+MAX_ERROR_IDS = 65535
+MAX_ERROR_CHARS = 300
+GENERIC_ERROR = "Failed"
+
+DEFAULT_HISTORY_DIR = os.environ.get("FORM_HISTORY_DIR", "form-test-history")
+DEFAULT_SINCE = "7d"
+DEFAULT_BUCKET = "1h"
+DEFAULT_WINDOW = 120
+DEFAULT_THRESHOLD = 4.5
+MIN_RELATIVE_CHANGE = 0.2  # ignore statistically clear but small latency shifts
+
+DURATION_UNITS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+# Terminal colors
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+def parse_duration(value: str) -> int:
+    """Milliseconds in a duration like 30m, 12h or 7d"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 30m, 12h, 7d)")
+    return int(float(match.group(1)) * DURATION_UNITS[match.group(2)])
+
+def parse_when(value: Optional[str], default: Optional[int] = None) -> Optional[int]:
+    """Epoch ms for an ISO date/time or an age relative to now (7d = seven days ago)"""
+    if not value:
+        return default
+    if re.fullmatch(r"\d+(?:\.\d+)?[smhdw]", value.strip()):
+        return now_ms() - parse_duration(value)
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+def format_ms(ts: int) -> str:
+    return datetime.fromtimestamp(ts / 1000).strftime("%Y-%m-%d %H:%M")
+
+def normalize_error(error: str) -> str:
+    # Object addresses and ports make every connection error unique
+    error = re.sub(r"0x[0-9a-fA-F]+", "0x?", error)
+    error = re.sub(r"port=\d+", "port=?", error)
+    return error[:MAX_ERROR_CHARS]
+
+class Series:
+    """The runs of one form in a time window, as columns.
+
+    Columns are numpy arrays when numpy is installed, lists otherwise.
+    """
+
+    def __init__(self, form: str, ts: Sequence[int], latency: Sequence[float],
+                 status: Sequence[int], error: Sequence[int]):
+        self.form = form
+        self.ts = ts
+        self.latency = latency
+        self.status = status
+        self.error = error
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def passed(self) -> Sequence[bool]:
+        if np is not None:
+            return self.error == 0
+        return [e == 0 for e in self.error]
+
+class HistoryStore:
+    """Per-form binary result files in one directory"""
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR):
+        self.directory = directory
+        self._errors: Optional[List[str]] = None
+        self._lock_file: Optional[Any] = None
+
+    def path(self, form: str) -> str:
+        return os.path.join(self.directory, quote(form, safe="") + ".bin")
+
+    def forms(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(unquote(name[:-4]) for name in os.listdir(self.directory) if name.endswith(".bin"))
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the store's lock (re-entrant within this store)"""
+        if self._lock_file is not None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            self._lock_file = f
+            try:
+                yield
+            finally:
+                self._lock_file = None  # closing the file releases the lock
+
+    # Errors table
+
+    def errors(self) -> List[str]:
+        if self._errors is None:
+            try:
+                with open(os.path.join(self.directory, ERRORS_FILE)) as f:
+                    self._errors = json.load(f)
+            except FileNotFoundError:
+                self._errors = []
+        return self._errors
+
+    def error_text(self, error_id: int) -> str:
+        errors = self.errors()
+        return errors[error_id - 1] if 0 < error_id <= len(errors) else GENERIC_ERROR
+
+    def error_id(self, error: Optional[str]) -> int:
+        text = normalize_error(error or GENERIC_ERROR)
+        errors = self.errors()
+        if text in errors:
+            return errors.index(text) + 1
+        with self._locked():
+            # Another writer may have added it since we loaded the table
+            self._errors = None
+            errors = self.errors()
+            if text in errors:
+                return errors.index(text) + 1
+            if len(errors) >= MAX_ERROR_IDS:
+                return self.error_id(GENERIC_ERROR) if text != GENERIC_ERROR else 1
+            errors.append(text)
+            path = os.path.join(self.directory, ERRORS_FILE)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(errors, f)
+            os.replace(temp_path, path)
+            return len(errors)
+
+    # Writing
+
+    def _pack(self, results: Iterable[Tuple[int, float, int, bool, Optional[str]]]) -> List[bytes]:
+        return [RECORD.pack(ts, latency, status or 0, 0 if success else self.error_id(error))
+                for ts, latency, status, success, error in results]
+
+    def append(self, form: str, results: Iterable[Tuple[int, float, int, bool, Optional[str]]]) -> int:
+        """Append (ts ms, latency s, status, success, error) tuples for one form"""
+        with self._locked():
+            data = b"".join(self._pack(results))
+            with open(self.path(form), "ab") as f:
+                f.write(data)
+        return len(data) // RECORD.size
+
+    def merge(self, form: str, results: Iterable[Tuple[int, float, int, bool, Optional[str]]]) -> int:
+        """Add results of any age to one form, keeping the file sorted by timestamp
+
+        Records the file already has are skipped; returns the number added.
+        """
+        with self._locked():
+            path = self.path(form)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = b""
+            records = [data[pos:pos + RECORD.size] for pos in range(0, len(data) - RECORD.size + 1, RECORD.size)]
+            seen = set(records)
+            added = [record for record in dict.fromkeys(self._pack(results)) if record not in seen]
+            if not added:
+                return 0
+            if records and RECORD.unpack(added[0])[0] < RECORD.unpack(records[-1])[0]:
+                records.extend(added)
+                records.sort(key=lambda record: RECORD.unpack(record)[0])  # stable: ties keep file order
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(b"".join(records))
+                os.replace(temp_path, path)
+            else:
+                with open(path, "ab") as f:
+                    f.write(b"".join(added))
+            return len(added)
+
+    def record_run(self, results: Dict[str, Dict[str, Any]], ts: Optional[int] = None) -> None:
+        """Store a form_test.py results dict ({form: {success, status, error, elapsed}})"""
+        ts = ts if ts is not None else now_ms()
+        for form, result in results.items():
+            self.append(form, [(ts, float(result.get("elapsed", math.nan)), int(result.get("status") or 0),
+                                bool(result.get("success")), result.get("error"))])
+
+    def import_server_results(self, path: str) -> int:
+        """Import the auto-test route's form-test-results.json (no latencies)
+
+        Results already in the store (e.g. from an earlier import of the same
+        file) are skipped; returns the number of results added.
+        """
+        with open(path) as f:
+            tests = json.load(f).get("tests", [])
+        by_form: Dict[str, List[Tuple[int, float, int, bool, Optional[str]]]] = {}
+        for test in reversed(tests):  # the file is newest first
+            details = test.get("details") or {}
+            ts = parse_when(test["timestamp"])
+            by_form.setdefault(test["test_name"], []).append(
+                (ts, math.nan, int(details.get("status") or 0), bool(test.get("success")), details.get("error")))
+        added = 0
+        for form, rows in by_form.items():
+            rows.sort(key=lambda row: row[0])
+            added += self.merge(form, rows)
+        return added
+
+    # Reading
+
+    def load(self, form: str, since: Optional[int] = None, until: Optional[int] = None) -> Series:
+        """Runs of one form with since <= ts < until"""
+        try:
+            f = open(self.path(form), "rb")
+        except FileNotFoundError:
+            return self._series(form, [])
+        with f:
+            count = os.fstat(f.fileno()).st_size // RECORD.size
+            if not count:
+                return self._series(form, [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if np is not None:
+                    records = np.frombuffer(mapped, dtype=RECORD_DTYPE, count=count)
+                    start = int(records["ts"].searchsorted(since)) if since is not None else 0
+                    end = int(records["ts"].searchsorted(until)) if until is not None else count
+                    window = records[start:end].copy()
+                    del records  # release the buffer before the map closes
+                    return Series(form, window["ts"], window["latency"].astype(float),
+                                  window["status"], window["error"])
+                start = self._lower_bound(mapped, count, since) if since is not None else 0
+                end = self._lower_bound(mapped, count, until) if until is not None else count
+                rows = list(RECORD.iter_unpack(mapped[start * RECORD.size:end * RECORD.size]))
+        return self._series(form, rows)
+
+    @staticmethod
+    def _lower_bound(mapped: mmap.mmap, count: int, ts: int) -> int:
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if RECORD.unpack_from(mapped, mid * RECORD.size)[0] < ts:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    @staticmethod
+    def _series(form: str, rows: List[Tuple[int, float, int, int]]) -> Series:
+        columns = list(zip(*rows)) if rows else [(), (), (), ()]
+        if np is not None:
+            return Series(form, np.array(columns[0], dtype=np.int64), np.array(columns[1], dtype=float),
+                          np.array(columns[2], dtype=np.uint16), np.array(columns[3], dtype=np.uint16))
+        return Series(form, *(list(column) for column in columns))
+
+# Analytics
+
+def percentiles(values: Sequence[float], points: Sequence[float] = (50, 90, 99)) -> List[Optional[float]]:
+    """Nearest-rank percentiles, ignoring NaN (runs imported without a latency)"""
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return [None] * len(points)
+        return [float(v) for v in np.percentile(values, points, method="inverted_cdf")]
+    ordered = sorted(v for v in values if not math.isnan(v))
+    if not ordered:
+        return [None] * len(points)
+    return [ordered[max(math.ceil(len(ordered) * p / 100) - 1, 0)] for p in points]
+
+def summarize(store: HistoryStore, series: Series) -> Dict[str, Any]:
+    runs = len(series)
+    if not runs:
+        return {"form": series.form, "runs": 0}
+    passed = int(sum(series.passed))
+    p50, p90, p99 = percentiles(series.latency)
+    errors = Counter(int(e) for e in series.error if e)
+    return {
+        "form": series.form,
+        "runs": runs,
+        "success_rate": passed / runs,
+        "p50": p50,
+        "p90": p90,
+        "p99": p99,
+        "last_run": int(series.ts[-1]),
+        "last_success": bool(series.error[-1] == 0),
+        "top_errors": [{"error": store.error_text(e), "count": c} for e, c in errors.most_common(3)],
+    }
+
+def rolling(series: Series, bucket_ms: int) -> List[Dict[str, Any]]:
+    """Success rate and latency percentiles per time bucket"""
+    if not len(series):
+        return []
+    if np is not None:
+        buckets = series.ts // bucket_ms
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        runs = np.diff(np.r_[starts, len(buckets)])
+        passed = np.add.reduceat(series.passed.astype(np.int64), starts)
+        groups = [(int(buckets[s]), int(n), int(p), series.latency[s:s + n])
+                  for s, n, p in zip(starts, runs, passed)]
+    else:
+        groups = []
+        for i, ts in enumerate(series.ts):
+            bucket = ts // bucket_ms
+            if not groups or groups[-1][0] != bucket:
+                groups.append([bucket, 0, 0, []])
+            group = groups[-1]
+            group[1] += 1
+            group[2] += series.error[i] == 0
+            group[3].append(series.latency[i])
+    trend = []
+    for bucket, count, passed_count, latencies in groups:
+        p50, p90 = percentiles(latencies, (50, 90))
+        trend.append({"start": bucket * bucket_ms, "runs": count,
+                      "success_rate": passed_count / count, "p50": p50, "p90": p90})
+    return trend
+
+def _shift_scores(values: Sequence[float], window: int) -> Tuple[List[int], List[float], List[float], List[float]]:
+    """Two-sample z-score of the mean of `window` values after each split vs. before it.
+
+    Uses prefix sums, so all splits cost O(n) together.
+    """
+    n = len(values)
+    if np is not None:
+        x = np.asarray(values, dtype=float)
+        sums = np.r_[0.0, np.cumsum(x)]
+        squares = np.r_[0.0, np.cumsum(x * x)]
+        k = np.arange(window, n - window + 1)
+        before = (sums[k] - sums[k - window]) / window
+        after = (sums[k + window] - sums[k]) / window
+        var_before = (squares[k] - squares[k - window]) / window - before ** 2
+        var_after = (squares[k + window] - squares[k]) / window - after ** 2
+        spread = np.sqrt(np.maximum(var_before + var_after, 1e-12) / window)
+        return k.tolist(), ((after - before) / spread).tolist(), before.tolist(), after.tolist()
+    sums, squares = [0.0], [0.0]
+    for v in values:
+        sums.append(sums[-1] + v)
+        squares.append(squares[-1] + v * v)
+    splits, scores, befores, afters = [], [], [], []
+    for k in range(window, n - window + 1):
+        before = (sums[k] - sums[k - window]) / window
+        after = (sums[k + window] - sums[k]) / window
+        variance = ((squares[k] - squares[k - window]) / window - before ** 2
+                    + (squares[k + window] - squares[k]) / window - after ** 2)
+        spread = math.sqrt(max(variance, 1e-12) / window)
+        splits.append(k)
+        scores.append((after - before) / spread)
+        befores.append(before)
+        afters.append(after)
+    return splits, scores, befores, afters
+
+def _pick_peaks(splits: List[int], scores: List[float], window: int, threshold: float) -> List[int]:
+    # Strongest split first; suppress weaker ones within a window of it
+    candidates = sorted((i for i, score in enumerate(scores) if abs(score) >= threshold),
+                        key=lambda i: -abs(scores[i]))
+    chosen: List[int] = []
+    for i in candidates:
+        if all(abs(splits[i] - splits[j]) >= window for j in chosen):
+            chosen.append(i)
+    return sorted(chosen, key=lambda i: splits[i])
+
+def change_points(series: Series, window: int = DEFAULT_WINDOW,
+                  threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Sustained shifts in latency (log scale, successful runs) and failure rate"""
+    found = []
+    if np is not None:
+        ok = series.passed & ~np.isnan(series.latency) & (series.latency > 0)
+        latency_ts, latency_values = series.ts[ok], np.log(series.latency[ok])
+        failures = (~series.passed).astype(float)
+    else:
+        ok = [i for i, e in enumerate(series.error)
+              if e == 0 and not math.isnan(series.latency[i]) and series.latency[i] > 0]
+        latency_ts = [series.ts[i] for i in ok]
+        latency_values = [math.log(series.latency[i]) for i in ok]
+        failures = [float(e != 0) for e in series.error]
+
+    for metric, ts, values in (("latency", latency_ts, latency_values), ("failure_rate", series.ts, failures)):
+        if len(values) < 2 * window:
+            continue
+        splits, scores, befores, afters = _shift_scores(values, window)
+        for i in _pick_peaks(splits, scores, window, threshold):
+            if metric == "latency":
+                before, after = math.exp(befores[i]), math.exp(afters[i])
+                if abs(after - before) / before < MIN_RELATIVE_CHANGE:
+                    continue
+            else:
+                before, after = befores[i], afters[i]
+            found.append({"form": series.form, "metric": metric, "at": int(ts[splits[i]]),
+                          "before": before, "after": after, "z": round(scores[i], 1)})
+    return sorted(found, key=lambda point: point["at"])
+
+# Output
+
+def format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+def format_rate(rate: float) -> str:
+    color = Colors.GREEN if rate >= 0.99 else Colors.YELLOW if rate >= 0.9 else Colors.RED
+    return f"{color}{rate * 100:6.1f}%{Colors.RESET}"
+
+def print_summary(summaries: List[Dict[str, Any]]) -> None:
+    print(f"{Colors.BOLD}{'Form':<20} {'Runs':>7} {'Success':>7} {'p50':>8} {'p90':>8} {'p99':>8}  Last run{Colors.RESET}")
+    for s in summaries:
+        if not s["runs"]:
+            print(f"{s['form']:<20} {0:>7}  {Colors.GRAY}no runs in range{Colors.RESET}")
+            continue
+        last = f"{format_ms(s['last_run'])} {'passed' if s['last_success'] else Colors.RED + 'failed' + Colors.RESET}"
+        print(f"{s['form']:<20} {s['runs']:>7} {format_rate(s['success_rate'])} {format_seconds(s['p50']):>8} "
+              f"{format_seconds(s['p90']):>8} {format_seconds(s['p99']):>8}  {last}")
+        for error in s["top_errors"]:
+            print(f"  {Colors.GRAY}{error['count']:>5}x {error['error']}{Colors.RESET}")
+
+def print_trend(form: str, trend: List[Dict[str, Any]]) -> None:
+    print(f"\n{Colors.BOLD}{form}{Colors.RESET}")
+    print(f"{Colors.GRAY}{'Bucket':<17} {'Runs':>6} {'Success':>7} {'p50':>8} {'p90':>8}{Colors.RESET}")
+    for bucket in trend:
+        print(f"{format_ms(bucket['start']):<17} {bucket['runs']:>6} {format_rate(bucket['success_rate'])} "
+              f"{format_seconds(bucket['p50']):>8} {format_seconds(bucket['p90']):>8}")
+
+def print_regressions(points: List[Dict[str, Any]]) -> None:
+    if not points:
+        print(f"{Colors.GREEN}No sustained changes in latency or failure rate{Colors.RESET}")
+        return
+    for point in points:
+        worse = point["after"] > point["before"]
+        color = Colors.RED if worse else Colors.GREEN
+        if point["metric"] == "latency":
+            change = f"latency {format_seconds(point['before'])} -> {format_seconds(point['after'])}"
+        else:
+            change = f"failure rate {point['before'] * 100:.1f}% -> {point['after'] * 100:.1f}%"
+        print(f"{format_ms(point['at'])}  {Colors.BOLD}{point['form']:<20}{Colors.RESET} "
+              f"{color}{change}{Colors.RESET} {Colors.GRAY}(z={point['z']}){Colors.RESET}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="form_test.py history" if argv is not None else None,
+                                     description="Form test history, trends and regressions")
+    parser.add_argument("command", nargs="?", default="summary",
+                        choices=["summary", "trend", "regressions", "import"], help="Report to show")
+    parser.add_argument("file", nargs="?", help="form-test-results.json for import")
+    parser.add_argument("--dir", default=DEFAULT_HISTORY_DIR, help="History directory")
+    parser.add_argument("--form", action="append", help="Only this form (repeatable)")
+    parser.add_argument("--since", default=DEFAULT_SINCE, help="ISO date/time or age like 7d")
+    parser.add_argument("--until", help="ISO date/time or age like 1d")
+    parser.add_argument("--bucket", default=DEFAULT_BUCKET, help="Trend bucket size, e.g. 1h")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Runs on each side of a change point")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum change point z-score")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.dir)
+    try:
+        if args.command == "import":
+            if not args.file:
+                parser.error("import needs the path to form-test-results.json")
+            count = store.import_server_results(args.file)
+            print(f"{Colors.GREEN}Imported {count} results into {args.dir}{Colors.RESET}")
+            return
+        since, until = parse_when(args.since), parse_when(args.until)
+        bucket_ms = parse_duration(args.bucket)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        sys.exit(1)
+
+    forms = args.form or store.forms()
+    if not forms:
+        print(f"{Colors.YELLOW}No history in {args.dir} yet - run form_test.py or form_monitor.py first{Colors.RESET}")
+        return
+    all_series = [store.load(form, since, until) for form in forms]
+
+    if args.command == "summary":
+        report: Any = [summarize(store, series) for series in all_series]
+    elif args.command == "trend":
+        report = {series.form: rolling(series, bucket_ms) for series in all_series}
+    else:
+        report = [point for series in all_series for point in change_points(series, args.window, args.threshold)]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.command == "summary":
+        print_summary(report)
+    elif args.command == "trend":
+        for form, trend in report.items():
+            print_trend(form, trend)
+    else:
+        print_regressions(report)
+
+if __name__ == "__main__":
+    main()
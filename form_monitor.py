@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Form Monitor - A long-running synthetic monitor for the website's forms.
+
+Runs the form tests from form_test.py on jittered sub-minute intervals over
+warm keep-alive connections, keeps recent results in memory and in a JSONL
+file, and raises deduplicated, rate-limited alerts when a form starts or
+stops failing. Replaces the hourly form_tests_cron.sh.
+
+Usage:
+  python form_monitor.py [--config FILE] [options]
+
+Options:
+  --config FILE        JSON settings file (keys as below, e.g. {"interval": 15});
+                       re-read on SIGHUP. Command-line options take precedence.
+  --url URL            Base URL of the website (default: $FORM_TOOLS_BASE_URL or http://localhost:3000)
+  --test TEST          Test(s) to run, comma-separated (default: all)
+  --interval S         Seconds between runs of each check (default: 30)
+  --jitter F           Randomize intervals by +/- this fraction (default: 0.2)
+  --timeout S          Per-check timeout in seconds (default: 20)
+  --concurrency N      Checks run at once (default: 4)
+  --output FILE        Append results to this JSONL file (default: form_monitor.jsonl)
+  --history N          Results kept in memory for /results (default: 1000)
+  --history-dir DIR    Also record results for `form_test.py history` (default: $FORM_HISTORY_DIR
+                       or form-test-history; "" = off)
+  --failure-threshold N
+                       Consecutive failures before a check is reported down (default: 2)
+  --realert S          Repeat the down alert every S seconds while down (default: 3600)
+  --alert-rate N       At most N alerts per hour across all checks (default: 10)
+  --alert-command CMD  Shell command run per alert, with the alert JSON on stdin
+  --alert-webhook URL  POST each alert as JSON to this URL
+  --health-port PORT   Serve /healthz, /results and /metrics on 127.0.0.1:PORT (0 = off, default: 8766)
+  --verbose            Print every result, not only failures and alerts
+
+Signals:
+  SIGHUP               Reload --config and reopen --output (for logrotate)
+  SIGINT, SIGTERM      Finish running checks and exit
+
+Examples:
+  python form_monitor.py --interval 15 --alert-command 'mail -s "Form alert" ops@example.com'
+  curl -s localhost:8766/healthz
+"""
+
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from form_history import DEFAULT_HISTORY_DIR, HistoryStore
+from form_test import DEFAULT_URL, _run_single_test, display_result, resolve_tests
+from instrumentation import METRICS, instrument_session
+
+# ANSI color codes for terminal output
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+# Settings and their defaults; a --config file and command-line options override them
+DEFAULTS: Dict[str, Any] = {
+    "url": DEFAULT_URL,
+    "test": "all",
+    "interval": 30.0,
+    "jitter": 0.2,
+    "timeout": 20.0,
+    "concurrency": 4,
+    "output": "form_monitor.jsonl",
+    "history": 1000,
+    "history_dir": DEFAULT_HISTORY_DIR,
+    "failure_threshold": 2,
+    "realert": 3600.0,
+    "alert_rate": 10,
+    "alert_command": None,
+    "alert_webhook": None,
+    "health_port": 8766,
+    "verbose": False,
+}
+
+ALERT_COMMAND_TIMEOUT = 30.0  # seconds
+STALL_FACTOR = 3  # health reports a stall after this many missed intervals
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+def load_settings(config_path: Optional[str], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Defaults, then the config file, then command-line overrides"""
+    settings = dict(DEFAULTS)
+    if config_path:
+        with open(config_path) as f:
+            from_file = json.load(f)
+        unknown = set(from_file) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings in {config_path}: {', '.join(sorted(unknown))}")
+        settings.update(from_file)
+    settings.update(overrides)
+    return settings
+
+class AlertManager:
+    """Turns check results into down/recovered alerts.
+
+    A check is reported down once after failure_threshold consecutive
+    failures, reminded every realert seconds while it stays down, and
+    reported recovered on its next success. At most alert_rate alerts go
+    out per hour; suppressed alerts are counted in the next one sent.
+    """
+
+    def __init__(self, settings: Dict[str, Any], session: requests.Session):
+        self.session = session
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self.sent: Deque[float] = collections.deque()
+        self.suppressed = 0
+        self.lock = threading.Lock()
+        self.configure(settings)
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        self.failure_threshold = max(int(settings["failure_threshold"]), 1)
+        self.realert = float(settings["realert"])
+        self.alert_rate = int(settings["alert_rate"])
+        self.alert_command = settings["alert_command"]
+        self.alert_webhook = settings["alert_webhook"]
+
+    def is_down(self, check: str) -> bool:
+        return bool(self.states.get(check, {}).get("down_since"))
+
+    def update(self, check: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        with self.lock:
+            state = self.states.setdefault(check, {"failures": 0, "down_since": None, "last_alert": 0.0})
+            if result.get("success"):
+                recovered = state["down_since"] is not None
+                downtime = now - state["down_since"] if recovered else 0.0
+                state.update(failures=0, down_since=None, last_alert=0.0)
+                if not recovered:
+                    return
+                alert = {"event": "recovered", "downtime": round(downtime, 1)}
+            else:
+                state["failures"] += 1
+                if state["failures"] < self.failure_threshold:
+                    return
+                if state["down_since"] is None:
+                    state["down_since"] = now
+                    alert = {"event": "down"}
+                elif self.realert and now - state["last_alert"] >= self.realert:
+                    alert = {"event": "still_down", "down_for": round(now - state["down_since"], 1)}
+                else:
+                    return
+                state["last_alert"] = now
+
+            # Rate limit across all checks with a sliding one-hour window
+            while self.sent and now - self.sent[0] > 3600:
+                self.sent.popleft()
+            if self.alert_rate and len(self.sent) >= self.alert_rate:
+                self.suppressed += 1
+                return
+            self.sent.append(now)
+            alert.update({
+                "check": check,
+                "timestamp": utc_now(),
+                "consecutive_failures": state["failures"],
+                "status": result.get("status"),
+                "error": result.get("error"),
+                "suppressed_since_last": self.suppressed,
+            })
+            self.suppressed = 0
+        self.send(alert)
+
+    def send(self, alert: Dict[str, Any]) -> None:
+        color = Colors.GREEN if alert["event"] == "recovered" else Colors.RED
+        print(f"{color}{Colors.BOLD}ALERT{Colors.RESET} {color}{alert['check']} {alert['event']}{Colors.RESET} "
+              f"{Colors.GRAY}{json.dumps(alert)}{Colors.RESET}", flush=True)
+        payload = json.dumps(alert) + "\n"
+        if self.alert_command:
+            try:
+                subprocess.run(self.alert_command, shell=True, input=payload, text=True,
+                               timeout=ALERT_COMMAND_TIMEOUT, check=False)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                print(f"{Colors.RED}Alert command failed: {e}{Colors.RESET}", file=sys.stderr)
+        if self.alert_webhook:
+            try:
+                self.session.post(self.alert_webhook, data=payload, headers={"Content-Type": "application/json"},
+                                  timeout=ALERT_COMMAND_TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                print(f"{Colors.RED}Alert webhook failed: {e}{Colors.RESET}", file=sys.stderr)
+
+class FormMonitor:
+    """Schedules checks, records results and serves health information"""
+
+    def __init__(self, settings: Dict[str, Any], config_path: Optional[str] = None,
+                 overrides: Optional[Dict[str, Any]] = None):
+        self.config_path = config_path
+        self.overrides = overrides or {}
+        self.settings = settings
+        self.started = time.time()
+        self.heartbeat = time.time()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.reload_requested = False
+
+        self.session = self._make_session(settings["concurrency"])
+        self.executor = ThreadPoolExecutor(max_workers=settings["concurrency"], thread_name_prefix="check")
+        self.results: Deque[Dict[str, Any]] = collections.deque(maxlen=settings["history"])
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.in_flight: Dict[str, Tuple[float, int]] = {}  # check -> (started, run id)
+        self.run_ids = 0
+        self.checks_run = 0
+        self.alerts = AlertManager(settings, self.session)
+        self.output = self._open_output(settings["output"])
+        self.history_store = HistoryStore(settings["history_dir"]) if settings["history_dir"] else None
+        self.schedule: List[Tuple[float, str]] = []
+        self._reschedule_all()
+
+    @staticmethod
+    def _make_session(concurrency: int) -> requests.Session:
+        # One warm keep-alive pool reused by every check
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(concurrency, 1))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return instrument_session(session)
+
+    @staticmethod
+    def _open_output(path: Optional[str]) -> Optional[Any]:
+        return open(path, "a", buffering=1) if path else None
+
+    def _jittered(self, interval: float) -> float:
+        jitter = self.settings["jitter"]
+        return max(interval * (1 + random.uniform(-jitter, jitter)), 0.1)
+
+    def _reschedule_all(self) -> None:
+        # Spread the first runs over one interval so checks don't fire in bursts
+        now = time.time()
+        interval = self.settings["interval"]
+        self.schedule = [(now + random.uniform(0, min(interval, 5.0)), name)
+                         for name in resolve_tests(self.settings["test"])]
+        heapq.heapify(self.schedule)
+
+    # Signals
+
+    def request_reload(self, *_: Any) -> None:
+        self.reload_requested = True
+        self.wakeup.set()
+
+    def request_stop(self, *_: Any) -> None:
+        self.stopping = True
+        self.wakeup.set()
+
+    def reload(self) -> None:
+        """Re-read the config file and reopen the output file, keeping history and alert state"""
+        self.reload_requested = False
+        try:
+            settings = load_settings(self.config_path, self.overrides)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}Reload failed, keeping the current settings: {e}{Colors.RESET}", flush=True)
+            return
+        old_tests = resolve_tests(self.settings["test"])
+        with self.lock:
+            self.settings = settings
+            self.alerts.configure(settings)
+            if self.results.maxlen != settings["history"]:
+                self.results = collections.deque(self.results, maxlen=settings["history"])
+            if self.output:
+                self.output.close()
+            self.output = self._open_output(settings["output"])
+            self.history_store = HistoryStore(settings["history_dir"]) if settings["history_dir"] else None
+        if resolve_tests(settings["test"]) != old_tests:
+            self._reschedule_all()
+        print(f"{Colors.BLUE}Settings reloaded{Colors.RESET}", flush=True)
+
+    # Scheduling
+
+    def run(self) -> None:
+        tests = resolve_tests(self.settings["test"])
+        print(f"{Colors.BOLD}Monitoring {len(tests)} form checks on {self.settings['url']} "
+              f"every ~{self.settings['interval']:.0f}s{Colors.RESET}", flush=True)
+        while not self.stopping:
+            self.heartbeat = time.time()
+            if self.reload_requested:
+                self.reload()
+            self._expire_hung_checks()
+            if not self.schedule:
+                self.wakeup.wait(1.0)
+                self.wakeup.clear()
+                continue
+
+            due, name = self.schedule[0]
+            delay = due - time.time()
+            if delay > 0:
+                # Wake at least once a second so /healthz sees a live heartbeat
+                self.wakeup.wait(min(delay, 1.0))
+                self.wakeup.clear()
+                continue
+
+            self._expire_hung_checks()
+            heapq.heappop(self.schedule)
+            next_due = due + self._jittered(self.settings["interval"])
+            heapq.heappush(self.schedule, (max(next_due, time.time()), name))
+            with self.lock:
+                if name in self.in_flight:
+                    continue  # the previous run is still going; skip rather than pile up
+                self.run_ids += 1
+                run_id = self.run_ids
+                self.in_flight[name] = (time.time(), run_id)
+            self.executor.submit(self.run_check, name, run_id, self.settings["url"], self.settings["timeout"])
+
+        print(f"{Colors.YELLOW}Stopping, waiting for running checks...{Colors.RESET}", flush=True)
+        self.executor.shutdown(wait=True)
+        if self.output:
+            self.output.close()
+
+    def _expire_hung_checks(self) -> None:
+        # requests' timeout bounds each socket read, not the whole check, so
+        # fail checks that overrun and drop their results if they ever return
+        timeout = self.settings["timeout"]
+        now = time.time()
+        with self.lock:
+            hung = [(name, started) for name, (started, _) in self.in_flight.items() if now - started > timeout]
+            for name, _ in hung:
+                del self.in_flight[name]
+        for name, started in hung:
+            self.record(name, {"success": False, "error": f"Timed out after {timeout:.1f}s",
+                               "elapsed": now - started})
+
+    def run_check(self, name: str, run_id: int, base_url: str, timeout: float) -> None:
+        try:
+            result = _run_single_test(self.session, base_url, name, timeout)
+        except Exception as e:  # a check must never kill its worker
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        with self.lock:
+            if self.in_flight.get(name, (0.0, None))[1] != run_id:
+                return  # already failed as timed out
+            del self.in_flight[name]
+        self.record(name, result)
+
+    def record(self, name: str, result: Dict[str, Any]) -> None:
+        entry = {
+            "timestamp": utc_now(),
+            "check": name,
+            "url": self.settings["url"],
+            "success": bool(result.get("success")),
+            "status": result.get("status"),
+            "elapsed": round(result.get("elapsed", 0.0), 4),
+            "error": result.get("error"),
+        }
+        with self.lock:
+            self.results.append(entry)
+            self.latest[name] = entry
+            self.checks_run += 1
+            if self.output:
+                self.output.write(json.dumps(entry) + "\n")
+            if self.history_store:
+                try:
+                    self.history_store.record_run({name: result})
+                except OSError as e:
+                    print(f"{Colors.YELLOW}Could not record history: {e}{Colors.RESET}", file=sys.stderr)
+        if self.settings["verbose"] or not entry["success"]:
+            display_result(name, result)
+        self.alerts.update(name, result)
+
+    # Health
+
+    def health(self) -> Tuple[int, Dict[str, Any]]:
+        with self.lock:
+            down = sorted(name for name in self.latest if self.alerts.is_down(name))
+            stalled = time.time() - self.heartbeat > STALL_FACTOR * max(self.settings["interval"], 1.0)
+            body = {
+                "status": "stalled" if stalled else ("degraded" if down else "ok"),
+                "uptime": round(time.time() - self.started, 1),
+                "checks_run": self.checks_run,
+                "down": down,
+                "checks": dict(self.latest),
+            }
+        return (503 if stalled else 200), body
+
+    def recent_results(self, limit: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.results)[-limit:]
+
+class HealthHandler(BaseHTTPRequestHandler):
+    monitor: FormMonitor
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/healthz":
+            status, body = self.monitor.health()
+            return self.send_body(status, json.dumps(body).encode("utf-8"), "application/json")
+        if path == "/results":
+            params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+            try:
+                limit = int(params.get("limit", 100))
+            except ValueError:
+                limit = 100
+            body = json.dumps({"results": self.monitor.recent_results(limit)}).encode("utf-8")
+            return self.send_body(200, body, "application/json")
+        if path == "/metrics":
+            return self.send_body(200, METRICS.prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        self.send_body(404, b'{"error": "Not found"}', "application/json")
+
+def start_health_server(monitor: FormMonitor, port: int) -> ThreadingHTTPServer:
+    handler = type("BoundHealthHandler", (HealthHandler,), {"monitor": monitor})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Long-running synthetic form monitor")
+    parser.add_argument("--config", help="JSON settings file, re-read on SIGHUP")
+    parser.add_argument("--url", help="Base URL of the website")
+    parser.add_argument("--test", help="Test(s) to run, comma-separated (default: all)")
+    parser.add_argument("--interval", type=float, help="Seconds between runs of each check")
+    parser.add_argument("--jitter", type=float, help="Randomize intervals by +/- this fraction")
+    parser.add_argument("--timeout", type=float, help="Per-check timeout in seconds")
+    parser.add_argument("--concurrency", type=int, help="Checks run at once")
+    parser.add_argument("--output", help="JSONL results file")
+    parser.add_argument("--history", type=int, help="Results kept in memory")
+    parser.add_argument("--history-dir", help="History store directory (\"\" = off)")
+    parser.add_argument("--failure-threshold", type=int, help="Consecutive failures before alerting")
+    parser.add_argument("--realert", type=float, help="Seconds between repeated alerts while down")
+    parser.add_argument("--alert-rate", type=int, help="Maximum alerts per hour")
+    parser.add_argument("--alert-command", help="Shell command run per alert (alert JSON on stdin)")
+    parser.add_argument("--alert-webhook", help="URL to POST alerts to")
+    parser.add_argument("--health-port", type=int, help="Port for /healthz (0 = off)")
+    parser.add_argument("--verbose", action="store_true", default=None, help="Print every result")
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in vars(args).items() if key in DEFAULTS and value is not None}
+    try:
+        settings = load_settings(args.config, overrides)
+    except (OSError, ValueError) as e:
+        print(f"{Colors.RED}Error loading settings: {e}{Colors.RESET}")
+        sys.exit(1)
+
+    monitor = FormMonitor(settings, args.config, overrides)
+    signal.signal(signal.SIGHUP, monitor.request_reload)
+    signal.signal(signal.SIGTERM, monitor.request_stop)
+    signal.signal(signal.SIGINT, monitor.request_stop)
+
+    if settings["health_port"]:
+        try:
+            start_health_server(monitor, settings["health_port"])
+            print(f"{Colors.GRAY}Health endpoint: http://127.0.0.1:{settings['health_port']}/healthz{Colors.RESET}")
+        except OSError as e:
+            print(f"{Colors.RED}Could not start health endpoint: {e}{Colors.RESET}")
+            sys.exit(1)
+
+    monitor.run()
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,56 @@ This script automatically tests all forms on the website and reports results.
 It can be scheduled to run periodically to ensure forms are working.
 
 Usage:
-  python form_test.py [--url URL] [--test TEST_NAME]
+  python form_test.py [--url URL] [--test TEST_NAME[,TEST_NAME...]]
+  python form_test.py history [summary|trend|regressions] [options]   (see form_history.py)
 
 Options:
-  --url URL       Base URL of the website (default: http://localhost:3000)
-  --test TEST     Specific test to run (default: all)
-                  Options: simpleContactForm, contactPage, pricingCalculator, serviceAssessment, all
+  --url URL         Base URL of the website (default: $FORM_TOOLS_BASE_URL or http://localhost:3000);
+                    several comma-separated [name=]URLs test all of them at once
+  --targets FILE    Test every deployment listed in FILE (see targets.py)
+  --test TEST       Test(s) to run, comma-separated (default: all)
+                    Options: simpleContactForm, contactPage, pricingCalculator, serviceAssessment, all
+  --concurrency N   Number of tests to run at once (default: 4)
+  --timeout S       Per-test timeout in seconds (default: 30)
+  --server-side     Run the tests sequentially on the server (all of them in one request)
+  --history-dir DIR Record results in this history store (default: $FORM_HISTORY_DIR or form-test-history)
+  --no-history      Don't record results
+  --stats           Print request latency percentiles at exit
+  --metrics-file F  Write Prometheus text-format metrics to F at exit (for cron runs)
+  --statsd H:P      Send request timings to StatsD at H:P
 
 Examples:
   python form_test.py
   python form_test.py --url https://example.com --test contactPage
+  python form_test.py --test contactPage,pricingCalculator --concurrency 2
+  python form_test.py --url staging=https://staging.example.com,prod=https://example.com
+  python form_test.py history trend --form contactPage --since 7d
 """
 
 import argparse
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import sys
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
+
+from form_history import DEFAULT_HISTORY_DIR, HistoryStore, main as history_main
+from targets import Target, load_targets
+from instrumentation import (add_instrumentation_arguments, instrument_session, instrumented_session,
+                             setup_instrumentation, timed)
+
+# Tests known to /api/debug/auto-test
+ALL_TESTS = ["simpleContactForm", "contactPage", "pricingCalculator", "serviceAssessment"]
+
+# FORM_TOOLS_BASE_URL points every script at another deployment or a local stand-in (mock_server.py)
+DEFAULT_URL = os.environ.get("FORM_TOOLS_BASE_URL", "http://localhost:3000").rstrip("/")
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 30.0  # seconds per test
 
 # ANSI color codes for terminal output
 class Colors:
@@ -39,64 +69,181 @@ class Colors:
     GRAY = "\033[90m"
     BOLD = "\033[1m"
 
-def run_tests(base_url: str, test_name: Optional[str] = None) -> Dict[str, Any]:
-    """Run form tests and return results"""
-    endpoint = f"{base_url}/api/debug/auto-test"
+def run_tests(base_url: str, test_name: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """Run form tests (a comma-separated --test value) and return results"""
+    print(f"{Colors.BLUE}Running form tests...{Colors.RESET}")
+    return run_tests_server_side(base_url, resolve_tests(test_name), timeout)
+
+def run_tests_server_side(base_url: str, tests: List[str], timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """Run form tests sequentially on the server and return results.
     
-    if test_name and test_name != 'all':
-        endpoint += f"?test={test_name}"
-    else:
-        endpoint += "?test=all"
+    The endpoint takes one test name or "all", so a subset runs as one
+    request per test, one after another, merged into one result. timeout
+    is per test; the single ?test=all request gets it once per test.
+    Prints nothing (it runs once per target at the same time); failures
+    are returned as "error" (and "details") for the caller to display.
+    """
+    if tests != ALL_TESTS:
+        with instrumented_session() as session:
+            return {
+                "timestamp": datetime.now().astimezone().isoformat(),
+                "results": {name: _run_single_test(session, base_url, name, timeout) for name in tests},
+            }
     
+    endpoint = f"{base_url}/api/debug/auto-test?test=all"
+    response = None
     try:
-        print(f"{Colors.BLUE}Running form tests...{Colors.RESET}")
-        response = requests.get(endpoint)
+        with instrumented_session() as session, timed("auto_test.server_side") as timing:
+            response = timing.set_response(session.get(endpoint, timeout=timeout * len(tests)))
         
         if response.status_code != 200:
-            print(f"{Colors.RED}Error: Server returned status code {response.status_code}{Colors.RESET}")
-            print(f"{Colors.GRAY}Response: {response.text}{Colors.RESET}")
-            return {"error": f"Server returned status code {response.status_code}"}
+            return {"error": f"Server returned status code {response.status_code}", "details": response.text}
         
         return response.json()
     except requests.exceptions.RequestException as e:
-        print(f"{Colors.RED}Error connecting to server: {e}{Colors.RESET}")
-        return {"error": str(e)}
+        return {"error": f"Error connecting to server: {e}"}
     except json.JSONDecodeError as e:
-        print(f"{Colors.RED}Error parsing server response: {e}{Colors.RESET}")
-        print(f"{Colors.GRAY}Response: {response.text if 'response' in locals() else 'N/A'}{Colors.RESET}")
-        return {"error": f"Invalid JSON response: {e}"}
+        return {"error": f"Invalid JSON response: {e}", "details": response.text if response is not None else "N/A"}
+
+def resolve_tests(test_arg: Optional[str]) -> List[str]:
+    """Expand a comma-separated --test value into a list of test names"""
+    if not test_arg or test_arg == "all":
+        return list(ALL_TESTS)
+    return [name.strip() for name in test_arg.split(",") if name.strip()]
+
+def _run_single_test(session: requests.Session, base_url: str, test_name: str, timeout: float) -> Dict[str, Any]:
+    """Run one named test on the server (blocking) and return its result"""
+    start = time.perf_counter()
+    try:
+        with timed(f"auto_test.{test_name}") as timing:
+            response = timing.set_response(
+                session.get(f"{base_url}/api/debug/auto-test", params={"test": test_name}, timeout=timeout))
+        if response.status_code != 200:
+            result = {"success": False, "status": response.status_code,
+                      "error": f"Server returned status code {response.status_code}"}
+        else:
+            result = response.json().get("results", {}).get(test_name) or {
+                "success": False, "error": "Test missing from server response"}
+    except requests.exceptions.RequestException as e:
+        result = {"success": False, "error": str(e)}
+    except json.JSONDecodeError as e:
+        result = {"success": False, "error": f"Invalid JSON response: {e}"}
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+async def run_tests_async(base_url: str, tests: List[str], concurrency: int = DEFAULT_CONCURRENCY,
+                          timeout: float = DEFAULT_TIMEOUT,
+                          on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Run each test as an independent request, at most `concurrency` at a time.
+    
+    on_result is called with (test_name, result) as each test completes.
+    Returns the same shape as run_tests, plus wall-clock timing.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    instrument_session(session)
+    
+    async def run_one(test_name: str):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(_run_single_test, session, base_url, test_name, timeout),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                result = {"success": False, "error": f"Timed out after {timeout:.1f}s",
+                          "elapsed": time.perf_counter() - start}
+            return test_name, result
+    
+    results: Dict[str, Any] = {}
+    wall_start = time.perf_counter()
+    try:
+        for next_done in asyncio.as_completed([run_one(name) for name in tests]):
+            test_name, result = await next_done
+            results[test_name] = result
+            if on_result:
+                on_result(test_name, result)
+    finally:
+        session.close()
+    
+    return {
+        "timestamp": datetime.now().astimezone().isoformat(),
+        "results": {name: results[name] for name in tests},
+        "wall_time": time.perf_counter() - wall_start,
+    }
+
+async def run_targets_async(targets: List[Target], tests: List[str], concurrency: int = DEFAULT_CONCURRENCY,
+                            timeout: float = DEFAULT_TIMEOUT, server_side: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Run the tests against every target at once and return {target name: results}.
+    
+    Total time is that of the slowest target, not the sum.
+    """
+    async def run_target(target: Target) -> Dict[str, Any]:
+        if server_side:
+            return await asyncio.to_thread(run_tests_server_side, target.base_url, tests, timeout)
+        return await run_tests_async(target.base_url, tests, concurrency, timeout)
+    
+    outcomes = await asyncio.gather(*(run_target(target) for target in targets))
+    return {target.name: outcome for target, outcome in zip(targets, outcomes)}
+
+def display_result(form_name: str, result: Dict[str, Any]) -> None:
+    """Print the outcome of a single form test"""
+    success = result.get("success", False)
+    status = result.get("status", "N/A")
+    error = result.get("error", None)
+    
+    status_color = Colors.GREEN if success else Colors.RED
+    status_text = "PASSED" if success else "FAILED"
+    
+    print(f"{Colors.BOLD}{form_name}:{Colors.RESET} {status_color}{status_text}{Colors.RESET}")
+    print(f"  Status Code: {status}")
+    
+    if "elapsed" in result:
+        print(f"  Time: {result['elapsed']:.2f}s")
+    
+    if error:
+        print(f"  Error: {Colors.RED}{error}{Colors.RESET}")
+    
+    print("-" * 80, flush=True)
+
+def display_header(timestamp: str) -> None:
+    print(f"\n{Colors.BOLD}Form Test Results - {timestamp}{Colors.RESET}")
+    print("=" * 80)
 
-def display_results(results: Dict[str, Any]) -> bool:
-    """Display test results and return True if all tests passed"""
+def display_results(results: Dict[str, Any], streamed: bool = False) -> bool:
+    """Display test results and return True if all tests passed.
+    
+    With streamed=True the per-test lines were already printed as the tests
+    completed (see run_tests_async), so only the summary is shown.
+    """
     if "error" in results:
         print(f"{Colors.RED}Error: {results['error']}{Colors.RESET}")
+        if results.get("details"):
+            print(f"{Colors.GRAY}Response: {results['details']}{Colors.RESET}")
         return False
     
-    print(f"\n{Colors.BOLD}Form Test Results - {results.get('timestamp', 'Unknown Time')}{Colors.RESET}")
-    print("=" * 80)
+    if not streamed:
+        display_header(results.get('timestamp', 'Unknown Time'))
     
     all_passed = True
     test_results = results.get("results", {})
     
     for form_name, result in test_results.items():
-        success = result.get("success", False)
-        status = result.get("status", "N/A")
-        error = result.get("error", None)
-        
-        status_color = Colors.GREEN if success else Colors.RED
-        status_text = "PASSED" if success else "FAILED"
+        if not streamed:
+            display_result(form_name, result)
         
-        print(f"{Colors.BOLD}{form_name}:{Colors.RESET} {status_color}{status_text}{Colors.RESET}")
-        print(f"  Status Code: {status}")
-        
-        if error:
-            print(f"  Error: {Colors.RED}{error}{Colors.RESET}")
-        
-        print("-" * 80)
-        
-        if not success:
+        if not result.get("success", False):
             all_passed = False
     
+    if "wall_time" in results:
+        total_test_time = sum(result.get("elapsed", 0.0) for result in test_results.values())
+        print(f"\n{Colors.GRAY}Wall-clock time: {results['wall_time']:.2f}s "
+              f"(sum of per-test times: {total_test_time:.2f}s){Colors.RESET}")
+    
     if all_passed:
         print(f"\n{Colors.GREEN}✓ All tests passed!{Colors.RESET}")
     else:
@@ -104,18 +251,107 @@ def display_results(results: Dict[str, Any]) -> bool:
     
     return all_passed
 
+def record_history(directory: str, results: Dict[str, Any]) -> None:
+    """Add this run's results to the history store; a failure here never fails the run"""
+    try:
+        HistoryStore(directory).record_run(results.get("results", {}))
+    except OSError as e:
+        print(f"{Colors.YELLOW}Could not record history in {directory}: {e}{Colors.RESET}")
+
+def display_matrix(results_by_target: Dict[str, Dict[str, Any]], tests: List[str], wall_time: float) -> bool:
+    """Print a form x target pass/fail matrix and return True if every test passed everywhere"""
+    display_header(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    form_width = max(len(name) for name in tests + ["Form"])
+    column_width = max([len(name) for name in results_by_target] + [12])
+    print(f"{Colors.BOLD}{'Form':<{form_width}}  " +
+          "  ".join(f"{name:<{column_width}}" for name in results_by_target) + Colors.RESET)
+    
+    all_passed = True
+    failures = []
+    for test_name in tests:
+        cells = []
+        for target_name, results in results_by_target.items():
+            result = results.get("results", {}).get(test_name) or {
+                "success": False, "error": results.get("error", "Test missing from server response")}
+            if result.get("success"):
+                cell = f"PASS {result['elapsed']:.2f}s" if "elapsed" in result else "PASS"
+                cells.append(f"{Colors.GREEN}{cell:<{column_width}}{Colors.RESET}")
+                continue
+            all_passed = False
+            cell = f"FAIL {result.get('status', '')}".strip()
+            cells.append(f"{Colors.RED}{cell:<{column_width}}{Colors.RESET}")
+            failure = (f"{target_name}: {results['error']}" if "error" in results
+                       else f"{target_name} / {test_name}: {result.get('error', 'Failed')}")
+            if failure not in failures:
+                failures.append(failure)
+        print(f"{test_name:<{form_width}}  " + "  ".join(cells))
+    
+    for failure in failures:
+        print(f"  {Colors.RED}{failure}{Colors.RESET}")
+    print(f"\n{Colors.GRAY}Wall-clock time: {wall_time:.2f}s for {len(results_by_target)} targets{Colors.RESET}")
+    if all_passed:
+        print(f"\n{Colors.GREEN}✓ All tests passed on every target!{Colors.RESET}")
+    else:
+        print(f"\n{Colors.RED}✗ Some tests failed. Check the matrix above.{Colors.RESET}")
+    return all_passed
+
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "history":
+        history_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description="FormSpree Automated Test Script")
-    parser.add_argument("--url", default="http://localhost:3000", help="Base URL of the website")
-    parser.add_argument("--test", default="all", help="Specific test to run (default: all)")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Base URL of the website, or several comma-separated [name=]URLs")
+    parser.add_argument("--targets", help="File listing deployments to test at once (see targets.py)")
+    parser.add_argument("--test", default="all", help="Test(s) to run, comma-separated (default: all)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Number of tests to run at once")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-test timeout in seconds")
+    parser.add_argument("--server-side", action="store_true", help="Run all tests in one sequential server-side request")
+    parser.add_argument("--history-dir", default=DEFAULT_HISTORY_DIR, help="History store directory")
+    parser.add_argument("--no-history", action="store_true", help="Don't record results in the history store")
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    setup_instrumentation(args)
     
-    # Run the tests
-    results = run_tests(args.url, args.test)
+    if args.targets or "," in args.url:
+        # Several deployments: test them all at once and show one matrix
+        try:
+            targets = load_targets(args.url if "," in args.url else None, args.targets)
+        except OSError as e:
+            print(f"{Colors.RED}Error reading targets: {e}{Colors.RESET}")
+            sys.exit(1)
+        tests = resolve_tests(args.test)
+        print(f"{Colors.BLUE}Running {len(tests)} form tests on {len(targets)} targets...{Colors.RESET}")
+        wall_start = time.perf_counter()
+        results_by_target = asyncio.run(run_targets_async(
+            targets, tests, args.concurrency, args.timeout, server_side=args.server_side))
+        all_passed = display_matrix(results_by_target, tests, time.perf_counter() - wall_start)
+        if not args.no_history:
+            # Each target keeps its own history, e.g. "staging/contactPage"
+            record_history(args.history_dir, {"results": {
+                f"{name}/{test}": result
+                for name, results in results_by_target.items()
+                for test, result in results.get("results", {}).items()}})
+        sys.exit(0 if all_passed else 1)
+    
+    if args.server_side:
+        # Run the tests
+        results = run_tests(args.url, args.test, args.timeout)
+        
+        # Display results
+        all_passed = display_results(results)
+    else:
+        # Fan out one request per test and print results as they complete
+        tests = resolve_tests(args.test)
+        print(f"{Colors.BLUE}Running {len(tests)} form tests ({args.concurrency} at a time)...{Colors.RESET}")
+        display_header(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        results = asyncio.run(run_tests_async(
+            args.url, tests, args.concurrency, args.timeout, on_result=display_result))
+        all_passed = display_results(results, streamed=True)
     
-    # Display results
-    all_passed = display_results(results)
+    if not args.no_history:
+        record_history(args.history_dir, results)
     
     # Exit with appropriate code
     sys.exit(0 if all_passed else 1)
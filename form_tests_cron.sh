@@ -3,6 +3,9 @@
 # Form Tests Cron Script
 # This script is designed to be run as a cron job to periodically test form submissions
 # Recommended cron schedule: 0 * * * * /path/to/form_tests_cron.sh
+#
+# For continuous monitoring (checks every ~30s, deduplicated alerts, /healthz),
+# run form_monitor.py as a service instead - see "Continuous Monitoring" in FORM_DEBUG.md
 
 # Change to project directory
 cd "$(dirname "$0")" || exit 1
@@ -13,9 +16,20 @@ WEBSITE_URL="http://localhost:3000"  # Change this to your actual website URL in
 # Define log file
 LOG_FILE="form_test_cron.log"
 
+# Optional metrics outputs for dashboards:
+# METRICS_FILE - Prometheus text file, e.g. in node_exporter's --collector.textfile.directory
+# STATSD_ADDR  - StatsD HOST:PORT
+METRICS_ARGS=(--stats)
+if [ -n "$METRICS_FILE" ]; then
+  METRICS_ARGS+=(--metrics-file "$METRICS_FILE")
+fi
+if [ -n "$STATSD_ADDR" ]; then
+  METRICS_ARGS+=(--statsd "$STATSD_ADDR")
+fi
+
 # Run the test script and log results
 echo "===== Form Test Run: $(date) =====" >> "$LOG_FILE"
-python3 form_test.py --url "$WEBSITE_URL" >> "$LOG_FILE" 2>&1
+python3 form_test.py --url "$WEBSITE_URL" "${METRICS_ARGS[@]}" >> "$LOG_FILE" 2>&1
 
 # Check if tests failed
 if [ $? -ne 0 ]; then
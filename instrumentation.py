@@ -0,0 +1,365 @@
+"""
+Request instrumentation for the Python tooling
+
+Times outbound HTTP calls made through instrumented requests sessions and
+aggregates them into in-process latency histograms:
+
+  dns       name resolution (new connections only)
+  connect   TCP connect (new connections only)
+  tls       TLS handshake (new HTTPS connections only)
+  ttfb      request sent until response headers arrived
+  total     whole call, including retries and reading the body
+
+Response status and size are counted per operation. At exit the metrics
+can be printed (--stats), written as a Prometheus text file for the
+node_exporter textfile collector (--metrics-file) or sent to StatsD as
+each call completes (--statsd HOST:PORT).
+
+  session = instrumented_session()
+  with timed("formspree.submit") as timing:
+      timing.set_response(session.post(url, json=payload))
+"""
+
+import argparse
+import atexit
+import contextlib
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ("total", "ttfb", "connect", "tls", "dns")
+STATS_PERCENTILES = (50, 90, 99)
+METRIC_PREFIX = "form_tools"
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Each power-of-two range is split into
+    2**(significant_bits - 1) linear sub-buckets, so every recorded value is
+    kept to within ~1/2**(significant_bits - 1) relative error while memory
+    stays bounded no matter how many values are recorded.
+    """
+
+    def __init__(self, significant_bits: int = 8):
+        self.significant_bits = significant_bits
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.significant_bits, 0)
+        return (shift << self.significant_bits) | (value >> shift)
+
+    def _value_at_index(self, index: int) -> int:
+        shift = index >> self.significant_bits
+        mantissa = index & ((1 << self.significant_bits) - 1)
+        # Midpoint of the bucket's value range
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def record(self, seconds: float) -> None:
+        value = max(int(seconds * 1_000_000), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency in seconds at the given percentile (0-100)"""
+        if not self.total:
+            return 0.0
+        if percent >= 100:
+            return self.max / 1_000_000
+        threshold = max(int(self.total * percent / 100 + 0.5), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(self._value_at_index(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def mean(self) -> float:
+        return self.sum / self.total / 1_000_000 if self.total else 0.0
+
+    def distribution(self, percentiles: Tuple[float, ...] = (50, 75, 90, 95, 99, 99.9, 99.99, 100)) -> List[Tuple[float, float, int]]:
+        """Return (percentile, latency seconds, cumulative count) rows"""
+        return [(p, self.percentile(p), min(int(self.total * p / 100 + 0.5), self.total)) for p in percentiles]
+
+class RequestTiming:
+    """Timings for one instrumented call, in seconds"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.total: Optional[float] = None
+        self.status: Optional[int] = None
+        self.size = 0
+        self.error: Optional[str] = None
+        self._request_start: Optional[float] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        setattr(self, phase, (getattr(self, phase) or 0.0) + seconds)
+
+    def set_response(self, response: requests.Response) -> requests.Response:
+        """Record status and body size (reads the body); returns the response for chaining"""
+        self.status = response.status_code
+        self.size = len(response.content or b"")
+        return response
+
+_local = threading.local()
+
+def current_timing() -> Optional[RequestTiming]:
+    return getattr(_local, "timing", None)
+
+# Connection classes that report into the current thread's RequestTiming
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        timing = current_timing()
+        if timing is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            return super()._new_conn()  # raises urllib3's NameResolutionError
+        resolved = time.perf_counter()
+        timing.add("dns", resolved - start)
+
+        # Connect to the resolved addresses in order, like create_connection does
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        try:
+            for position, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if position == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        timing.add("connect", time.perf_counter() - resolved)
+        return sock
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        timing = current_timing()
+        if timing is not None:
+            timing._request_start = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args: Any, **kwargs: Any):
+        response = super().getresponse(*args, **kwargs)
+        timing = current_timing()
+        if timing is not None and timing._request_start is not None:
+            timing.ttfb = time.perf_counter() - timing._request_start
+        return response
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        timing = current_timing()
+        if timing is None:
+            return super().connect()
+        def network_time() -> float:
+            return (timing.dns or 0.0) + (timing.connect or 0.0)
+
+        before = network_time()
+        start = time.perf_counter()
+        super().connect()
+        # Everything connect() spent beyond DNS and TCP is the TLS handshake
+        elapsed = time.perf_counter() - start
+        timing.add("tls", max(elapsed - (network_time() - before), 0.0))
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+def instrument_session(session: requests.Session) -> requests.Session:
+    """Make every adapter mounted on the session use timed connections.
+
+    Call before the session makes its first request.
+    """
+    for adapter in session.adapters.values():
+        poolmanager = getattr(adapter, "poolmanager", None)
+        if poolmanager is not None:
+            poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+    return session
+
+def instrumented_session() -> requests.Session:
+    return instrument_session(requests.Session())
+
+class Metrics:
+    """Thread-safe aggregation of RequestTimings per operation"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.statuses: Dict[Tuple[str, str], int] = {}
+        self.bytes: Dict[str, int] = {}
+        self.listeners: List[Callable[[RequestTiming], None]] = []
+
+    def observe(self, timing: RequestTiming) -> None:
+        status = str(timing.status) if timing.status is not None else (timing.error or "error")
+        with self.lock:
+            for phase in PHASES:
+                value = getattr(timing, phase)
+                if value is not None:
+                    key = (timing.operation, phase)
+                    histogram = self.histograms.get(key)
+                    if histogram is None:
+                        histogram = self.histograms[key] = LatencyHistogram()
+                    histogram.record(value)
+            key = (timing.operation, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.bytes[timing.operation] = self.bytes.get(timing.operation, 0) + timing.size
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(timing)
+
+    def operations(self) -> List[str]:
+        with self.lock:
+            return sorted({operation for operation, _ in self.histograms})
+
+    def format_stats(self) -> str:
+        """Percentile table of every operation and phase, in milliseconds"""
+        lines = []
+        header = f"{'operation':<32} {'phase':<8} {'count':>6}" + "".join(
+            f" {f'p{p}':>8}" for p in STATS_PERCENTILES) + f" {'max':>8}"
+        lines.append(header)
+        with self.lock:
+            for operation in sorted({operation for operation, _ in self.histograms}):
+                for phase in PHASES:
+                    histogram = self.histograms.get((operation, phase))
+                    if histogram is None:
+                        continue
+                    values = "".join(f" {histogram.percentile(p) * 1000:>8.1f}" for p in STATS_PERCENTILES)
+                    lines.append(f"{operation:<32} {phase:<8} {histogram.total:>6}{values} {histogram.max / 1000:>8.1f}")
+                statuses = ", ".join(f"{status}: {count}" for (name, status), count in sorted(self.statuses.items())
+                                     if name == operation)
+                lines.append(f"{'':<32} {'status':<8} {statuses}  ({self.bytes.get(operation, 0)} bytes)")
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        def label(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        name = f"{METRIC_PREFIX}_request_duration_seconds"
+        lines = [f"# HELP {name} Outbound request latency by phase.", f"# TYPE {name} summary"]
+        with self.lock:
+            for (operation, phase), histogram in sorted(self.histograms.items()):
+                labels = f'operation="{label(operation)}",phase="{phase}"'
+                for p in STATS_PERCENTILES:
+                    lines.append(f'{name}{{{labels},quantile="{p / 100}"}} {histogram.percentile(p):.6f}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum / 1_000_000:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.total}")
+
+            name = f"{METRIC_PREFIX}_requests_total"
+            lines += [f"# HELP {name} Outbound requests by response status.", f"# TYPE {name} counter"]
+            for (operation, status), count in sorted(self.statuses.items()):
+                lines.append(f'{name}{{operation="{label(operation)}",status="{label(status)}"}} {count}')
+
+            name = f"{METRIC_PREFIX}_response_bytes_total"
+            lines += [f"# HELP {name} Response body bytes received.", f"# TYPE {name} counter"]
+            for operation, size in sorted(self.bytes.items()):
+                lines.append(f'{name}{{operation="{label(operation)}"}} {size}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the metrics file atomically, as the textfile collector expects"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.prometheus())
+        os.replace(temp_path, path)
+
+# Process-wide metrics shared by every instrumented call
+METRICS = Metrics()
+
+@contextlib.contextmanager
+def timed(operation: str, metrics: Optional[Metrics] = None) -> Iterator[RequestTiming]:
+    """Time the block as one call to `operation` and record it on exit"""
+    timing = RequestTiming(operation)
+    previous = current_timing()
+    _local.timing = timing
+    start = time.perf_counter()
+    try:
+        yield timing
+    except BaseException as e:
+        timing.error = type(e).__name__
+        raise
+    finally:
+        timing.total = time.perf_counter() - start
+        _local.timing = previous
+        (metrics or METRICS).observe(timing)
+
+class StatsdExporter:
+    """Sends each RequestTiming to StatsD over UDP (timers in ms, plus counters)"""
+
+    def __init__(self, address: str, prefix: str = METRIC_PREFIX):
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port or 8125))
+        self.prefix = prefix
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, timing: RequestTiming) -> None:
+        base = f"{self.prefix}.{timing.operation}"
+        status = timing.status if timing.status is not None else "error"
+        lines = [f"{base}.{phase}:{getattr(timing, phase) * 1000:.3f}|ms"
+                 for phase in PHASES if getattr(timing, phase) is not None]
+        lines.append(f"{base}.status.{status}:1|c")
+        lines.append(f"{base}.bytes:{timing.size}|c")
+        try:
+            self.sock.sendto("\n".join(lines).encode("utf-8"), self.address)
+        except OSError:
+            pass  # metrics must never break the tool
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--stats", action="store_true", help="Print request latency percentiles at exit")
+    parser.add_argument("--metrics-file", help="Write Prometheus text-format metrics to this file at exit")
+    parser.add_argument("--statsd", metavar="HOST:PORT", help="Send request timings to StatsD")
+
+def setup_instrumentation(args: argparse.Namespace) -> None:
+    """Enable the exporters selected on the command line"""
+    if getattr(args, "statsd", None):
+        METRICS.listeners.append(StatsdExporter(args.statsd))
+
+    def report() -> None:
+        if getattr(args, "metrics_file", None):
+            try:
+                METRICS.write_prometheus(args.metrics_file)
+            except OSError as e:
+                print(f"Error writing metrics file: {e}", file=sys.stderr)
+        if getattr(args, "stats", False) and METRICS.histograms:
+            print("\nRequest timings (ms):\n" + METRICS.format_stats(), file=sys.stderr)
+
+    atexit.register(report)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Form Pipeline Load Generator
+
+Drives a fixed request rate or concurrency against the form submission
+endpoints for a fixed duration and reports throughput, latency percentiles,
+error rates by status code and an HDR-style latency histogram.
+
+Usage:
+  python loadgen.py [--url URL] [--target TARGET] [--rate R | --concurrency N] [--duration S]
+
+Targets:
+  form-submit     POST /api/form-submit (form_data wrapper, logged server-side)
+  submit-contact  POST /api/submit-contact (plain contact payload)
+  debug-log       POST /api/debug-server with action=log
+
+Options:
+  --url URL         Base URL of the website (default: $FORM_TOOLS_BASE_URL or http://localhost:3000)
+  --target TARGET   Endpoint to load (default: form-submit)
+  --rate R          Open-loop mode: send R requests per second
+  --concurrency N   Closed-loop workers, or max in-flight requests with --rate (default: 10)
+  --duration S      Test duration in seconds (default: 10)
+  --local           Start a local stand-in server (mock_server.py) and target it (no network)
+  --local-latency SPEC, --local-error-rate P
+                    Fault injection for the local stand-in
+  --json            Output the report as JSON
+
+Examples:
+  python loadgen.py --local --duration 5
+  python loadgen.py --target submit-contact --rate 50 --duration 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from instrumentation import LatencyHistogram
+from mock_server import MockServerState, start_server
+from test_single_form import test_data
+
+# ANSI color codes for terminal output
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    PURPLE = "\033[95m"
+    CYAN = "\033[96m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+# FORM_TOOLS_BASE_URL points every script at another deployment or a local stand-in (mock_server.py)
+DEFAULT_URL = os.environ.get("FORM_TOOLS_BASE_URL", "http://localhost:3000").rstrip("/")
+DEFAULT_API_KEY = "debug-server-key"
+DEFAULT_CONCURRENCY = 10
+DEFAULT_DURATION = 10.0  # seconds
+REQUEST_TIMEOUT = (3.05, 30.0)  # connect, read seconds
+
+# Target name -> endpoint path
+TARGETS = {
+    "form-submit": "/api/form-submit",
+    "submit-contact": "/api/submit-contact",
+    "debug-log": "/api/debug-server",
+}
+
+def make_payload(sequence: int) -> Dict[str, Any]:
+    """Build a unique submission with the same fields as test_single_form.test_data"""
+    payload = dict(test_data)
+    payload["name"] = f"Load Test User {sequence}"
+    payload["email"] = f"loadtest+{sequence}@example.com"
+    payload["message"] = f"{test_data['message']} (load test #{sequence})"
+    return payload
+
+def build_request(base_url: str, target: str, sequence: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    """Return (url, json body, extra headers) for one request against the target"""
+    url = f"{base_url}{TARGETS[target]}"
+    payload = make_payload(sequence)
+    if target == "form-submit":
+        return url, {"form_data": payload, "form_name": "loadgen"}, {}
+    if target == "debug-log":
+        body = {"action": "log", "type": "info", "message": "Load test submission", "data": payload}
+        return url, body, {"Authorization": f"Bearer {DEFAULT_API_KEY}"}
+    return url, payload, {}
+
+class LoadResults:
+    """Thread-safe accumulator for per-request outcomes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histogram = LatencyHistogram()
+        self.outcomes: Counter = Counter()
+        self.errors = 0
+
+    def record(self, latency: float, outcome: str, is_error: bool) -> None:
+        with self.lock:
+            self.histogram.record(latency)
+            self.outcomes[outcome] += 1
+            if is_error:
+                self.errors += 1
+
+def send_one(session: requests.Session, base_url: str, target: str, sequence: int,
+             results: LoadResults, intended_start: Optional[float] = None) -> None:
+    """Send one request and record its latency.
+
+    In rate mode latency is measured from the intended start time, so queueing
+    behind a slow server is counted rather than hidden (coordinated omission).
+    """
+    url, body, headers = build_request(base_url, target, sequence)
+    start = intended_start if intended_start is not None else time.perf_counter()
+    try:
+        response = session.post(url, json=body, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.content  # Include the body transfer in the latency
+        outcome = str(response.status_code)
+        is_error = response.status_code >= 400
+    except requests.exceptions.RequestException as e:
+        outcome = type(e).__name__
+        is_error = True
+    results.record(time.perf_counter() - start, outcome, is_error)
+
+# One session per worker thread so connections are reused without sharing
+_thread_state = threading.local()
+
+def _thread_session() -> requests.Session:
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        session = _thread_state.session = requests.Session()
+    return session
+
+def run_closed_loop(base_url: str, target: str, concurrency: int, duration: float, results: LoadResults) -> None:
+    """Each worker sends its next request as soon as the previous one finishes"""
+    deadline = time.perf_counter() + duration
+    counter = iter(range(sys.maxsize))
+    counter_lock = threading.Lock()
+
+    def worker():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            with counter_lock:
+                sequence = next(counter)
+            send_one(session, base_url, target, sequence, results)
+        session.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def run_open_loop(base_url: str, target: str, rate: float, concurrency: int, duration: float, results: LoadResults) -> None:
+    """Dispatch requests on a fixed schedule regardless of how fast the server answers"""
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    total = int(rate * duration)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for sequence in range(total):
+            intended_start = start + sequence * interval
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(lambda seq=sequence, at=intended_start: send_one(
+                _thread_session(), base_url, target, seq, results, intended_start=at))
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f} ms"
+
+def build_report(results: LoadResults, elapsed: float, target: str, mode: str) -> Dict[str, Any]:
+    histogram = results.histogram
+    total = histogram.total
+    return {
+        "target": target,
+        "mode": mode,
+        "requests": total,
+        "duration": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "error_rate": results.errors / total if total else 0.0,
+        "outcomes": dict(results.outcomes),
+        "latency": {
+            "min": (histogram.min or 0) / 1_000_000,
+            "mean": histogram.mean(),
+            "p50": histogram.percentile(50),
+            "p95": histogram.percentile(95),
+            "p99": histogram.percentile(99),
+            "max": histogram.max / 1_000_000,
+        },
+        "histogram": [
+            {"percentile": p, "latency": value, "count": count}
+            for p, value, count in histogram.distribution()
+        ],
+    }
+
+def display_report(report: Dict[str, Any]) -> None:
+    latency = report["latency"]
+    print(f"\n{Colors.BOLD}Load Test Results - {report['target']} ({report['mode']}){Colors.RESET}")
+    print("=" * 80)
+    print(f"  Requests:    {report['requests']} in {report['duration']:.2f}s")
+    print(f"  Throughput:  {Colors.CYAN}{report['throughput']:.1f} req/s{Colors.RESET}")
+    error_color = Colors.GREEN if report["error_rate"] == 0 else Colors.RED
+    print(f"  Error rate:  {error_color}{report['error_rate'] * 100:.2f}%{Colors.RESET}")
+    print(f"  Latency:     p50 {format_ms(latency['p50'])}, p95 {format_ms(latency['p95'])}, "
+          f"p99 {format_ms(latency['p99'])}, max {format_ms(latency['max'])}")
+
+    print(f"\n{Colors.BOLD}Responses by status:{Colors.RESET}")
+    for outcome, count in sorted(report["outcomes"].items()):
+        color = Colors.GREEN if outcome.isdigit() and int(outcome) < 400 else Colors.RED
+        print(f"  {color}{outcome:>20}{Colors.RESET}: {count} ({count / report['requests'] * 100:.1f}%)")
+
+    print(f"\n{Colors.BOLD}Latency distribution:{Colors.RESET}")
+    print(f"  {'Percentile':>10}  {'Latency':>12}  {'Count':>8}")
+    max_latency = latency["max"] or 1
+    for row in report["histogram"]:
+        bar = "#" * max(int(row["latency"] / max_latency * 40), 1)
+        print(f"  {row['percentile']:>9.2f}%  {format_ms(row['latency']):>12}  {row['count']:>8}  {Colors.GRAY}{bar}{Colors.RESET}")
+    print("-" * 80)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Form Pipeline Load Generator")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Base URL of the website")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="form-submit", help="Endpoint to load")
+    parser.add_argument("--rate", type=float, help="Requests per second (open-loop mode)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Workers / max in-flight requests")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Test duration in seconds")
+    parser.add_argument("--local", action="store_true", help="Start a local stand-in server and target it")
+    parser.add_argument("--local-latency", help="Latency spec for the local stand-in, e.g. normal:30:5")
+    parser.add_argument("--local-error-rate", type=float, default=0.0, help="Error rate for the local stand-in")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    server = None
+    if args.local:
+        server, base_url = start_server(state=MockServerState(
+            latency=args.local_latency, error_rate=args.local_error_rate))
+
+    if args.rate:
+        mode = f"{args.rate:g} req/s, max {args.concurrency} in flight"
+    else:
+        mode = f"{args.concurrency} concurrent workers"
+    if not args.json:
+        print(f"{Colors.BLUE}Loading {base_url}{TARGETS[args.target]} for {args.duration:g}s ({mode})...{Colors.RESET}")
+
+    results = LoadResults()
+    start = time.perf_counter()
+    try:
+        if args.rate:
+            run_open_loop(base_url, args.target, args.rate, args.concurrency, args.duration, results)
+        else:
+            run_closed_loop(base_url, args.target, args.concurrency, args.duration, results)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Load test interrupted.{Colors.RESET}")
+    elapsed = time.perf_counter() - start
+
+    if server:
+        server.shutdown()
+
+    report = build_report(results, elapsed, args.target, mode)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        display_report(report)
+
+    sys.exit(0 if report["requests"] and report["error_rate"] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Batched log ingestion for debug_client.py
+
+BatchingLogger queues entries in memory and a background thread sends them
+to the debug server with the log_batch action, so scripted diagnostics that
+emit hundreds of entries cost a handful of requests (and log file rewrites)
+instead of one per entry.
+
+  with client.batch_logger(batch_size=100, flush_interval=0.5) as logger:
+      logger.log("info", "Starting diagnostics", {"run": 1})
+      ...
+
+A batch is sent once it holds batch_size entries or its oldest entry has
+waited flush_interval seconds. Pending entries are flushed on close(),
+when the with block exits and at interpreter exit. When the queue is full,
+log() blocks (or drops the entry with block=False) until the sender catches up.
+"""
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.5  # seconds
+DEFAULT_MAX_QUEUE = 10000
+MAX_BATCH_SIZE = 500  # the debug-server route rejects larger batches
+
+# Queue markers used to wake the sender thread
+_FLUSH = object()
+_STOP = object()
+
+class BatchingLogger:
+    """Queues log entries and sends them in batches from a background thread"""
+
+    def __init__(self, client: Any, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_queue: int = DEFAULT_MAX_QUEUE,
+                 block: bool = True, put_timeout: Optional[float] = None):
+        self.client = client
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.flush_interval = flush_interval
+        self.block = block
+        self.put_timeout = put_timeout
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_error: Optional[str] = None
+        # Cleared if the server predates log_batch; entries are then sent one by one
+        self.batch_supported = True
+
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="log-batcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "BatchingLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def log(self, log_type: str, message: str, data: Any = None) -> bool:
+        """Queue an entry; returns False if it was dropped because the queue stayed full"""
+        if self._closed:
+            raise RuntimeError("BatchingLogger is closed")
+        entry = {"type": log_type, "message": message, "data": data}
+        try:
+            self.queue.put(entry, block=self.block, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Send everything queued so far and wait until it has been sent"""
+        if self._closed:
+            return
+        self.queue.put(_FLUSH)
+        self.queue.join()
+
+    def close(self) -> None:
+        """Flush pending entries and stop the sender thread"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.queue.put(_STOP)
+        self._thread.join()
+        if self.failed:
+            print(f"Warning: {self.failed} log entries could not be sent ({self.last_error})", file=sys.stderr)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "queued": self.queue.qsize(),
+            }
+
+    # Sender thread
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        taken = 0  # items taken from the queue but not yet marked done
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = None  # the oldest entry has waited flush_interval
+
+            if item is not None and item is not _FLUSH and item is not _STOP:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            self._send(batch)
+            # Mark the sent entries and any marker done, so flush() can return
+            for _ in range(taken):
+                self.queue.task_done()
+            batch, taken, deadline = [], 0, None
+            if item is _STOP:
+                return
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            if self.batch_supported:
+                try:
+                    self.client.add_logs(batch)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code != 400:
+                        raise
+                    self.batch_supported = False
+            if not self.batch_supported:
+                for entry in batch:
+                    self.client.post_action("log", entry)
+        except requests.exceptions.RequestException as e:
+            with self._lock:
+                self.failed += len(batch)
+                self.last_error = str(e)
+            return
+        with self._lock:
+            self.sent += len(batch)
+            self.batches += 1
@@ -0,0 +1,281 @@
+"""
+Local log cache for debug_client.py
+
+Keeps a SQLite copy of the debug server's logs so repeated `logs` queries
+with different --type/--search/--limit filters are answered locally. Each
+sync only fetches entries newer than the last cached id, after checking
+that the cache still matches the server: a clear_logs (a new
+server_info.last_cleared, or ids going backwards) empties it, and entries
+the server no longer has (retention) are dropped.
+
+Eviction (max_age_days, max_bytes) is permanent: sync only moves forward,
+so evicted entries are not fetched again. Use --no-cache to see them.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "smart-services-debug",
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # size cap for cached entries
+DEFAULT_MAX_AGE_DAYS = 30
+SYNC_PAGE_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    data TEXT,
+    size INTEGER NOT NULL,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_logs_type ON logs (type, id);
+CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_logs_last_accessed ON logs (last_accessed);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def cache_path(server_url: str, cache_dir: str, extension: str) -> str:
+    """Path of a per-server cache file"""
+    digest = hashlib.sha1(server_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"logs-{digest}.{extension}")
+
+class LogCache:
+    """SQLite-backed cache of log entries keyed by log id"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def for_server(cls, server_url: str, cache_dir: str = DEFAULT_CACHE_DIR, **kwargs: Any) -> "LogCache":
+        """Open the cache file for a debug server URL (one file per server)"""
+        return cls(cache_path(server_url, cache_dir, "sqlite3"), **kwargs)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "LogCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Sync state
+
+    def _get_meta(self, key: str, default: str = "") -> str:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def generation(self) -> int:
+        """Bumped whenever entries are dropped because the server cleared or dropped them.
+
+        Anything built from the cache incrementally (the search index) must
+        be rebuilt when this changes.
+        """
+        return int(self._get_meta("generation", "0"))
+
+    def _entries_dropped(self) -> None:
+        self._set_meta("generation", str(self.generation + 1))
+
+    def last_synced_id(self) -> str:
+        return self._get_meta("last_synced_id", "0")
+
+    def _set_last_synced_id(self, log_id: str) -> None:
+        self._set_meta("last_synced_id", log_id)
+
+    def add(self, logs: List[Dict[str, Any]]) -> int:
+        """Insert or replace entries; returns how many were written"""
+        now = time.time()
+        rows = []
+        for log in logs:
+            try:
+                log_id = int(log.get("id"))
+            except (TypeError, ValueError):
+                continue
+            data = json.dumps(log.get("data"), separators=(",", ":")) if log.get("data") is not None else None
+            message = log.get("message") or ""
+            rows.append((log_id, log.get("timestamp") or "", log.get("type") or "unknown", message, data,
+                         len(message) + (len(data) if data else 0), now))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO logs (id, timestamp, type, message, data, size, last_accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def check_server(self, client: Any) -> None:
+        """Drop cached entries the server no longer has.
+
+        Compares the server's last_cleared time and its newest and oldest
+        ids with the ones recorded at the last sync.
+        """
+        newest = client.get_logs(limit=1, fields=["id"])
+        last_cleared = str((newest.get("server_info") or {}).get("last_cleared") or "")
+        latest_id = int(newest.get("latest_id") or 0)
+        cursor = int(self.last_synced_id())
+        if last_cleared != self._get_meta("last_cleared") or latest_id < cursor:
+            # Cleared (or replaced) since the last sync: start over
+            self._set_meta("last_cleared", last_cleared)
+            self._set_meta("oldest_id", "0")
+            self._set_last_synced_id("0")
+            if self.db.execute("DELETE FROM logs").rowcount:
+                self._entries_dropped()
+            return
+
+        oldest = client.get_logs(limit=1, after_id="0", fields=["id"]).get("logs") or []
+        oldest_id = int(oldest[0]["id"]) if oldest else latest_id + 1
+        if str(oldest_id) != self._get_meta("oldest_id"):
+            self._set_meta("oldest_id", str(oldest_id))
+            if self.db.execute("DELETE FROM logs WHERE id < ?", (oldest_id,)).rowcount:
+                self._entries_dropped()
+
+    def sync(self, client: Any) -> int:
+        """Fetch entries newer than the last synced id from the server.
+
+        Returns the number of new entries cached.
+        """
+        self.check_server(client)
+        cursor = self.last_synced_id()
+        fetched = 0
+        for page in client.iter_log_pages(after_id=cursor, page_size=SYNC_PAGE_SIZE):
+            fetched += self.add(page)
+            cursor = page[-1]["id"]
+
+        self._set_last_synced_id(cursor)
+        self.evict()
+        self.db.commit()
+        return fetched
+
+    # Queries
+
+    def query(self, limit: int = 100, log_type: Optional[str] = None, search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest entries matching the filters, with the same semantics as the server's get_logs"""
+        clauses = []
+        params: List[Any] = []
+        if log_type:
+            clauses.append("type = ?")
+            params.append(log_type)
+        if search:
+            # LIKE is case-insensitive for ASCII, matching the server's lowercase comparison
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(message LIKE ? ESCAPE '\\' OR type LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self.db.execute(
+            f"SELECT id, timestamp, type, message, data FROM logs {where} ORDER BY id DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+
+        # Record the access for LRU eviction
+        self.db.executemany("UPDATE logs SET last_accessed = ? WHERE id = ?", [(time.time(), row[0]) for row in rows])
+        self.db.commit()
+
+        return [self._row_to_log(row) for row in rows]
+
+    @staticmethod
+    def _row_to_log(row: Tuple[Any, ...]) -> Dict[str, Any]:
+        log_id, timestamp, log_type, message, data = row
+        return {
+            "id": str(log_id),
+            "timestamp": timestamp,
+            "type": log_type,
+            "message": message,
+            "data": json.loads(data) if data is not None else None,
+        }
+
+    def iter_after(self, log_id: int, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield cached entries newer than log_id in ascending id order"""
+        cursor = int(log_id)
+        while True:
+            rows = self.db.execute(
+                "SELECT id, timestamp, type, message, data FROM logs WHERE id > ? ORDER BY id LIMIT ?",
+                (cursor, batch_size),
+            ).fetchall()
+            for row in rows:
+                yield self._row_to_log(row)
+            if len(rows) < batch_size:
+                return
+            cursor = rows[-1][0]
+
+    def iter_range(self, since: Optional[str] = None, until: Optional[str] = None, log_type: Optional[str] = None,
+                   batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield cached entries with since <= timestamp < until (ISO strings), in id order"""
+        clauses = ["id > ?"]
+        params: List[Any] = []
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if log_type:
+            clauses.append("type = ?")
+            params.append(log_type)
+        sql = f"SELECT id, timestamp, type, message, data FROM logs WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?"
+        cursor = 0
+        while True:
+            rows = self.db.execute(sql, [cursor] + params + [batch_size]).fetchall()
+            for row in rows:
+                yield self._row_to_log(row)
+            if len(rows) < batch_size:
+                return
+            cursor = rows[-1][0]
+
+    def stats(self) -> Dict[str, Any]:
+        count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM logs").fetchone()
+        return {"entries": count, "bytes": size, "last_synced_id": self.last_synced_id(), "path": self.path}
+
+    # Eviction
+
+    def evict(self) -> int:
+        """Drop entries older than max_age_days, then least recently used ones above max_bytes.
+
+        The sync cursor stays where it is, so evicted entries are gone for good.
+        """
+        removed = 0
+        if self.max_age_days:
+            cutoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() - self.max_age_days * 86400))
+            removed += self.db.execute("DELETE FROM logs WHERE timestamp < ?", (cutoff,)).rowcount
+
+        (total,) = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM logs").fetchone()
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            doomed = []
+            for log_id, size in self.db.execute("SELECT id, size FROM logs ORDER BY last_accessed, id"):
+                doomed.append((log_id,))
+                freed += size
+                if freed >= excess:
+                    break
+            self.db.executemany("DELETE FROM logs WHERE id = ?", doomed)
+            removed += len(doomed)
+        return removed
+
+    def clear(self) -> None:
+        """Empty the cache, including the sync state (the next sync starts from scratch)"""
+        generation = self.generation
+        self.db.execute("DELETE FROM logs")
+        self.db.execute("DELETE FROM meta")
+        self._set_meta("generation", str(generation + 1))
+        self.db.commit()
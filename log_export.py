@@ -0,0 +1,276 @@
+"""
+Streaming log export for debug_client.py
+
+Writes log entries to JSONL, CSV, plain text or a compact columnar binary
+file as they arrive, optionally compressed with gzip or zstd. Entries are
+written one page or row group at a time, so memory use stays flat no
+matter how many entries are exported.
+
+Columnar format (.logc):
+  b"LOGC" + uint8 version, then row groups until EOF. Each row group is a
+  uint32 row count followed by five columns (id, timestamp, type, message,
+  data), each prefixed with its uint32 byte length so readers can skip
+  columns they don't need:
+    id         int64 values
+    timestamp  int64 epoch milliseconds (-1 if the timestamp couldn't be parsed)
+    type       uint16 dictionary size, (uint16 length + utf-8) per value, uint16 codes
+    message    uint32 lengths, then the concatenated utf-8 strings
+    data       uint32 lengths, then the concatenated compact JSON (length 0 = null)
+  All integers are little-endian.
+"""
+
+import contextlib
+import csv
+import gzip
+import io
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+COLUMNAR_MAGIC = b"LOGC"
+COLUMNAR_VERSION = 1
+COLUMNS = ("id", "timestamp", "type", "message", "data")
+ROW_GROUP_SIZE = 4096
+CSV_FIELDS = ["id", "timestamp", "type", "message", "data"]
+FORMATS = ("jsonl", "csv", "text", "columnar")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_little_endian(typecode: str, raw: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def _timestamp_ms(timestamp: str) -> int:
+    try:
+        return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp() * 1000)
+    except (AttributeError, ValueError):
+        return -1
+
+def _timestamp_iso(value: int) -> str:
+    if value < 0:
+        return ""
+    moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value % 1000:03d}Z"
+
+def infer_compression(path: str) -> str:
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+@contextlib.contextmanager
+def open_output(path: str, compression: str = "none") -> Iterator[BinaryIO]:
+    """Open a binary output stream with optional gzip/zstd compression"""
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    with open(path, "wb") as raw:
+        if compression == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as stream:
+                yield stream
+        elif compression == "zstd":
+            with zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False) as stream:
+                yield stream
+        else:
+            yield raw
+
+@contextlib.contextmanager
+def open_input(path: str, compression: Optional[str] = None) -> Iterator[BinaryIO]:
+    """Open a binary input stream, decompressing based on the file extension by default"""
+    compression = compression or infer_compression(path)
+    with open(path, "rb") as raw:
+        if compression == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="rb") as stream:
+                yield stream
+        elif compression == "zstd":
+            import zstandard
+            with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                yield stream
+        else:
+            yield raw
+
+class JSONLWriter:
+    def __init__(self, stream: BinaryIO):
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n", write_through=False)
+
+    def write(self, logs: List[Dict[str, Any]]) -> None:
+        self.text.write("".join(_compact_json(log) + "\n" for log in logs))
+
+    def close(self) -> None:
+        self.text.flush()
+        self.text.detach()
+
+class CSVWriter:
+    def __init__(self, stream: BinaryIO):
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(CSV_FIELDS)
+
+    def write(self, logs: List[Dict[str, Any]]) -> None:
+        self.writer.writerows(
+            [log.get("id", ""), log.get("timestamp", ""), log.get("type", ""), log.get("message", ""),
+             _compact_json(log["data"]) if log.get("data") is not None else ""]
+            for log in logs
+        )
+
+    def close(self) -> None:
+        self.text.flush()
+        self.text.detach()
+
+class TextWriter:
+    """Human-readable dump, formatted without ANSI colors"""
+
+    def __init__(self, stream: BinaryIO, formatter: Callable[[Dict[str, Any]], str]):
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+        self.formatter = formatter
+
+    def write(self, logs: List[Dict[str, Any]]) -> None:
+        self.text.write("".join(self.formatter(log) + "\n" + "-" * 80 + "\n" for log in logs))
+
+    def close(self) -> None:
+        self.text.flush()
+        self.text.detach()
+
+class ColumnarWriter:
+    """Buffers up to ROW_GROUP_SIZE entries and writes them column by column"""
+
+    def __init__(self, stream: BinaryIO, row_group_size: int = ROW_GROUP_SIZE):
+        self.stream = stream
+        self.row_group_size = row_group_size
+        self.pending: List[Dict[str, Any]] = []
+        stream.write(COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]))
+
+    def write(self, logs: List[Dict[str, Any]]) -> None:
+        self.pending.extend(logs)
+        while len(self.pending) >= self.row_group_size:
+            self._write_row_group(self.pending[:self.row_group_size])
+            del self.pending[:self.row_group_size]
+
+    @staticmethod
+    def _strings(values: List[bytes]) -> bytes:
+        return _little_endian(array("I", [len(value) for value in values])) + b"".join(values)
+
+    def _write_row_group(self, logs: List[Dict[str, Any]]) -> None:
+        ids = array("q", [int(log.get("id") or 0) for log in logs])
+        timestamps = array("q", [_timestamp_ms(log.get("timestamp") or "") for log in logs])
+
+        type_codes: Dict[str, int] = {}
+        codes = array("H", [type_codes.setdefault(log.get("type") or "", len(type_codes)) for log in logs])
+        dictionary = b"".join(struct.pack("<H", len(name.encode("utf-8"))) + name.encode("utf-8") for name in type_codes)
+        types = struct.pack("<H", len(type_codes)) + dictionary + _little_endian(codes)
+
+        messages = self._strings([(log.get("message") or "").encode("utf-8") for log in logs])
+        data = self._strings([
+            _compact_json(log["data"]).encode("utf-8") if log.get("data") is not None else b""
+            for log in logs
+        ])
+
+        chunks = [struct.pack("<I", len(logs))]
+        for column in (_little_endian(ids), _little_endian(timestamps), types, messages, data):
+            chunks.append(struct.pack("<I", len(column)))
+            chunks.append(column)
+        self.stream.write(b"".join(chunks))
+
+    def close(self) -> None:
+        if self.pending:
+            self._write_row_group(self.pending)
+            self.pending = []
+
+def make_writer(fmt: str, stream: BinaryIO, text_formatter: Optional[Callable[[Dict[str, Any]], str]] = None) -> Any:
+    if fmt == "jsonl":
+        return JSONLWriter(stream)
+    if fmt == "csv":
+        return CSVWriter(stream)
+    if fmt == "text":
+        return TextWriter(stream, text_formatter or _compact_json)
+    if fmt == "columnar":
+        return ColumnarWriter(stream)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+def export_pages(pages: Iterable[List[Dict[str, Any]]], path: str, fmt: str = "jsonl",
+                 compression: str = "none",
+                 text_formatter: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 on_page: Optional[Callable[[int], None]] = None) -> int:
+    """Write pages of entries to path as they arrive; returns the number of entries written"""
+    written = 0
+    with open_output(path, compression) as stream:
+        writer = make_writer(fmt, stream, text_formatter)
+        for page in pages:
+            writer.write(page)
+            written += len(page)
+            if on_page:
+                on_page(written)
+        writer.close()
+    return written
+
+def read_columnar(stream: BinaryIO, columns: Iterable[str] = COLUMNS) -> Iterator[Dict[str, Any]]:
+    """Yield entries from a columnar export, decoding only the requested columns"""
+    wanted = set(columns)
+    header = stream.read(len(COLUMNAR_MAGIC) + 1)
+    if header[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC or header[-1] != COLUMNAR_VERSION:
+        raise ValueError("Not a columnar log export")
+
+    def read_exact(size: int) -> bytes:
+        chunk = stream.read(size)
+        if len(chunk) != size:
+            raise ValueError("Truncated columnar log export")
+        return chunk
+
+    def split_strings(raw: bytes, count: int) -> List[bytes]:
+        lengths = _from_little_endian("I", raw[:count * 4])
+        values = []
+        offset = count * 4
+        for length in lengths:
+            values.append(raw[offset:offset + length])
+            offset += length
+        return values
+
+    while True:
+        count_raw = stream.read(4)
+        if not count_raw:
+            return
+        (count,) = struct.unpack("<I", count_raw)
+        decoded: Dict[str, List[Any]] = {}
+        for name in COLUMNS:
+            (size,) = struct.unpack("<I", read_exact(4))
+            raw = read_exact(size)
+            if name not in wanted:
+                continue
+            if name == "id":
+                decoded[name] = [str(value) for value in _from_little_endian("q", raw)]
+            elif name == "timestamp":
+                decoded[name] = [_timestamp_iso(value) for value in _from_little_endian("q", raw)]
+            elif name == "type":
+                (entries,) = struct.unpack_from("<H", raw)
+                offset = 2
+                dictionary = []
+                for _ in range(entries):
+                    (length,) = struct.unpack_from("<H", raw, offset)
+                    dictionary.append(raw[offset + 2:offset + 2 + length].decode("utf-8"))
+                    offset += 2 + length
+                decoded[name] = [dictionary[code] for code in _from_little_endian("H", raw[offset:])]
+            elif name == "message":
+                decoded[name] = [value.decode("utf-8") for value in split_strings(raw, count)]
+            else:
+                decoded[name] = [json.loads(value) if value else None for value in split_strings(raw, count)]
+
+        names = [name for name in COLUMNS if name in decoded]
+        for row in range(count):
+            yield {name: decoded[name][row] for name in names}
@@ -0,0 +1,222 @@
+"""
+Flood-tolerant live display for `debug_client.py monitor`
+
+Follower threads hand entries to MonitorDisplay.add(); the main thread
+calls run(), which redraws at most `refresh` times per second:
+
+  - Entries with the same target, type and message (ids, emails and long
+    numbers in messages aside, as in log_stats) are coalesced: the first
+    one is printed in full, and repeats within `window` seconds of it are
+    counted and printed as one "repeated N times" line with the first and
+    last timestamps when the window closes.
+  - Lines waiting for the next redraw are kept in a backlog of at most
+    `backlog` entries; when the display can't keep up, the oldest are
+    dropped and counted instead of piling up in memory.
+  - An optional summary pane shows per-type rates over the last few
+    seconds, the busiest open repeat groups and the drop count. On a
+    terminal it is redrawn in place below the log lines; otherwise it is
+    printed as one line every SUMMARY_INTERVAL seconds.
+
+  display = MonitorDisplay(LogRenderer(), window=5, summary=True)
+  threading.Thread(target=lambda: [display.add(log) for log in follow()], daemon=True).start()
+  display.run()
+"""
+
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+from log_render import LogRenderer, format_timestamp
+from log_stats import normalize_message
+
+DEFAULT_WINDOW = 5.0  # seconds a repeat group stays open
+DEFAULT_REFRESH = 10.0  # redraws per second
+DEFAULT_BACKLOG = 1000  # entries waiting for a redraw
+RATE_WINDOW = 10  # seconds of history behind the summary rates
+SUMMARY_INTERVAL = 10.0  # seconds between summary lines when not on a terminal
+SUMMARY_GROUPS = 3  # open repeat groups listed in the summary pane
+
+GroupKey = Tuple[str, str, str]
+
+class RepeatGroup:
+    """An entry that was printed and the repeats of it counted since"""
+
+    def __init__(self, log: Dict[str, Any], opened: float):
+        self.log = log
+        self.opened = opened
+        self.repeats = 0
+        self.first = log.get("timestamp") or ""
+        self.last = self.first
+
+class RateCounter:
+    """Entries per type per second over the last `seconds` whole seconds"""
+
+    def __init__(self, seconds: int = RATE_WINDOW):
+        self.seconds = seconds
+        self.buckets: Deque[Tuple[int, Counter]] = deque()
+
+    def add(self, log_type: str, now: float) -> None:
+        second = int(now)
+        if not self.buckets or self.buckets[-1][0] != second:
+            self.buckets.append((second, Counter()))
+            while self.buckets[0][0] <= second - self.seconds:
+                self.buckets.popleft()
+        self.buckets[-1][1][log_type] += 1
+
+    def rates(self, now: float) -> Dict[str, float]:
+        cutoff = int(now) - self.seconds
+        totals: Counter = Counter()
+        for second, counts in self.buckets:
+            if second > cutoff:
+                totals.update(counts)
+        return {log_type: count / self.seconds for log_type, count in totals.most_common()}
+
+class MonitorDisplay:
+    """Coalesces, rate-limits and renders a stream of live log entries"""
+
+    def __init__(self, renderer: LogRenderer, window: float = DEFAULT_WINDOW, refresh: float = DEFAULT_REFRESH,
+                 backlog: int = DEFAULT_BACKLOG, summary: bool = False, stream: Optional[TextIO] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.renderer = renderer
+        self.palette = renderer.palette
+        self.window = window
+        self.frame_interval = 1.0 / refresh if refresh > 0 else 0.0
+        self.backlog = backlog
+        self.summary = summary
+        self.stream = stream or sys.stdout
+        self.live_pane = summary and self.stream.isatty()
+        self.clock = clock
+        self.lock = threading.Lock()
+        # Printed lines in order: ("entry", log) or ("repeat", group)
+        self.pending: Deque[Tuple[str, Any]] = deque()
+        self.groups: Dict[GroupKey, RepeatGroup] = {}
+        self.rates = RateCounter()
+        self.received = 0
+        self.dropped = 0
+        self.reported_drops = 0
+        self.pane_lines = 0
+        self.last_summary = clock()
+
+    @staticmethod
+    def group_key(log: Dict[str, Any]) -> GroupKey:
+        return (str(log.get("target") or ""), str(log.get("type") or "unknown"),
+                normalize_message(str(log.get("message") or "")))
+
+    def add(self, log: Dict[str, Any]) -> None:
+        """Accept one entry (from any thread)"""
+        now = self.clock()
+        key = self.group_key(log)
+        with self.lock:
+            self.received += 1
+            if self.summary:
+                self.rates.add(key[1], now)
+            group = self.groups.get(key) if self.window > 0 else None
+            if group is not None and now - group.opened < self.window:
+                group.repeats += 1
+                group.last = log.get("timestamp") or group.last
+                return
+            if group is not None:
+                self._close(key)
+            if self.window > 0:
+                self.groups[key] = RepeatGroup(log, now)
+            self._queue(("entry", log))
+
+    def _queue(self, line: Tuple[str, Any]) -> None:
+        self.pending.append(line)
+        if len(self.pending) > self.backlog:
+            self.pending.popleft()
+            self.dropped += 1
+
+    def _close(self, key: GroupKey) -> None:
+        group = self.groups.pop(key)
+        if group.repeats:
+            self._queue(("repeat", group))
+
+    def _expire(self, now: float, close_all: bool = False) -> None:
+        expired = [key for key, group in self.groups.items() if close_all or now - group.opened >= self.window]
+        for key in expired:
+            self._close(key)
+
+    # Rendering
+
+    def render_repeat(self, group: RepeatGroup) -> str:
+        """The group's entry line with its first-last time span and repeat count, without data"""
+        palette = self.palette
+        first = format_timestamp(group.first) if group.first else "?"
+        last = format_timestamp(group.last) if group.last else "?"
+        # Only the time of day when both are on the same date
+        span = first if last == first else f"{first} to {last[11:] if last[:10] == first[:10] else last}"
+        log_type = group.log.get("type", "unknown")
+        times = "time" if group.repeats == 1 else "times"
+        result = (f"{palette.GRAY}{span}{self.renderer.timestamp_suffix}"
+                  f"{self.renderer.type_colors.get(log_type, palette.GRAY)}{log_type.upper()}{self.renderer.type_suffix}"
+                  f"{group.log.get('message', 'No message')} "
+                  f"{palette.BOLD}(repeated {group.repeats:,} {times}){palette.RESET}")
+        if self.renderer.target_width:
+            result = (f"{self.renderer.target_prefix}{group.log.get('target', ''):<{self.renderer.target_width}}"
+                      f"{self.renderer.target_suffix}{result}")
+        return result
+
+    def summary_lines(self, now: float) -> List[str]:
+        palette = self.palette
+        rates = self.rates.rates(now)
+        total = sum(rates.values())
+        parts = [f"{log_type} {rate:,.1f}/s" for log_type, rate in rates.items()] or ["idle"]
+        lines = [f"{palette.BOLD}Last {self.rates.seconds}s:{palette.RESET} {'  '.join(parts)}"
+                 f"{palette.GRAY}  (total {total:,.1f}/s, {self.received:,} received"
+                 f"{f', {self.dropped:,} dropped' if self.dropped else ''}){palette.RESET}"]
+        busiest = sorted(self.groups.values(), key=lambda group: group.repeats, reverse=True)[:SUMMARY_GROUPS]
+        for group in busiest:
+            if group.repeats:
+                line = f"  x{group.repeats + 1:<6} [{group.log.get('type', 'unknown').upper()}] {group.log.get('message', '')}"
+                lines.append(f"{palette.GRAY}{line[:self.renderer.width]}{palette.RESET}")
+        return lines
+
+    def flush(self, close_all: bool = False) -> None:
+        """Render everything pending as one write (and redraw the summary pane).
+
+        close_all also closes open repeat groups and always shows the summary.
+        """
+        now = self.clock()
+        with self.lock:
+            self._expire(now, close_all)
+            lines = list(self.pending)
+            self.pending.clear()
+            drops = self.dropped - self.reported_drops
+            self.reported_drops = self.dropped
+            show_summary = self.summary and (self.live_pane or close_all or now - self.last_summary >= SUMMARY_INTERVAL)
+            summary = self.summary_lines(now) if show_summary else []
+        if not lines and not drops and not summary:
+            return
+
+        palette = self.palette
+        parts = []
+        if self.pane_lines:
+            # Move up over the previous pane and clear it
+            parts.append(f"\033[{self.pane_lines}F\033[J")
+        if drops:
+            parts.append(f"{palette.YELLOW}... {drops:,} entries dropped, the display couldn't keep up "
+                         f"(--backlog){palette.RESET}\n{self.renderer.separator}\n")
+        for kind, item in lines:
+            parts.append(self.renderer.render(item) if kind == "entry" else self.render_repeat(item))
+            parts.append(f"\n{self.renderer.separator}\n")
+        if summary:
+            parts.append("\n".join(summary) + "\n")
+            self.last_summary = now
+        self.pane_lines = len(summary) if self.live_pane else 0
+        self.stream.write("".join(parts))
+        self.stream.flush()
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Redraw at most `refresh` times per second until stop is set (or KeyboardInterrupt)"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = self.clock()
+            self.flush()
+            stop.wait(max(self.frame_interval - (self.clock() - started), 0.01))
+
+    def close(self) -> None:
+        """Print what is still pending, including the counts of open repeat groups"""
+        self.flush(close_all=True)
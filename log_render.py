@@ -0,0 +1,145 @@
+"""
+Fast log rendering for debug_client.py
+
+LogRenderer formats log entries exactly like the original format_log_entry
+output, but resolves the terminal width and color table once, slices ISO
+timestamps instead of parsing them, uses orjson for data payloads when it
+is installed, truncates huge payloads, and writes whole batches with a
+single buffered write.
+"""
+
+import json
+import shutil
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_MAX_DATA_CHARS = 4000
+DATA_INDENT = " " * 4
+
+# Terminal colors
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    PURPLE = "\033[95m"
+    CYAN = "\033[96m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+# Same attributes as Colors, for plain-text output
+class NoColors:
+    RESET = ""
+    RED = ""
+    GREEN = ""
+    YELLOW = ""
+    BLUE = ""
+    PURPLE = ""
+    CYAN = ""
+    GRAY = ""
+    BOLD = ""
+
+def get_terminal_width() -> int:
+    try:
+        return shutil.get_terminal_size().columns
+    except (OSError, ValueError):
+        return 80
+
+def format_timestamp(timestamp: str) -> str:
+    """Render an ISO timestamp as 'YYYY-MM-DD HH:MM:SS' without parsing it when possible"""
+    if len(timestamp) >= 19 and timestamp[10] == "T" and timestamp[4] == "-" and timestamp[13] == ":":
+        return f"{timestamp[:10]} {timestamp[11:19]}"
+    return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+def dumps_pretty(data: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2)
+
+def dumps_compact(data: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(",", ":"))
+
+class LogRenderer:
+    """Formats log entries with per-renderer cached width, colors and separator.
+
+    With target_width, each line starts with the entry's "target" (the
+    deployment it came from) padded to that width.
+    """
+
+    def __init__(self, verbose: bool = False, color: bool = True, max_data_chars: Optional[int] = DEFAULT_MAX_DATA_CHARS,
+                 width: Optional[int] = None, target_width: int = 0):
+        self.verbose = verbose
+        self.target_width = target_width
+        self.palette = Colors if color else NoColors
+        self.max_data_chars = max_data_chars or None
+        self.width = width or get_terminal_width()
+        self.separator = "-" * self.width
+
+        palette = self.palette
+        self.type_colors = {
+            "error": palette.RED,
+            "success": palette.GREEN,
+            "info": palette.BLUE,
+            "warn": palette.YELLOW,
+        }
+        self.timestamp_prefix = palette.GRAY
+        self.timestamp_suffix = f"{palette.RESET} ["
+        self.type_suffix = f"{palette.RESET}] "
+        self.data_prefix = f"\n{palette.GRAY}{DATA_INDENT}"
+        self.data_suffix = palette.RESET
+        self.target_prefix = palette.CYAN
+        self.target_suffix = f"{palette.RESET} "
+
+    def format_data(self, data: Any) -> str:
+        """Pretty-print a data payload, truncating payloads above max_data_chars"""
+        if self.max_data_chars:
+            # Size up the payload cheaply before pretty-printing all of it
+            compact = dumps_compact(data)
+            if len(compact) > self.max_data_chars:
+                hidden = len(compact) - self.max_data_chars
+                return f"{compact[:self.max_data_chars]}... ({hidden} more characters, use --max-data 0 to show all)"
+        return dumps_pretty(data).replace("\n", "\n" + DATA_INDENT)
+
+    def render(self, log: Dict[str, Any]) -> str:
+        log_type = log.get("type", "unknown")
+        result = (
+            f"{self.timestamp_prefix}{format_timestamp(log.get('timestamp', ''))}{self.timestamp_suffix}"
+            f"{self.type_colors.get(log_type, self.palette.GRAY)}{log_type.upper()}{self.type_suffix}"
+            f"{log.get('message', 'No message')}"
+        )
+        if self.target_width:
+            result = f"{self.target_prefix}{log.get('target', ''):<{self.target_width}}{self.target_suffix}{result}"
+        if self.verbose and log.get("data"):
+            result += f"{self.data_prefix}{self.format_data(log['data'])}{self.data_suffix}"
+        return result
+
+    def render_many(self, logs: Iterable[Dict[str, Any]], separators: bool = True) -> str:
+        parts: List[str] = []
+        separator = self.separator
+        for log in logs:
+            parts.append(self.render(log))
+            if separators:
+                parts.append(separator)
+        parts.append("")
+        return "\n".join(parts)
+
+    def write(self, logs: Iterable[Dict[str, Any]], stream: Optional[TextIO] = None, separators: bool = True) -> None:
+        """Render a batch of entries and emit it with one buffered write"""
+        stream = stream or sys.stdout
+        stream.write(self.render_many(logs, separators))
+        stream.flush()
@@ -0,0 +1,257 @@
+"""
+Full-text search over debug logs for debug_client.py
+
+Builds an inverted index over each entry's message, type and flattened
+`data` payload (e.g. data.form_data.email) and answers queries such as:
+
+  type:error data.email:test@example.com    field-scoped terms
+  "bad request"                             phrase
+  formsp*                                   prefix
+  -simulated                                exclusion
+  after:2024-05-01 before:2024-05-02T12:00  time range (ISO timestamps)
+
+Terms are ANDed together. The index is updated incrementally as new logs
+arrive and can be saved to disk between runs.
+"""
+
+import bisect
+import os
+import pickle
+import re
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+QUERY_PATTERN = re.compile(r'(-?)(?:([\w.]+):)?(?:"([^"]*)"|(\S+))')
+INDEX_VERSION = 1
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def flatten_data(value: Any, prefix: str = "data") -> Iterator[Tuple[str, str]]:
+    """Yield (field path, text) pairs for every key and scalar value in a payload.
+
+    Keys are indexed too, so `data:email` finds entries that carry an email field.
+    """
+    if isinstance(value, dict):
+        for key, child in value.items():
+            path = f"{prefix}.{key}"
+            yield prefix, str(key)
+            yield from flatten_data(child, path)
+    elif isinstance(value, list):
+        for child in value:
+            yield from flatten_data(child, prefix)
+    elif value is not None:
+        yield prefix, str(value)
+
+def entry_fields(log: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    yield "message", log.get("message") or ""
+    yield "type", log.get("type") or ""
+    if log.get("data") is not None:
+        yield from flatten_data(log["data"])
+
+class SearchQuery:
+    """A parsed query: required terms, excluded terms and a time range"""
+
+    def __init__(self, text: str):
+        # Each clause is (field or None, tokens, is_prefix)
+        self.required: List[Tuple[Optional[str], List[str], bool]] = []
+        self.excluded: List[Tuple[Optional[str], List[str], bool]] = []
+        self.after: Optional[str] = None
+        self.before: Optional[str] = None
+
+        for negate, field, phrase, word in QUERY_PATTERN.findall(text):
+            value = phrase if phrase else word
+            if field in ("after", "since") and not negate:
+                self.after = value
+                continue
+            if field in ("before", "until") and not negate:
+                self.before = value
+                continue
+            is_prefix = not phrase and value.endswith("*")
+            tokens = tokenize(value)
+            if not tokens:
+                continue
+            clause = (field.lower() if field else None, tokens, is_prefix)
+            (self.excluded if negate else self.required).append(clause)
+
+class LogSearchIndex:
+    """Inverted index over log entries, appended to in id order"""
+
+    def __init__(self):
+        self.logs: List[Dict[str, Any]] = []
+        self.timestamps: List[str] = []
+        self.max_id = 0
+        # LogCache.generation of the cache the entries came from
+        self.generation = 0
+        # term -> doc numbers (any field), (field, term) -> doc numbers
+        self.postings: Dict[str, array] = {}
+        self.field_postings: Dict[Tuple[str, str], array] = {}
+        self.fields: Set[str] = set()
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    # Indexing
+
+    @staticmethod
+    def _append(postings: Dict[Any, array], key: Any, doc: int) -> None:
+        docs = postings.get(key)
+        if docs is None:
+            postings[key] = array("I", [doc])
+        elif docs[-1] != doc:
+            docs.append(doc)
+
+    def add(self, log: Dict[str, Any]) -> bool:
+        """Index one entry; entries at or below the newest indexed id are skipped"""
+        try:
+            log_id = int(log.get("id"))
+        except (TypeError, ValueError):
+            return False
+        if log_id <= self.max_id:
+            return False
+
+        doc = len(self.logs)
+        self.logs.append(log)
+        self.timestamps.append(log.get("timestamp") or "")
+        self.max_id = log_id
+
+        for field, text in entry_fields(log):
+            field = field.lower()
+            self.fields.add(field)
+            for token in tokenize(text):
+                self._append(self.postings, token, doc)
+                self._append(self.field_postings, (field, token), doc)
+        self._vocabulary = None
+        return True
+
+    def add_many(self, logs: Iterable[Dict[str, Any]]) -> int:
+        """Index entries in ascending id order; returns how many were added"""
+        return sum(1 for log in logs if self.add(log))
+
+    # Querying
+
+    def _resolve_fields(self, field: str) -> List[str]:
+        """Map a query field to indexed fields.
+
+        `data` matches every payload field, and data.email also matches
+        nested paths such as data.form_data.email.
+        """
+        if field == "data":
+            return [name for name in self.fields if name == "data" or name.startswith("data.")]
+        if field.startswith("data."):
+            suffix = field[4:]
+            return [name for name in self.fields if name == field or name.endswith(suffix)]
+        return [field] if field in self.fields else []
+
+    def _terms_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _term_docs(self, field: Optional[str], term: str, is_prefix: bool) -> Set[int]:
+        terms = self._terms_with_prefix(term) if is_prefix else [term]
+        docs: Set[int] = set()
+        if field is None:
+            for name in terms:
+                docs.update(self.postings.get(name, ()))
+            return docs
+        for name in self._resolve_fields(field):
+            for term_name in terms:
+                docs.update(self.field_postings.get((name, term_name), ()))
+        return docs
+
+    def _phrase_matches(self, doc: int, field: Optional[str], tokens: List[str]) -> bool:
+        fields = None if field is None else set(self._resolve_fields(field))
+        size = len(tokens)
+        for name, text in entry_fields(self.logs[doc]):
+            if fields is not None and name.lower() not in fields:
+                continue
+            words = tokenize(text)
+            for start in range(len(words) - size + 1):
+                if words[start:start + size] == tokens:
+                    return True
+        return False
+
+    def _clause_docs(self, clause: Tuple[Optional[str], List[str], bool]) -> Set[int]:
+        """Docs containing every word of the clause (phrases still need _phrase_matches)"""
+        field, tokens, is_prefix = clause
+        docs: Optional[Set[int]] = None
+        for position, token in enumerate(tokens):
+            # Only the last word of a prefix query is a prefix
+            token_docs = self._term_docs(field, token, is_prefix and position == len(tokens) - 1)
+            docs = token_docs if docs is None else docs & token_docs
+            if not docs:
+                return set()
+        return docs
+
+    @staticmethod
+    def _is_phrase(clause: Tuple[Optional[str], List[str], bool]) -> bool:
+        return len(clause[1]) > 1 and not clause[2]
+
+    def search(self, query: str, limit: Optional[int] = 100, after: Optional[str] = None,
+               before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return matching entries, newest first"""
+        parsed = SearchQuery(query)
+        after = after or parsed.after
+        before = before or parsed.before
+
+        # Entries are appended in id (and therefore time) order, so the time
+        # range is a contiguous slice found by binary search
+        low = bisect.bisect_left(self.timestamps, after) if after else 0
+        high = bisect.bisect_left(self.timestamps, before) if before else len(self.logs)
+
+        docs: Optional[Set[int]] = None
+        for clause in parsed.required:
+            clause_docs = self._clause_docs(clause)
+            docs = clause_docs if docs is None else docs & clause_docs
+            if not docs:
+                return []
+        if docs is None:
+            docs = set(range(low, high))
+
+        excluded_phrases = []
+        for clause in parsed.excluded:
+            if self._is_phrase(clause):
+                excluded_phrases.append((clause, self._clause_docs(clause)))
+            else:
+                docs -= self._clause_docs(clause)
+
+        # Phrases are verified lazily, newest first, until the limit is reached
+        required_phrases = [clause for clause in parsed.required if self._is_phrase(clause)]
+        results = []
+        for doc in sorted((doc for doc in docs if low <= doc < high), reverse=True):
+            if not all(self._phrase_matches(doc, field, tokens) for field, tokens, _ in required_phrases):
+                continue
+            if any(doc in phrase_docs and self._phrase_matches(doc, field, tokens)
+                   for (field, tokens, _), phrase_docs in excluded_phrases):
+                continue
+            results.append(self.logs[doc])
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump((INDEX_VERSION, self.__dict__ | {"_vocabulary": None}), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LogSearchIndex":
+        """Load a saved index, or return an empty one if it is missing or outdated"""
+        index = cls()
+        try:
+            with open(path, "rb") as f:
+                version, state = pickle.load(f)
+            if version == INDEX_VERSION:
+                index.__dict__.update(state)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+        return index
@@ -0,0 +1,310 @@
+"""
+Streaming log analytics for debug_client.py
+
+Aggregates any number of log entries in constant memory:
+
+  - entries per type in fixed-width time buckets (the bucket width doubles
+    whenever the range would need more than max_buckets buckets), from which
+    the error-rate series is derived
+  - the most frequent messages, counted approximately with a Space-Saving
+    sketch of a fixed number of counters (ids, emails and long numbers in
+    messages are replaced so similar messages count together)
+  - latency distributions of numeric `data` fields such as data.duration_ms,
+    per form, in the bounded histograms used for request timings
+
+Entries can arrive in any order, so pages may be read newest first.
+"""
+
+import functools
+import heapq
+import math
+import re
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from instrumentation import LatencyHistogram
+
+DEFAULT_BUCKET = "1h"
+DEFAULT_MAX_BUCKETS = 512
+DEFAULT_TOP = 10
+SKETCH_COUNTERS_PER_ITEM = 20  # Space-Saving counters kept per reported message
+DEFAULT_LATENCY_FIELDS = ("duration_ms", "latency_ms", "elapsed_ms", "response_time_ms")
+MAX_LATENCY_GROUPS = 64  # (field, form) pairs; further forms are counted as "other"
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+MESSAGE_PATTERNS = [
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ][\d:.]+Z?"), "<time>"),
+    (re.compile(r"\b(?:0x)?[0-9a-fA-F]*\d[0-9a-fA-F]*\b"), lambda m: m.group(0) if len(m.group(0)) < 5 else "<n>"),
+]
+
+def parse_duration(value: str) -> float:
+    """Seconds in a duration like 5m, 1h or 7d"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 5m, 1h, 1d)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds of an entry's ISO timestamp (UTC if no zone is given)"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def parse_when(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an ISO date/time or an age relative to now (1d = a day ago)"""
+    if not value:
+        return None
+    if re.fullmatch(r"\d+(?:\.\d+)?[smhdw]", value.strip()):
+        return time.time() - parse_duration(value)
+    when = parse_timestamp(value.strip())
+    if when is None:
+        raise ValueError(f"Invalid time: {value!r} (expected an ISO timestamp or an age like 1d)")
+    return when
+
+def format_duration(seconds: float) -> str:
+    """Shortest exact form of a bucket width, e.g. 3600 -> 1h, 5400 -> 90m"""
+    for unit, size in sorted(DURATION_UNITS.items(), key=lambda item: -item[1]):
+        if seconds >= size and seconds % size == 0:
+            return f"{int(seconds // size)}{unit}"
+    return f"{seconds:g}s"
+
+def format_timestamp(ts: float) -> str:
+    """ISO timestamp in the debug server's format (UTC, milliseconds)"""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+@functools.lru_cache(maxsize=4096)  # real logs repeat a small set of messages
+def normalize_message(message: str) -> str:
+    for pattern, replacement in MESSAGE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+def field_value(data: Any, path: str) -> Optional[float]:
+    """Numeric value at a dotted path inside an entry's data payload"""
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    if isinstance(data, bool) or not isinstance(data, (int, float, str)):
+        return None
+    try:
+        value = float(data)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+class TimeBuckets:
+    """Entry counts per type in fixed-width time buckets aligned to the epoch"""
+
+    def __init__(self, width: float, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        self.width = width
+        self.max_buckets = max_buckets
+        self.buckets: Dict[int, Counter] = {}  # bucket index -> counts by type
+        self.first: Optional[int] = None
+        self.last: Optional[int] = None
+
+    def add(self, ts: float, log_type: str) -> None:
+        index = int(ts // self.width)
+        counts = self.buckets.get(index)
+        if counts is None:
+            counts = self.buckets[index] = Counter()
+            self.first = index if self.first is None else min(self.first, index)
+            self.last = index if self.last is None else max(self.last, index)
+            if self.last - self.first >= self.max_buckets:
+                self._widen()
+                counts = self.buckets[int(ts // self.width)]
+        counts[log_type] += 1
+
+    def _widen(self) -> None:
+        # Merge neighbouring buckets until the covered range fits again
+        while self.last - self.first >= self.max_buckets:
+            self.width *= 2
+            merged: Dict[int, Counter] = {}
+            for index, counts in self.buckets.items():
+                merged.setdefault(index // 2, Counter()).update(counts)
+            self.buckets = merged
+            self.first //= 2
+            self.last //= 2
+
+    def series(self) -> List[Dict[str, Any]]:
+        """Every bucket from the first to the last entry, empty ones included"""
+        if self.first is None:
+            return []
+        series = []
+        for index in range(self.first, self.last + 1):
+            counts = self.buckets.get(index, Counter())
+            total = sum(counts.values())
+            series.append({
+                "start": index * self.width,
+                "total": total,
+                "types": dict(counts),
+                "error_rate": counts["error"] / total if total else None,
+            })
+        return series
+
+class SpaceSaving:
+    """Approximate top-K counts over a stream in fixed memory (Space-Saving).
+
+    Keeps `capacity` counters. An unseen item replaces the item with the
+    smallest count and inherits that count as its possible overcount, so
+    count - error <= true count <= count, and any item occurring more than
+    total/capacity times is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        # One (count, item) per tracked item; counts only grow, so an entry
+        # may be stale (too low) and is refreshed when it reaches the top
+        self.heap: List[Tuple[int, Any]] = []
+        self.total = 0
+
+    def add(self, item: Any, count: int = 1) -> None:
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self.heap, (count, item))
+            return
+        while True:
+            smallest, victim = self.heap[0]
+            current = self.counts[victim]
+            if current == smallest:
+                break
+            heapq.heapreplace(self.heap, (current, victim))
+        heapq.heapreplace(self.heap, (smallest + count, item))
+        del self.counts[victim], self.errors[victim]
+        self.counts[item] = smallest + count
+        self.errors[item] = smallest
+
+    def top(self, k: int) -> List[Tuple[Any, int, int]]:
+        """The k largest (item, count, possible overcount), largest first"""
+        return [(item, self.counts[item], self.errors[item])
+                for item in heapq.nlargest(k, self.counts, key=self.counts.__getitem__)]
+
+def histogram_summary(histogram: LatencyHistogram) -> Dict[str, Any]:
+    """Summary of a latency field histogram, in the field's own units"""
+    count = histogram.total
+    return {
+        "count": count,
+        "min": histogram.min / 1000 if count else None,
+        "mean": histogram.mean() * 1000 if count else None,
+        "p50": histogram.percentile(50) * 1000 if count else None,
+        "p90": histogram.percentile(90) * 1000 if count else None,
+        "p99": histogram.percentile(99) * 1000 if count else None,
+        "max": histogram.max / 1000 if count else None,
+    }
+
+class LogStats:
+    """All aggregations over one stream of log entries"""
+
+    def __init__(self, bucket_seconds: float = 3600.0, max_buckets: int = DEFAULT_MAX_BUCKETS,
+                 top: int = DEFAULT_TOP, latency_fields: Sequence[str] = DEFAULT_LATENCY_FIELDS,
+                 since: Optional[float] = None, until: Optional[float] = None):
+        self.buckets = TimeBuckets(bucket_seconds, max_buckets)
+        self.top = top
+        self.messages = SpaceSaving(max(top, 1) * SKETCH_COUNTERS_PER_ITEM)
+        self.latency_fields = list(latency_fields)
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.since = since
+        self.until = until
+        self.entries = 0
+        self.skipped = 0  # entries without a usable timestamp
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def add(self, log: Dict[str, Any]) -> None:
+        ts = parse_timestamp(log.get("timestamp"))
+        if ts is None:
+            self.skipped += 1
+            return
+        if (self.since is not None and ts < self.since) or (self.until is not None and ts >= self.until):
+            return
+        self.entries += 1
+        self.first = ts if self.first is None else min(self.first, ts)
+        self.last = ts if self.last is None else max(self.last, ts)
+
+        log_type = log.get("type") or "unknown"
+        self.buckets.add(ts, log_type)
+        self.messages.add((log_type, normalize_message(log.get("message") or "")))
+
+        data = log.get("data")
+        if isinstance(data, dict):
+            for field in self.latency_fields:
+                value = field_value(data, field)
+                if value is not None:
+                    # Recorded as milliseconds, i.e. to a thousandth of the field's unit
+                    self._histogram(field, data.get("form_name")).record(value / 1000)
+
+    def add_many(self, logs: Iterable[Dict[str, Any]]) -> int:
+        before = self.entries
+        for log in logs:
+            self.add(log)
+        return self.entries - before
+
+    def _histogram(self, field: str, form: Any) -> LatencyHistogram:
+        key = (field, str(form) if form else "-")
+        histogram = self.latency.get(key)
+        if histogram is None:
+            if len(self.latency) >= MAX_LATENCY_GROUPS:
+                key = (field, "other")
+                histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = LatencyHistogram()
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly results; timestamps are ISO strings"""
+        return {
+            "entries": self.entries,
+            "skipped": self.skipped,
+            "first": format_timestamp(self.first) if self.first is not None else None,
+            "last": format_timestamp(self.last) if self.last is not None else None,
+            "bucket_seconds": self.buckets.width,
+            "buckets": [dict(bucket, start=format_timestamp(bucket["start"])) for bucket in self.buckets.series()],
+            "top_messages": [
+                {"type": log_type, "message": message, "count": count, "error": error}
+                for (log_type, message), count, error in self.messages.top(self.top)
+            ],
+            "latency": [
+                dict(field=field, form=form, **histogram_summary(histogram))
+                for (field, form), histogram in sorted(self.latency.items())
+            ],
+        }
+
+def merge_buckets(series: List[Dict[str, Any]], step: int) -> List[Dict[str, Any]]:
+    """Combine every `step` neighbouring buckets of TimeBuckets.series()"""
+    if step <= 1:
+        return series
+    merged = []
+    for i in range(0, len(series), step):
+        group = series[i:i + step]
+        types: Counter = Counter()
+        for bucket in group:
+            types.update(bucket["types"])
+        total = sum(types.values())
+        merged.append({"start": group[0]["start"], "total": total, "types": dict(types),
+                       "error_rate": types["error"] / total if total else None})
+    return merged
+
+def sparkline(values: Sequence[Optional[float]]) -> str:
+    """Unicode sparkline scaled to the largest value; None and zero are blank"""
+    peak = max((value for value in values if value), default=0)
+    if not peak:
+        return " " * len(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(" " if not value else SPARK_CHARS[max(0, math.ceil(value / peak * top - 1e-9))] for value in values)
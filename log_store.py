@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Log Store Reader - Reads and compacts the debug server's append-only log
+store (src/lib/log-store.ts) directly from disk.
+
+Each segment is a newline-delimited JSON file (<first id>.log) with a
+fixed-width index (<first id>.idx) of little-endian int64 (id, timestamp
+in epoch ms, byte offset) records. Both are memory-mapped, so cursor
+lookups are binary searches and scans only decode the entries they return.
+
+Usage:
+  python3 log_store.py [command] DIR [options]
+
+Commands:
+  stats         - Show segment and entry counts
+  tail          - Print the newest entries as JSON lines (--follow to keep reading)
+  scan          - Print entries in an id or time range as JSON lines
+  compact       - Merge sealed segments, rebuild their indexes and apply retention
+
+Examples:
+  python3 log_store.py tail debug-server-logs -n 20
+  python3 log_store.py scan debug-server-logs --since 2024-05-01 --until 2024-05-02
+  python3 log_store.py compact debug-server-logs --max-entries 5000
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_RECORD = struct.Struct("<qqq")
+SEGMENT_NAME_WIDTH = 16
+DEFAULT_SEGMENT_BYTES = 1024 * 1024
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_AGE_DAYS = 30
+MAX_PAGE_SIZE = 500
+
+def timestamp_ms(value: str) -> int:
+    """Epoch milliseconds for an ISO timestamp (or date), as stored in the index"""
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None
+        return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+class Segment:
+    """One memory-mapped segment: the .log data and its .idx records"""
+
+    def __init__(self, directory: str, name: str):
+        self.name = name
+        self.log_path = os.path.join(directory, f"{name}.log")
+        self.index_path = os.path.join(directory, f"{name}.idx")
+        self.index_size = -1
+        self.data: Optional[mmap.mmap] = None
+        self.index: Optional[mmap.mmap] = None
+        self.records: Any = ()
+        self.count = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Remap the files if the server appended since they were mapped"""
+        size = os.stat(self.index_path).st_size
+        if size == self.index_size:
+            return
+        self.close()
+        self.index_size = size
+        self.index = _map(self.index_path)
+        self.data = _map(self.log_path)
+        self.count = size // INDEX_RECORD.size
+        if self.index is None:
+            self.records = ()
+        elif sys.byteorder == "little":
+            # Zero-copy view of the index as (id, ts, offset) triples
+            self.records = memoryview(self.index)[:self.count * INDEX_RECORD.size].cast("q")
+        else:
+            self.records = array("q", self.index[:self.count * INDEX_RECORD.size])
+            self.records.byteswap()
+
+    def close(self) -> None:
+        if isinstance(self.records, memoryview):
+            self.records.release()
+        self.records = ()
+        for mapped in (self.index, self.data):
+            if mapped is not None:
+                mapped.close()
+        self.index = self.data = None
+
+    def id_at(self, position: int) -> int:
+        return self.records[position * 3]
+
+    def ts_at(self, position: int) -> int:
+        return self.records[position * 3 + 1]
+
+    def offset_at(self, position: int) -> int:
+        return self.records[position * 3 + 2]
+
+    def upper_bound(self, log_id: int) -> int:
+        """Position of the first record with an id above log_id"""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.id_at(mid) <= log_id:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def ts_lower_bound(self, ts: int) -> int:
+        """Position of the first record at or after ts (timestamps never decrease)"""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.ts_at(mid) < ts:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def raw_line(self, position: int) -> bytes:
+        start = self.offset_at(position)
+        if position + 1 < self.count:
+            end = self.offset_at(position + 1) - 1
+        else:
+            end = self.data.find(b"\n", start)
+        return self.data[start:end]
+
+    def entry(self, position: int) -> Dict[str, Any]:
+        return json.loads(self.raw_line(position))
+
+class LogStore:
+    """Read access to a log store directory, plus compaction"""
+
+    def __init__(self, directory: str):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Log store directory not found: {directory}")
+        self.directory = directory
+        self._segments: Dict[str, Segment] = {}
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+
+    def __enter__(self) -> "LogStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def segment_names(self) -> List[str]:
+        return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".idx"))
+
+    def segments(self) -> List[Segment]:
+        """Current segments, oldest first, remapping any that have grown"""
+        names = self.segment_names()
+        for name in set(self._segments) - set(names):
+            self._segments.pop(name).close()
+        segments = []
+        for name in names:
+            try:
+                segment = self._segments.get(name)
+                if segment is None:
+                    segment = self._segments[name] = Segment(self.directory, name)
+                else:
+                    segment.refresh()
+            except FileNotFoundError:
+                continue  # removed by retention while we were listing
+            segments.append(segment)
+        return segments
+
+    @staticmethod
+    def _segment_for(segments: List[Segment], log_id: int) -> int:
+        """Index of the last segment whose first id is at or below log_id"""
+        low, high, found = 0, len(segments) - 1, 0
+        while low <= high:
+            mid = (low + high) // 2
+            if int(segments[mid].name) <= log_id:
+                found = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+        return found
+
+    # Reads
+
+    def latest_id(self) -> Optional[str]:
+        for segment in reversed(self.segments()):
+            if segment.count:
+                return str(segment.id_at(segment.count - 1))
+        return None
+
+    def iter_after(self, after_id: Any = 0) -> Iterator[Dict[str, Any]]:
+        """Entries newer than after_id, oldest first"""
+        cursor = int(after_id or 0)
+        segments = self.segments()
+        for segment in segments[self._segment_for(segments, cursor):]:
+            for position in range(segment.upper_bound(cursor), segment.count):
+                yield segment.entry(position)
+
+    def iter_before(self, before_id: Any = None) -> Iterator[Dict[str, Any]]:
+        """Entries older than before_id (or all entries), newest first"""
+        segments = self.segments()
+        if not segments:
+            return
+        if before_id is None:
+            last, cursor = len(segments) - 1, None
+        else:
+            cursor = int(before_id or 0) - 1
+            last = self._segment_for(segments, cursor)
+        for segment in reversed(segments[:last + 1]):
+            end = segment.count if cursor is None else segment.upper_bound(cursor)
+            for position in range(end - 1, -1, -1):
+                yield segment.entry(position)
+
+    def tail(self, count: int = 20) -> List[Dict[str, Any]]:
+        """The newest count entries, oldest first"""
+        entries = []
+        for log in self.iter_before():
+            if len(entries) >= count:
+                break
+            entries.append(log)
+        entries.reverse()
+        return entries
+
+    def scan(self, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Entries with since <= timestamp < until (ISO timestamps), oldest first"""
+        start = timestamp_ms(since) if since else None
+        end = timestamp_ms(until) if until else None
+        for segment in self.segments():
+            if not segment.count:
+                continue
+            if start is not None and segment.ts_at(segment.count - 1) < start:
+                continue
+            if end is not None and segment.ts_at(0) >= end:
+                return
+            position = segment.ts_lower_bound(start) if start is not None else 0
+            while position < segment.count:
+                if end is not None and segment.ts_at(position) >= end:
+                    return
+                yield segment.entry(position)
+                position += 1
+
+    def get_logs(self, limit: int = 100, log_type: Optional[str] = None, search: Optional[str] = None,
+                 after_id: Optional[str] = None, before_id: Optional[str] = None) -> Dict[str, Any]:
+        """One page of logs with the same cursor protocol as the debug server's get_logs"""
+        page_size = min(max(int(limit or 100), 1), MAX_PAGE_SIZE)
+        term = search.lower() if search else None
+        source = self.iter_after(after_id) if after_id is not None else self.iter_before(before_id)
+        logs: List[Dict[str, Any]] = []
+        has_more = False
+        for log in source:
+            if log_type and log.get("type") != log_type:
+                continue
+            if term and term not in (log.get("message") or "").lower() and term not in (log.get("type") or "").lower():
+                continue
+            if len(logs) == page_size:
+                has_more = True
+                break
+            logs.append(log)
+        return {
+            "logs": logs,
+            "has_more": has_more,
+            "next_cursor": logs[-1]["id"] if has_more else None,
+            "latest_id": self.latest_id(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        segments = self.segments()
+        return {
+            "path": self.directory,
+            "segments": len(segments),
+            "entries": sum(segment.count for segment in segments),
+            "bytes": sum(os.path.getsize(segment.log_path) + segment.index_size for segment in segments),
+            "latest_id": self.latest_id(),
+        }
+
+    # Compaction
+
+    def compact(self, segment_bytes: int = DEFAULT_SEGMENT_BYTES, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS) -> Dict[str, int]:
+        """Rewrite sealed segments into segments of about segment_bytes.
+
+        Indexes are rebuilt from the data, so entries left unindexed by an
+        interrupted append are recovered. Entries beyond max_entries (newest
+        kept) or older than max_age_days are dropped. The active (newest)
+        segment is left alone, so this is safe while the server is running.
+        """
+        segments = self.segments()
+        sealed, active = segments[:-1], segments[-1:]
+        if not sealed:
+            return {"segments_before": len(segments), "segments_after": len(segments), "dropped": 0}
+
+        # Entries kept, oldest first
+        keep_total = None if not max_entries else max(max_entries - sum(segment.count for segment in active), 0)
+        cutoff = (time.time() - max_age_days * 86400) * 1000 if max_age_days else None
+        lines: List[Tuple[int, int, bytes]] = []
+        for segment in sealed:
+            if segment.data is None:
+                continue
+            for line in segment.data[:].split(b"\n"):
+                if not line.strip():
+                    continue
+                try:
+                    log = json.loads(line)
+                    entry = (int(log["id"]), timestamp_ms(log.get("timestamp") or "1970-01-01T00:00:00Z"), line)
+                except (ValueError, KeyError, TypeError):
+                    continue  # a torn write
+                if cutoff is not None and entry[1] < cutoff:
+                    continue
+                lines.append(entry)
+        total = sum(segment.count for segment in sealed)
+        lines.sort(key=lambda entry: entry[0])
+        deduplicated = [entry for i, entry in enumerate(lines) if i == 0 or entry[0] != lines[i - 1][0]]
+        if keep_total is not None:
+            deduplicated = deduplicated[len(deduplicated) - keep_total:] if keep_total else []
+
+        # Write the new segments under temporary names, then swap them in
+        written = []
+        group: List[Tuple[int, int, bytes]] = []
+        group_bytes = 0
+        for entry in deduplicated:
+            group.append(entry)
+            group_bytes += len(entry[2]) + 1
+            if group_bytes >= segment_bytes:
+                written.append(self._write_segment(group))
+                group, group_bytes = [], 0
+        if group:
+            written.append(self._write_segment(group))
+
+        new_names = {name for name, _ in written}
+        for segment in sealed:
+            self._segments.pop(segment.name, None)
+            segment.close()
+            if segment.name not in new_names:
+                os.remove(segment.index_path)
+                os.remove(segment.log_path)
+        for name, temp_prefix in written:
+            os.replace(f"{temp_prefix}.log", os.path.join(self.directory, f"{name}.log"))
+            os.replace(f"{temp_prefix}.idx", os.path.join(self.directory, f"{name}.idx"))
+
+        return {
+            "segments_before": len(segments),
+            "segments_after": len(written) + len(active),
+            "dropped": total - len(deduplicated) if total > len(deduplicated) else 0,
+        }
+
+    def _write_segment(self, entries: List[Tuple[int, int, bytes]]) -> Tuple[str, str]:
+        name = str(entries[0][0]).zfill(SEGMENT_NAME_WIDTH)
+        temp_prefix = os.path.join(self.directory, f".compact-{name}")
+        offset = 0
+        index = bytearray()
+        with open(f"{temp_prefix}.log", "wb") as f:
+            for log_id, ts, line in entries:
+                index += INDEX_RECORD.pack(log_id, ts, offset)
+                f.write(line)
+                f.write(b"\n")
+                offset += len(line) + 1
+        with open(f"{temp_prefix}.idx", "wb") as f:
+            f.write(index)
+        return name, temp_prefix
+
+# Command functions
+def print_entries(entries: Iterator[Dict[str, Any]]) -> None:
+    out = sys.stdout
+    for log in entries:
+        out.write(json.dumps(log, separators=(",", ":")) + "\n")
+    out.flush()
+
+def cmd_stats(store: LogStore, args: argparse.Namespace) -> None:
+    print(json.dumps(store.stats(), indent=2))
+
+def cmd_tail(store: LogStore, args: argparse.Namespace) -> None:
+    entries = store.tail(args.lines)
+    print_entries(iter(entries))
+    if not args.follow:
+        return
+    cursor = entries[-1]["id"] if entries else (store.latest_id() or "0")
+    try:
+        while True:
+            time.sleep(args.interval)
+            for log in store.iter_after(cursor):
+                print_entries(iter([log]))
+                cursor = log["id"]
+    except KeyboardInterrupt:
+        pass
+
+def cmd_scan(store: LogStore, args: argparse.Namespace) -> None:
+    if args.since_id is not None:
+        print_entries(store.iter_after(args.since_id))
+    else:
+        print_entries(store.scan(args.since, args.until))
+
+def cmd_compact(store: LogStore, args: argparse.Namespace) -> None:
+    result = store.compact(segment_bytes=args.segment_bytes, max_entries=args.max_entries,
+                           max_age_days=args.max_age_days)
+    print(f"Compacted {result['segments_before']} segments into {result['segments_after']}, "
+          f"dropped {result['dropped']} entries")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read and compact the debug server's log store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="Show segment and entry counts")
+    stats_parser.add_argument("directory", help="Log store directory")
+
+    tail_parser = subparsers.add_parser("tail", help="Print the newest entries")
+    tail_parser.add_argument("directory", help="Log store directory")
+    tail_parser.add_argument("-n", "--lines", type=int, default=20, help="Number of entries")
+    tail_parser.add_argument("-f", "--follow", action="store_true", help="Keep printing new entries")
+    tail_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between checks with --follow")
+
+    scan_parser = subparsers.add_parser("scan", help="Print entries in a time or id range")
+    scan_parser.add_argument("directory", help="Log store directory")
+    scan_parser.add_argument("--since", help="Only entries at or after this ISO timestamp")
+    scan_parser.add_argument("--until", help="Only entries before this ISO timestamp")
+    scan_parser.add_argument("--since-id", help="Only entries newer than this log id")
+
+    compact_parser = subparsers.add_parser("compact", help="Merge sealed segments and apply retention")
+    compact_parser.add_argument("directory", help="Log store directory")
+    compact_parser.add_argument("--segment-bytes", type=int, default=DEFAULT_SEGMENT_BYTES, help="Target segment size")
+    compact_parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES, help="Entries to keep (0 = no limit)")
+    compact_parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS, help="Drop older entries (0 = no limit)")
+
+    args = parser.parse_args()
+    try:
+        store = LogStore(args.directory)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with store:
+        if args.command == "stats":
+            cmd_stats(store, args)
+        elif args.command == "tail":
+            cmd_tail(store, args)
+        elif args.command == "scan":
+            cmd_scan(store, args)
+        elif args.command == "compact":
+            cmd_compact(store, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In Server - An offline replacement for the website's debug
+server, form routes and FormSpree, for deterministic benchmarking.
+
+Implements:
+  POST /api/debug-server     log, log_batch, get_logs, clear_logs, test_formspree, check_environment
+  GET  /api/debug-server     status, or ?stream=1 for a Server-Sent Events log stream
+  GET  /api/debug/auto-test  form tests (?test=NAME or all)
+  POST /api/form-submit      form submission proxy
+  POST /api/debug/form-proxy FormSpree proxy used by form-debug.ts (mirrors FormSpree's status)
+  POST /api/submit-contact   contact form submission
+  POST /f/FORM_ID            FormSpree-compatible endpoint
+  GET  /api/speed-test/download  random bytes (?size=BYTES, at most 5 MB) from a cached block
+  POST /api/speed-test/upload    drains the body and reports its size
+
+Usage:
+  python3 mock_server.py [--port PORT] [--latency SPEC] [--error-rate P] [--throttle RPS]
+
+Options:
+  --host HOST            Interface to listen on (default: 127.0.0.1)
+  --port PORT            Port to listen on (default: 8765)
+  --latency SPEC         Added latency per request (default: none)
+  --upstream-latency SPEC
+                         Latency of simulated FormSpree calls made by the routes
+  --error-rate P         Fraction of requests answered with a 500 (0-1)
+  --throttle RPS         Answer 429 once requests exceed RPS per second
+  --seed N               Random seed, so runs are reproducible (default: 1)
+
+Latency specs (milliseconds):
+  fixed:20  uniform:10:50  normal:30:5  lognormal:30:0.5  exp:20
+
+Point every script at the stand-in (the second variable sends the
+direct-to-FormSpree tests there too):
+  export FORM_TOOLS_BASE_URL=http://127.0.0.1:8765
+  export FORMSPREE_BASE_URL=http://127.0.0.1:8765
+"""
+
+import argparse
+import functools
+import gzip
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Optional encodings of get_logs pages, as src/lib/wire-format.ts offers them
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Terminal colors
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    PURPLE = "\033[95m"
+    CYAN = "\033[96m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+# Environment variable that points every script at a stand-in server
+BASE_URL_ENV = "FORM_TOOLS_BASE_URL"
+FORMSPREE_URL_ENV = "FORMSPREE_BASE_URL"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_API_KEY = "debug-server-key"
+MAX_LOGS = 500
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 500
+STREAM_HEARTBEAT = 15.0  # seconds
+LOG_FIELDS = ("id", "timestamp", "type", "message", "data")
+MSGPACK_TYPE = "application/msgpack"
+MIN_COMPRESS_BYTES = 1024
+BROTLI_QUALITY = 4
+SPEED_TEST_BYTES = 5 * 1024 * 1024  # default and largest download, as src/lib/speed-test-payload.ts
+SPEED_TEST_CHUNK = 256 * 1024
+
+# Same test cases as /api/debug/auto-test
+TEST_CASES = {
+    "simpleContactForm": {
+        "name": "Test User",
+        "email": "test@example.com",
+        "message": "This is an automated test message from the Simple Contact Form.",
+    },
+    "contactPage": {
+        "name": "Test User",
+        "email": "test@example.com",
+        "phone": "555-123-4567",
+        "service": "computer-services",
+        "message": "This is an automated test message from the Contact Page.",
+        "consent": "yes",
+    },
+    "pricingCalculator": {
+        "name": "Test User",
+        "email": "test@example.com",
+        "phone": "555-123-4567",
+        "company": "Test Company",
+        "message": "This is an automated test message from the Pricing Calculator.",
+        "calculator_type": "managed",
+        "plan": "Standard",
+        "user_count": "10",
+        "estimated_price": "949",
+        "additional_services": "Cloud Services Management",
+    },
+    "serviceAssessment": {
+        "name": "Test User",
+        "email": "test@example.com",
+        "phone": "555-123-4567",
+        "assessment_data": json.dumps({
+            "business_type": "business",
+            "business_size": "small",
+            "current_it": "occasional",
+            "top_concerns": ["security", "reliability", "cost"],
+            "urgency": "soon",
+        }),
+    },
+}
+
+def parse_latency(spec: Optional[str]) -> Callable[[random.Random], float]:
+    """Turn a latency spec such as 'normal:30:5' into a sampler returning seconds"""
+    if not spec or spec in ("0", "none"):
+        return lambda rng: 0.0
+
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(":")] if params else []
+        if kind == "fixed":
+            (delay,) = values
+            return lambda rng: delay / 1000
+        if kind == "uniform":
+            low, high = values
+            return lambda rng: rng.uniform(low, high) / 1000
+        if kind == "normal":
+            mean, stddev = values
+            return lambda rng: max(rng.gauss(mean, stddev), 0.0) / 1000
+        if kind == "lognormal":
+            # Parameterized by the median in ms and the shape (sigma)
+            median, sigma = values
+            return lambda rng: rng.lognormvariate(math.log(median), sigma) / 1000
+        if kind == "exp":
+            (mean,) = values
+            return lambda rng: rng.expovariate(1 / mean) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts up to `rate`"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+def project_logs(logs: List[Dict[str, Any]], fields: Any) -> List[Dict[str, Any]]:
+    """Entries limited to the requested fields (id is always kept), like the route's projectLog"""
+    if not isinstance(fields, list):
+        return logs
+    selected = [field for field in LOG_FIELDS if field == "id" or field in fields]
+    return [{field: log.get(field) for field in selected} for log in logs]
+
+def accepts(header: Optional[str], value: str) -> bool:
+    """Whether an Accept or Accept-Encoding header allows a value (q=0 refuses it)"""
+    for part in (header or "").lower().split(","):
+        token, *params = [item.strip() for item in part.split(";")]
+        if token != value:
+            continue
+        q = next((param[2:] for param in params if param.startswith("q=")), None)
+        try:
+            return q is None or float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+@functools.lru_cache(maxsize=1)
+def speed_test_block() -> memoryview:
+    """Random bytes generated once and served by every download, like the real route"""
+    return memoryview(os.urandom(SPEED_TEST_BYTES))
+
+def speed_test_size(value: Optional[str]) -> int:
+    try:
+        size = int(value) if value is not None else SPEED_TEST_BYTES
+    except ValueError:
+        return SPEED_TEST_BYTES
+    return min(size, SPEED_TEST_BYTES) if size >= 0 else SPEED_TEST_BYTES
+
+class MockServerState:
+    """Logs, fault injection and simulated FormSpree shared by all request threads"""
+
+    def __init__(self, latency: Optional[str] = None, upstream_latency: Optional[str] = None,
+                 error_rate: float = 0.0, throttle: Optional[float] = None, seed: int = 1,
+                 api_key: str = DEFAULT_API_KEY, max_logs: int = MAX_LOGS):
+        self.latency = parse_latency(latency)
+        self.upstream_latency = parse_latency(upstream_latency)
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(throttle) if throttle else None
+        self.rng = random.Random(seed)
+        self.api_key = api_key
+        self.max_logs = max_logs
+        self.lock = threading.Lock()
+        self.new_log = threading.Condition(self.lock)
+        self.logs: List[Dict[str, Any]] = []  # newest first, like the real log file
+        self.last_log_id = 0
+        self.start_time = time.time()
+        self.server_info = {
+            "start_time": datetime.now(timezone.utc).isoformat(),
+            "environment": "mock",
+            "version": "1.0.0",
+        }
+        self.stopping = False
+
+    # Fault injection
+
+    def sample_faults(self) -> Tuple[float, Optional[int]]:
+        """Return (delay seconds, injected status or None) for one request"""
+        with self.lock:
+            if self.bucket and not self.bucket.allow():
+                return 0.0, 429
+            delay = self.latency(self.rng)
+            failed = self.error_rate and self.rng.random() < self.error_rate
+        return delay, 500 if failed else None
+
+    def formspree_submit(self, form_data: Any) -> Tuple[int, Dict[str, Any]]:
+        """Simulate a FormSpree submission, including upstream latency"""
+        with self.lock:
+            delay = self.upstream_latency(self.rng)
+        if delay:
+            time.sleep(delay)
+        if not isinstance(form_data, dict) or not form_data.get("email"):
+            return 422, {"error": "Validation errors", "errors": [
+                {"code": "REQUIRED_FIELD_EMPTY", "field": "email", "message": "should be an email"}]}
+        return 200, {"next": "https://formspree.io/thanks", "ok": True}
+
+    # Log storage
+
+    def add_log(self, log_type: str, message: str, data: Any = None) -> Dict[str, Any]:
+        return self.add_logs([{"type": log_type, "message": message, "data": data}])[0]
+
+    def add_logs(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append entries (oldest first) under one lock, like the route's log_batch"""
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        added = []
+        with self.new_log:
+            for entry in entries:
+                self.last_log_id = max(int(time.time() * 1000), self.last_log_id + 1)
+                added.append({
+                    "id": str(self.last_log_id),
+                    "timestamp": timestamp,
+                    "type": entry["type"],
+                    "message": entry["message"],
+                    "data": entry.get("data"),
+                })
+            self.logs[:0] = reversed(added)
+            del self.logs[self.max_logs:]
+            self.new_log.notify_all()
+        return added
+
+    def logs_since(self, since_id: Any) -> List[Dict[str, Any]]:
+        """Entries newer than the cursor, oldest first"""
+        cursor = int(since_id or 0)
+        newer = []
+        for log in self.logs:
+            if int(log["id"]) <= cursor:
+                break
+            newer.append(log)
+        newer.reverse()
+        return newer
+
+    def get_logs(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """One page of logs, with the same cursor protocol as the debug-server route"""
+        with self.lock:
+            logs = list(self.logs)
+        latest_id = logs[0]["id"] if logs else None
+        page_size = min(max(int(data.get("page_size") or data.get("limit") or 100), 1), MAX_PAGE_SIZE)
+
+        log_filter = data.get("filter") or {}
+        if log_filter.get("type"):
+            logs = [log for log in logs if log["type"] == log_filter["type"]]
+        if log_filter.get("search"):
+            term = log_filter["search"].lower()
+            logs = [log for log in logs
+                    if term in (log.get("message") or "").lower() or term in (log.get("type") or "").lower()]
+
+        after_id = data.get("after_id", data.get("since_id"))
+        if after_id is not None:
+            # Entries newer than the cursor, oldest first
+            cursor = int(after_id or 0)
+            entries = [log for log in reversed(logs) if int(log["id"]) > cursor]
+        elif data.get("before_id") is not None:
+            cursor = int(data["before_id"] or 0)
+            entries = [log for log in logs if int(log["id"]) < cursor]
+        else:
+            entries = logs
+
+        page = entries[:page_size]
+        has_more = len(entries) > page_size
+        response = {
+            "logs": project_logs(page, data.get("fields")),
+            "has_more": has_more,
+            "next_cursor": page[-1]["id"] if has_more else None,
+            "latest_id": latest_id,
+        }
+        if after_id is None:
+            response["server_info"] = self.server_info
+        return response
+
+    def clear_logs(self) -> None:
+        with self.lock:
+            self.logs = []
+            self.server_info["last_cleared"] = datetime.now(timezone.utc).isoformat()
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "MockFormServer/1.0"
+
+    @property
+    def state(self) -> MockServerState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_payload(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+
+    def send_encoded(self, status: int, body: Any) -> None:
+        """Send JSON or MessagePack, compressed if the client accepts it (see wire-format.ts)"""
+        use_msgpack = msgpack is not None and accepts(self.headers.get("Accept"), MSGPACK_TYPE)
+        payload = msgpack.packb(body) if use_msgpack else json.dumps(body).encode("utf-8")
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        accept_encoding = self.headers.get("Accept-Encoding")
+        if len(payload) >= MIN_COMPRESS_BYTES:
+            if brotli is not None and accepts(accept_encoding, "br"):
+                payload = brotli.compress(payload, quality=BROTLI_QUALITY)
+                headers["Content-Encoding"] = "br"
+            elif accepts(accept_encoding, "gzip"):
+                payload = gzip.compress(payload, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+        self.send_payload(status, payload, MSGPACK_TYPE if use_msgpack else "application/json", headers)
+
+    def send_payload(self, status: int, payload: bytes, content_type: str,
+                     headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if "application/x-www-form-urlencoded" in self.headers.get("Content-Type", ""):
+            return {key: values[-1] for key, values in parse_qs(raw.decode("utf-8")).items()}
+        return json.loads(raw or b"{}")
+
+    def inject_faults(self) -> bool:
+        """Apply latency/errors/throttling; returns True if the request was answered"""
+        delay, status = self.state.sample_faults()
+        if delay:
+            time.sleep(delay)
+        if status == 429:
+            self.send_json(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+            return True
+        if status:
+            self.send_json(status, {"error": "Injected server error"})
+            return True
+        return False
+
+    def authorized(self) -> bool:
+        return self.headers.get("Authorization", "") == f"Bearer {self.state.api_key}"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/api/debug-server":
+            if params.get("stream"):
+                if not self.authorized():
+                    return self.send_json(401, {"error": "Unauthorized"})
+                return self.stream_logs(self.headers.get("Last-Event-ID") or params.get("since_id") or "0")
+            if self.inject_faults():
+                return
+            return self.send_json(200, {
+                "status": "Debug server running",
+                "server_info": self.state.server_info,
+                "log_count": len(self.state.logs),
+            })
+        if url.path == "/api/debug/auto-test":
+            if self.inject_faults():
+                return
+            return self.handle_auto_test(params.get("test"))
+        if url.path == "/api/speed-test/download":
+            if self.inject_faults():
+                return
+            return self.speed_test_download(speed_test_size(params.get("size")))
+        self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/api/speed-test/upload":
+            return self.speed_test_upload()
+        try:
+            body = self.read_body()
+        except (ValueError, UnicodeDecodeError):
+            return self.send_json(400, {"error": "Invalid request body"})
+        if self.inject_faults():
+            return
+
+        if url.path == "/api/debug-server":
+            return self.handle_debug_server(body)
+        if url.path == "/api/form-submit":
+            form_data = body.get("form_data")
+            if not form_data:
+                return self.send_json(400, {"success": False, "error": "Missing form_data in request body"})
+            status, response = self.state.formspree_submit(form_data)
+            success = status < 300
+            return self.send_json(200, {
+                "success": success,
+                "status": status,
+                "message": "Form submitted successfully" if success else "Form submission failed",
+                "data": response,
+            })
+        if url.path == "/api/debug/form-proxy":
+            form_data = body.get("form_data")
+            if not form_data:
+                return self.send_json(400, {"error": "Missing form_data in request body"})
+            status, response = self.state.formspree_submit(form_data)
+            return self.send_json(status, {"success": status < 300, "status": status, "data": response})
+        if url.path == "/api/submit-contact":
+            if not body.get("email") or not body.get("message"):
+                return self.send_json(400, {"success": False, "message": "Missing required fields (email, message)"})
+            status, response = self.state.formspree_submit(body)
+            if status < 300:
+                return self.send_json(200, {"success": True, "message": "Form submitted successfully", "data": response})
+            return self.send_json(status, {"success": False, "message": "Form submission failed", "error": response})
+        if url.path.startswith("/f/"):
+            status, response = self.state.formspree_submit(body)
+            return self.send_json(status, response)
+        self.send_json(404, {"error": "Not found"})
+
+    def handle_debug_server(self, body: Dict[str, Any]) -> None:
+        if not self.authorized():
+            return self.send_json(401, {"error": "Unauthorized"})
+
+        action = body.get("action")
+        data = body.get("data")
+        if action == "log":
+            if not body.get("type") or not body.get("message"):
+                return self.send_json(400, {"error": "Missing required fields"})
+            self.state.add_log(body["type"], body["message"], data)
+            return self.send_json(200, {"success": True})
+        if action == "log_batch":
+            entries = body.get("entries")
+            if not isinstance(entries, list) or not entries:
+                return self.send_json(400, {"error": "Missing entries"})
+            if len(entries) > MAX_BATCH_SIZE:
+                return self.send_json(413, {"error": f"Too many entries (max {MAX_BATCH_SIZE})"})
+            valid = [entry for entry in entries if isinstance(entry, dict) and entry.get("type") and entry.get("message")]
+            self.state.add_logs(valid)
+            return self.send_json(200, {"success": True, "accepted": len(valid), "rejected": len(entries) - len(valid)})
+        if action == "get_logs":
+            return self.send_encoded(200, self.state.get_logs(data or {}))
+        if action == "clear_logs":
+            self.state.clear_logs()
+            return self.send_json(200, {"success": True})
+        if action == "test_formspree":
+            self.state.add_log("info", "Testing FormSpree connectivity", {"endpoint": "mock"})
+            status, response = self.state.formspree_submit({
+                "_test": True,
+                "name": "Debug Server Test",
+                "email": "test@debugserver.com",
+                "message": "This is a test submission from the debug server",
+            })
+            success = 200 <= status < 300
+            self.state.add_log("success" if success else "error", f"FormSpree test response: {status}",
+                               {"status": status, "body": response})
+            return self.send_json(200, {"success": success, "status": status, "response": response})
+        if action == "check_environment":
+            env_info = {
+                "node_version": f"python-{sys.version.split()[0]}",
+                "platform": sys.platform,
+                "arch": os.uname().machine if hasattr(os, "uname") else "unknown",
+                "env": "mock",
+                "uptime": time.time() - self.state.start_time,
+                "memory_usage": {},
+                "current_time": datetime.now(timezone.utc).isoformat(),
+                "process_id": os.getpid(),
+            }
+            self.state.add_log("info", "Environment check requested", env_info)
+            return self.send_json(200, {"success": True, "environment": env_info})
+        self.send_json(400, {"error": "Invalid action"})
+
+    def handle_auto_test(self, test_name: Optional[str]) -> None:
+        if test_name and test_name != "all" and test_name not in TEST_CASES:
+            return self.send_json(400, {
+                "error": f"Invalid test name. Available tests: {', '.join(TEST_CASES)}, or 'all'"})
+        names = [test_name] if test_name and test_name != "all" else list(TEST_CASES)
+        results = {}
+        for name in names:
+            status, response = self.state.formspree_submit(TEST_CASES[name])
+            results[name] = {"success": status < 300, "status": status, "response": response}
+        self.send_json(200, {"timestamp": datetime.now(timezone.utc).isoformat(), "results": results})
+
+    def speed_test_download(self, size: int) -> None:
+        block = speed_test_block()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        remaining = size
+        while remaining:
+            chunk = block[:min(remaining, SPEED_TEST_CHUNK)]
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+
+    def speed_test_upload(self) -> None:
+        """Drain the body through one reused buffer (the body is read before fault injection)"""
+        remaining = int(self.headers.get("Content-Length", 0))
+        view = memoryview(bytearray(min(remaining, SPEED_TEST_CHUNK)))
+        received = 0
+        while remaining:
+            read = self.rfile.readinto(view[:min(remaining, len(view))])
+            if not read:
+                break
+            received += read
+            remaining -= read
+        if remaining:
+            self.close_connection = True
+            return
+        if self.inject_faults():
+            return
+        self.send_json(200, {"success": True, "bytes": received})
+
+    def stream_logs(self, since_id: str) -> None:
+        """Serve new log entries as Server-Sent Events until the client disconnects"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(chunk: str) -> None:
+            payload = chunk.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+            self.wfile.flush()
+
+        cursor = since_id
+        try:
+            send("retry: 1000\n\n")
+            while not self.state.stopping:
+                with self.state.new_log:
+                    new_logs = self.state.logs_since(cursor)
+                    if not new_logs:
+                        self.state.new_log.wait(STREAM_HEARTBEAT)
+                        new_logs = self.state.logs_since(cursor)
+                if not new_logs:
+                    send(": heartbeat\n\n")
+                for log in new_logs:
+                    cursor = log["id"]
+                    send(f"id: {log['id']}\nevent: log\ndata: {json.dumps(log)}\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: MockServerState, verbose: bool = False):
+        super().__init__(address, MockRequestHandler)
+        self.state = state
+        self.verbose = verbose
+
+    def handle_error(self, request, client_address) -> None:
+        # Speed test clients hang up mid-transfer when their test duration ends
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def shutdown(self) -> None:
+        with self.state.new_log:
+            self.state.stopping = True
+            self.state.new_log.notify_all()
+        super().shutdown()
+
+def start_server(host: str = DEFAULT_HOST, port: int = 0, state: Optional[MockServerState] = None,
+                 verbose: bool = False) -> Tuple[MockServer, str]:
+    """Start the stand-in in a background thread and return it with its base URL.
+
+    Port 0 picks a free port.
+    """
+    server = MockServer((host, port), state or MockServerState(), verbose)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the debug server and FormSpree")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--latency", help="Added latency per request, e.g. normal:30:5")
+    parser.add_argument("--upstream-latency", help="Latency of simulated FormSpree calls")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that return 500")
+    parser.add_argument("--throttle", type=float, help="Requests per second before answering 429")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for reproducible runs")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="API key for the debug server")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+
+    try:
+        state = MockServerState(
+            latency=args.latency,
+            upstream_latency=args.upstream_latency,
+            error_rate=args.error_rate,
+            throttle=args.throttle,
+            seed=args.seed,
+            api_key=args.api_key,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = MockServer((args.host, args.port), state, args.verbose)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"{Colors.GREEN}Stand-in server listening on {base_url}{Colors.RESET}")
+    print(f"{Colors.GRAY}Point the scripts at it with: export {BASE_URL_ENV}={base_url} "
+          f"{FORMSPREE_URL_ENV}={base_url}{Colors.RESET}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Stand-in server stopped.{Colors.RESET}")
+    finally:
+        server.state.stopping = True
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
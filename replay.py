@@ -0,0 +1,313 @@
+"""
+Replay recorded form submissions for debug_client.py
+
+Rebuilds submissions from the debug log - the "Form submission attempt"
+entries form-debug.ts writes, each paired with the FormSpree response or
+error logged for the same form after it - and sends them again:
+
+  form-proxy   POST /api/debug/form-proxy, as the site's forms do (default)
+  form-submit  POST /api/form-submit
+  formspree    POST the form data straight to the FormSpree endpoint
+
+Submissions are sent at their original inter-arrival times (speed 1), N
+times faster (speed N) or as fast as possible (speed 0), with at most
+`concurrency` requests in flight, and each result is compared with the
+originally logged response. form-debug.ts logs the form proxy's whole body
+({success, status, data}), so the FormSpree response inside it is what gets
+compared, whichever target is replayed.
+
+  replayer = Replayer("http://127.0.0.1:8765", speed=10)
+  report = replayer.run(extract_submissions(logs))
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from instrumentation import LatencyHistogram, instrumented_session, timed
+from log_stats import parse_timestamp
+
+# Target name -> path on the site (None: the URL is the FormSpree endpoint itself)
+REPLAY_TARGETS = {
+    "form-proxy": "/api/debug/form-proxy",
+    "form-submit": "/api/form-submit",
+    "formspree": None,
+}
+DEFAULT_TARGET = "form-proxy"
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = (3.05, 30.0)  # connect, read seconds
+REPLAY_HEADER = "X-Form-Replay"  # carries the original log id
+MAX_VALUE_CHARS = 60
+
+class Submission:
+    """A logged form submission and, if it was logged, its original outcome"""
+
+    def __init__(self, log_id: str, timestamp: float, form_name: str, form_data: Dict[str, Any]):
+        self.log_id = log_id
+        self.timestamp = timestamp
+        self.form_name = form_name
+        self.form_data = form_data
+        self.status: Optional[int] = None
+        self.response: Any = None
+        self.error: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+
+    @property
+    def ok(self) -> Optional[bool]:
+        """Whether the original submission succeeded; None if no outcome was logged"""
+        if self.status is not None:
+            return self.status < 400
+        return False if self.error else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "log_id": self.log_id,
+            "timestamp": self.timestamp,
+            "form_name": self.form_name,
+            "status": self.status,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+        }
+
+def _log_id(log: Dict[str, Any]) -> int:
+    try:
+        return int(log.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def extract_submissions(logs: Iterable[Dict[str, Any]]) -> List[Submission]:
+    """Submissions found in log entries (any order), oldest first.
+
+    An attempt is paired with the first response or error logged after it
+    for the same form, so concurrent submissions of one form may be paired
+    out of order.
+    """
+    entries = sorted(
+        (log for log in logs if isinstance(log.get("data"), dict) and log["data"].get("form_name")),
+        key=_log_id,
+    )
+    submissions = []
+    pending: Dict[str, Deque[Submission]] = {}
+    for log in entries:
+        data = log["data"]
+        form_name = str(data["form_name"])
+        if isinstance(data.get("form_data"), dict):
+            timestamp = parse_timestamp(log.get("timestamp"))
+            if timestamp is None:
+                continue
+            submission = Submission(str(log.get("id")), timestamp, form_name, data["form_data"])
+            submissions.append(submission)
+            pending.setdefault(form_name, deque()).append(submission)
+            continue
+        waiting = pending.get(form_name)
+        if not waiting:
+            continue
+        if isinstance(data.get("status"), int):
+            submission = waiting.popleft()
+            submission.status = data["status"]
+            submission.response = proxy_payload(data.get("response_data"))
+            duration = data.get("duration_ms")
+            submission.duration_ms = float(duration) if isinstance(duration, (int, float)) else None
+        elif log.get("type") == "error" and data.get("error"):
+            waiting.popleft().error = str(data["error"])
+    return submissions
+
+def proxy_payload(body: Any) -> Any:
+    """FormSpree's response from a /api/debug/form-proxy body; other bodies as they are"""
+    if isinstance(body, dict) and "data" in body:
+        return body["data"]
+    return body
+
+def build_request(submission: Submission, target: str, url: str) -> Tuple[str, Dict[str, Any]]:
+    """(URL, JSON body) that re-sends a submission to the target"""
+    path = REPLAY_TARGETS[target]
+    if path is None:
+        return url, submission.form_data
+    return f"{url}{path}", {"form_data": submission.form_data, "form_name": submission.form_name}
+
+def response_outcome(target: str, response: requests.Response) -> Tuple[int, Any]:
+    """(FormSpree status, FormSpree response body) from a target's response"""
+    try:
+        body = response.json()
+    except ValueError:
+        body = {"raw_text": response.text}
+    if isinstance(body, dict):
+        # /api/form-submit always answers 200 and wraps FormSpree's status
+        if target == "form-submit" and isinstance(body.get("status"), int):
+            return body["status"], body.get("data")
+    if target == "form-proxy":
+        return response.status_code, proxy_payload(body)
+    return response.status_code, body
+
+def classify(original: Optional[bool], now: bool, same_status: bool) -> str:
+    if original is None:
+        return "new"
+    if original == now:
+        return "same" if same_status else "changed"
+    return "fixed" if now else "regressed"
+
+def _short(value: Any) -> str:
+    text = json.dumps(value, default=str) if value is not None else "-"
+    return text if len(text) <= MAX_VALUE_CHARS else text[:MAX_VALUE_CHARS - 3] + "..."
+
+def diff_responses(old: Any, new: Any) -> List[str]:
+    """Top-level differences between two response bodies, as 'key: old -> new' lines"""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        return [f"{key}: {_short(old.get(key))} -> {_short(new.get(key))}"
+                for key in sorted(set(old) | set(new), key=str) if old.get(key) != new.get(key)]
+    return [f"{_short(old)} -> {_short(new)}"]
+
+class ReplayResult:
+    """Outcome of re-sending one submission"""
+
+    def __init__(self, submission: Submission, status: Optional[int], response: Any,
+                 error: Optional[str], latency: float, lateness: float):
+        self.submission = submission
+        self.status = status
+        self.response = response
+        self.error = error
+        self.latency = latency
+        self.lateness = lateness  # seconds sent after the scheduled time
+        self.ok = status is not None and status < 400
+        self.outcome = classify(submission.ok, self.ok, status == submission.status)
+        self.diff = diff_responses(submission.response, response) if submission.response is not None and not error else []
+
+    @property
+    def transition(self) -> str:
+        before = submission_label(self.submission.status, self.submission.error)
+        return f"{before} -> {submission_label(self.status, self.error)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "log_id": self.submission.log_id,
+            "form_name": self.submission.form_name,
+            "original_status": self.submission.status,
+            "original_error": self.submission.error,
+            "status": self.status,
+            "error": self.error,
+            "outcome": self.outcome,
+            "latency": self.latency,
+            "diff": self.diff,
+        }
+
+def submission_label(status: Optional[int], error: Optional[str]) -> str:
+    if status is not None:
+        return str(status)
+    return "error" if error else "?"
+
+class Replayer:
+    """Re-sends submissions to a target with the chosen pacing and collects results"""
+
+    def __init__(self, url: str, target: str = DEFAULT_TARGET, speed: float = 1.0,
+                 concurrency: int = DEFAULT_CONCURRENCY, max_gap: Optional[float] = None,
+                 on_result: Optional[Callable[[ReplayResult], None]] = None):
+        self.url = url.rstrip("/")
+        self.target = target
+        self.speed = speed
+        self.concurrency = concurrency
+        self.max_gap = max_gap
+        self.on_result = on_result
+        self.lock = threading.Lock()
+        self.histogram = LatencyHistogram()
+        self.results: List[ReplayResult] = []
+        self.max_lateness = 0.0
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+
+    def _session(self) -> requests.Session:
+        # One session per worker thread so connections are reused without sharing
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = instrumented_session()
+            with self.lock:
+                self._sessions.append(session)
+        return session
+
+    def schedule(self, submissions: List[Submission]) -> List[float]:
+        """Send offsets in seconds from the start; gaps are divided by speed and capped at max_gap"""
+        offsets = [0.0] * len(submissions)
+        for i in range(1, len(submissions)):
+            gap = max(submissions[i].timestamp - submissions[i - 1].timestamp, 0.0) / self.speed
+            if self.max_gap is not None:
+                gap = min(gap, self.max_gap)
+            offsets[i] = offsets[i - 1] + gap
+        return offsets
+
+    def send(self, submission: Submission, scheduled: float) -> ReplayResult:
+        url, body = build_request(submission, self.target, self.url)
+        started = time.perf_counter()
+        status, response, error = None, None, None
+        try:
+            with timed(f"replay.{self.target}") as timing:
+                http_response = timing.set_response(self._session().post(
+                    url, json=body, headers={REPLAY_HEADER: submission.log_id}, timeout=REQUEST_TIMEOUT))
+            status, response = response_outcome(self.target, http_response)
+        except requests.exceptions.RequestException as e:
+            error = f"{type(e).__name__}: {e}"
+        result = ReplayResult(submission, status, response, error,
+                              time.perf_counter() - started, max(started - scheduled, 0.0))
+        with self.lock:
+            self.histogram.record(result.latency)
+            self.results.append(result)
+            self.max_lateness = max(self.max_lateness, result.lateness)
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    def run(self, submissions: List[Submission]) -> Dict[str, Any]:
+        """Replay submissions (oldest first) and return the report"""
+        offsets = self.schedule(submissions) if self.speed else None
+        slots = threading.BoundedSemaphore(self.concurrency)
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="replay") as pool:
+                for i, submission in enumerate(submissions):
+                    scheduled = start + offsets[i] if offsets else time.perf_counter()
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    # Wait for a free slot so at most `concurrency` requests are queued or in flight
+                    slots.acquire()
+                    pool.submit(self.send, submission, scheduled).add_done_callback(lambda _: slots.release())
+        finally:
+            for session in self._sessions:
+                session.close()
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        results = sorted(self.results, key=lambda result: _log_id({"id": result.submission.log_id}))
+        original = LatencyHistogram()
+        for result in results:
+            if result.submission.duration_ms is not None:
+                original.record(result.submission.duration_ms / 1000)
+        return {
+            "target": self.target,
+            "url": self.url,
+            "speed": self.speed,
+            "concurrency": self.concurrency,
+            "requests": len(results),
+            "duration": elapsed,
+            "throughput": len(results) / elapsed if elapsed else 0.0,
+            "failed": sum(1 for result in results if not result.ok),
+            "outcomes": dict(Counter(result.outcome for result in results)),
+            "transitions": dict(Counter(result.transition for result in results).most_common()),
+            "latency": latency_summary(self.histogram),
+            "original_latency": latency_summary(original) if original.total else None,
+            "max_lateness": self.max_lateness if self.speed else None,
+            "results": [result.to_dict() for result in results],
+        }
+
+def latency_summary(histogram: LatencyHistogram) -> Dict[str, float]:
+    return {
+        "p50": histogram.percentile(50),
+        "p90": histogram.percentile(90),
+        "p99": histogram.percentile(99),
+        "max": histogram.max / 1_000_000,
+    }
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Hosting Speed Test Client
+
+Scripted counterpart of the website's SpeedTest component. Measures idle
+latency against /api/speed-test/download, then runs N parallel download
+and/or upload streams for a fixed duration and reports per-stream and
+aggregate throughput, time to first byte and jitter.
+
+Each stream keeps one connection and one preallocated buffer: downloads
+are read with readinto() into a reused memoryview, uploads send slices of
+one shared random payload, so the client copies nothing per request and
+isn't the bottleneck. The report includes the client's CPU use to check
+(with --local it includes the in-process stand-in).
+
+TTFB is measured from sending a download request to its response headers,
+and from the last uploaded byte to the upload's response. Jitter is the
+mean difference between consecutive TTFBs (or pings).
+
+Usage:
+  python speed_test_client.py [--url URL] [--streams N] [--duration S] [--direction DIR]
+
+Options:
+  --url URL           Base URL of the website (default: $FORM_TOOLS_BASE_URL or http://localhost:3000)
+  --streams N         Parallel streams per direction (default: 4)
+  --duration S        Seconds per direction; transfers still running are cut off (default: 10)
+  --direction DIR     download, upload or both (default: both)
+  --download-size B   Bytes per download request (default and maximum: 5 MB, the component's size)
+  --upload-size B     Bytes per upload request (default: 1 MB, the component's size)
+  --chunk-size B      Read/send buffer size per stream (default: 256 KB)
+  --pings N           Idle latency samples before the streams start (default: 10)
+  --local             Start a local stand-in server (mock_server.py) and target it (no network)
+  --json              Output the report as JSON
+
+Examples:
+  python speed_test_client.py --local --duration 3
+  python speed_test_client.py --url https://example.com --streams 8 --direction download
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from mock_server import start_server
+
+# ANSI color codes for terminal output
+class Colors:
+    RESET = "\033[0m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    PURPLE = "\033[95m"
+    CYAN = "\033[96m"
+    GRAY = "\033[90m"
+    BOLD = "\033[1m"
+
+# FORM_TOOLS_BASE_URL points every script at another deployment or a local stand-in (mock_server.py)
+DEFAULT_URL = os.environ.get("FORM_TOOLS_BASE_URL", "http://localhost:3000").rstrip("/")
+DOWNLOAD_PATH = "/api/speed-test/download"
+UPLOAD_PATH = "/api/speed-test/upload"
+DEFAULT_STREAMS = 4
+DEFAULT_DURATION = 10.0  # seconds per direction
+DEFAULT_DOWNLOAD_SIZE = 5 * 1024 * 1024  # speedTestConfig.downloadFileSize
+DEFAULT_UPLOAD_SIZE = 1 * 1024 * 1024  # speedTestConfig.uploadFileSize
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_PINGS = 10
+CONNECT_TIMEOUT = 10.0  # seconds, also the socket read timeout
+CLIENT_CPU_WARNING = 0.8  # fraction of one core (the GIL) above which results may be client-bound
+
+class SpeedTestError(Exception):
+    pass
+
+class StreamResult:
+    """Bytes moved and TTFB samples of one stream"""
+
+    def __init__(self, stream: int, direction: str):
+        self.stream = stream
+        self.direction = direction
+        self.bytes = 0
+        self.requests = 0
+        self.ttfbs: List[float] = []
+        self.started = 0.0
+        self.finished = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        return max(self.finished - self.started, 1e-9)
+
+    @property
+    def mbps(self) -> float:
+        return self.bytes * 8 / self.elapsed / 1e6
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "stream": self.stream,
+            "bytes": self.bytes,
+            "requests": self.requests,
+            "seconds": round(self.elapsed, 3),
+            "mbps": round(self.mbps, 2),
+            "ttfb": median(self.ttfbs),
+            "jitter": jitter(self.ttfbs),
+            "error": self.error,
+        }
+
+def median(samples: List[float]) -> Optional[float]:
+    return statistics.median(samples) if samples else None
+
+def jitter(samples: List[float]) -> Optional[float]:
+    """Mean absolute difference between consecutive samples (as RFC 3550 interarrival jitter)"""
+    if len(samples) < 2:
+        return None
+    return sum(abs(b - a) for a, b in zip(samples, samples[1:])) / (len(samples) - 1)
+
+def connect(base_url: str) -> http.client.HTTPConnection:
+    url = urlparse(base_url)
+    conn_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = conn_class(url.netloc, timeout=CONNECT_TIMEOUT)
+    conn.connect()
+    return conn
+
+def url_path(base_url: str, path: str) -> str:
+    return urlparse(base_url).path.rstrip("/") + path
+
+def check_status(response: http.client.HTTPResponse) -> None:
+    if response.status != 200:
+        body = response.read(200).decode("utf-8", "replace")
+        raise SpeedTestError(f"HTTP {response.status}: {body}")
+
+def download_once(conn: http.client.HTTPConnection, path: str, view: memoryview,
+                  deadline: float, result: StreamResult) -> bool:
+    """One download into the reused buffer; returns False if the deadline cut it off"""
+    start = time.perf_counter()
+    conn.putrequest("GET", path, skip_accept_encoding=True)
+    conn.putheader("Accept-Encoding", "identity")
+    conn.putheader("Cache-Control", "no-cache")
+    conn.endheaders()
+    response = conn.getresponse()
+    result.ttfbs.append(time.perf_counter() - start)
+    check_status(response)
+    while True:
+        read = response.readinto(view)
+        if not read:
+            break
+        result.bytes += read
+        if time.perf_counter() >= deadline:
+            return False
+    result.requests += 1
+    return True
+
+def upload_once(conn: http.client.HTTPConnection, path: str, payload: memoryview, chunk_size: int,
+                deadline: float, result: StreamResult) -> bool:
+    """One upload of the shared payload in chunk_size slices; returns False if the deadline cut it off"""
+    conn.putrequest("POST", path, skip_accept_encoding=True)
+    conn.putheader("Content-Type", "application/octet-stream")
+    conn.putheader("Content-Length", str(len(payload)))
+    conn.endheaders()
+    for offset in range(0, len(payload), chunk_size):
+        chunk = payload[offset:offset + chunk_size]
+        conn.send(chunk)
+        result.bytes += len(chunk)
+        if time.perf_counter() >= deadline:
+            return False
+    sent = time.perf_counter()
+    response = conn.getresponse()
+    result.ttfbs.append(time.perf_counter() - sent)
+    check_status(response)
+    response.read()
+    result.requests += 1
+    return True
+
+def run_stream(base_url: str, direction: str, result: StreamResult, start: threading.Barrier, duration: float,
+               size: int, chunk_size: int, payload: memoryview) -> None:
+    conn = None
+    try:
+        conn = connect(base_url)
+    except OSError as e:
+        result.error = str(e)
+    start.wait()
+    if conn is None:
+        return
+
+    view = memoryview(bytearray(chunk_size))
+    result.started = time.perf_counter()
+    deadline = result.started + duration
+    try:
+        if direction == "download":
+            path = f"{url_path(base_url, DOWNLOAD_PATH)}?size={size}"
+            while time.perf_counter() < deadline and download_once(conn, path, view, deadline, result):
+                pass
+        else:
+            path = url_path(base_url, UPLOAD_PATH)
+            while time.perf_counter() < deadline and upload_once(conn, path, payload, chunk_size, deadline, result):
+                pass
+    except (OSError, http.client.HTTPException, SpeedTestError) as e:
+        result.error = str(e) or type(e).__name__
+    finally:
+        result.finished = time.perf_counter()
+        conn.close()
+
+def run_direction(base_url: str, direction: str, streams: int, duration: float, size: int,
+                  chunk_size: int) -> Dict[str, Any]:
+    """Run `streams` parallel streams in one direction and aggregate them"""
+    # One random payload shared read-only by every upload stream
+    payload = memoryview(os.urandom(size) if direction == "upload" else b"")
+    results = [StreamResult(index + 1, direction) for index in range(streams)]
+    start = threading.Barrier(streams + 1)
+    threads = [threading.Thread(target=run_stream, daemon=True,
+                                args=(base_url, direction, result, start, duration, size, chunk_size, payload))
+               for result in results]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for thread in threads:
+        thread.join()
+    wall = max(time.perf_counter() - wall_start, 1e-9)
+    cpu = time.process_time() - cpu_start
+
+    ttfbs = [ttfb for result in results for ttfb in result.ttfbs]
+    jitters = [value for value in (jitter(result.ttfbs) for result in results) if value is not None]
+    total = sum(result.bytes for result in results)
+    return {
+        "direction": direction,
+        "streams": [result.report() for result in results],
+        "bytes": total,
+        "seconds": round(wall, 3),
+        "mbps": round(total * 8 / wall / 1e6, 2),
+        "ttfb": median(ttfbs),
+        "jitter": statistics.mean(jitters) if jitters else None,
+        "client_cpu": round(cpu / wall, 3),
+        "errors": sum(1 for result in results if result.error),
+    }
+
+def measure_latency(base_url: str, pings: int) -> Dict[str, Any]:
+    """Sequential empty downloads on one warm connection"""
+    samples: List[float] = []
+    conn = connect(base_url)
+    try:
+        result = StreamResult(0, "ping")
+        path = f"{url_path(base_url, DOWNLOAD_PATH)}?size=0"
+        view = memoryview(bytearray(1))
+        download_once(conn, path, view, float("inf"), result)  # warm up
+        result.ttfbs.clear()
+        for _ in range(pings):
+            download_once(conn, path, view, float("inf"), result)
+        samples = result.ttfbs
+    finally:
+        conn.close()
+    return {
+        "samples": len(samples),
+        "min": min(samples) if samples else None,
+        "median": median(samples),
+        "jitter": jitter(samples),
+    }
+
+def format_ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
+
+def display_report(report: Dict[str, Any]) -> None:
+    print(f"\n{Colors.BOLD}Speed Test Results - {report['url']}{Colors.RESET}")
+    print("=" * 80)
+    latency = report.get("latency")
+    if latency:
+        print(f"  Latency:  min {format_ms(latency['min'])}, median {format_ms(latency['median'])}, "
+              f"jitter {format_ms(latency['jitter'])} ({latency['samples']} pings)")
+    for phase in report["phases"]:
+        print(f"\n{Colors.BOLD}{phase['direction'].capitalize()} - {len(phase['streams'])} streams, "
+              f"{phase['seconds']:.2f}s{Colors.RESET}")
+        print(f"  {'Stream':>6}  {'Mbps':>10}  {'MB':>9}  {'Requests':>8}  {'TTFB':>9}  {'Jitter':>9}")
+        for stream in phase["streams"]:
+            line = (f"  {stream['stream']:>6}  {stream['mbps']:>10.2f}  {stream['bytes'] / 1e6:>9.1f}  "
+                    f"{stream['requests']:>8}  {format_ms(stream['ttfb']):>9}  {format_ms(stream['jitter']):>9}")
+            if stream["error"]:
+                line += f"  {Colors.RED}{stream['error']}{Colors.RESET}"
+            print(line)
+        print(f"  {'Total':>6}  {Colors.CYAN}{phase['mbps']:>10.2f}{Colors.RESET}  {phase['bytes'] / 1e6:>9.1f}  "
+              f"{sum(s['requests'] for s in phase['streams']):>8}  {format_ms(phase['ttfb']):>9}  "
+              f"{format_ms(phase['jitter']):>9}")
+        if report["local"]:
+            print(f"  {Colors.GRAY}Client and stand-in CPU: {phase['client_cpu'] * 100:.0f}% of one core{Colors.RESET}")
+        elif phase["client_cpu"] > CLIENT_CPU_WARNING:
+            print(f"  {Colors.YELLOW}Client CPU: {phase['client_cpu'] * 100:.0f}% of one core "
+                  f"(the client may be the bottleneck){Colors.RESET}")
+        else:
+            print(f"  {Colors.GRAY}Client CPU: {phase['client_cpu'] * 100:.0f}% of one core{Colors.RESET}")
+    print("-" * 80)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hosting Speed Test Client")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Base URL of the website")
+    parser.add_argument("--streams", type=int, default=DEFAULT_STREAMS, help="Parallel streams per direction")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds per direction")
+    parser.add_argument("--direction", choices=["download", "upload", "both"], default="both",
+                        help="Directions to test")
+    parser.add_argument("--download-size", type=int, default=DEFAULT_DOWNLOAD_SIZE, help="Bytes per download request (at most 5 MB)")
+    parser.add_argument("--upload-size", type=int, default=DEFAULT_UPLOAD_SIZE, help="Bytes per upload request")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Read/send buffer size per stream")
+    parser.add_argument("--pings", type=int, default=DEFAULT_PINGS, help="Idle latency samples (0 to skip)")
+    parser.add_argument("--local", action="store_true", help="Start a local stand-in server and target it")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+
+    args = parser.parse_args()
+    if args.streams < 1 or args.chunk_size < 1:
+        parser.error("--streams and --chunk-size must be at least 1")
+    if args.download_size > DEFAULT_DOWNLOAD_SIZE:
+        parser.error(f"--download-size can be at most {DEFAULT_DOWNLOAD_SIZE} (the route's cap); "
+                     "add --streams or --duration for more volume")
+
+    base_url = args.url.rstrip("/")
+    server = None
+    if args.local:
+        server, base_url = start_server()
+
+    directions = ["download", "upload"] if args.direction == "both" else [args.direction]
+    report: Dict[str, Any] = {"url": base_url, "local": args.local, "phases": []}
+    try:
+        if args.pings:
+            report["latency"] = measure_latency(base_url, args.pings)
+        for direction in directions:
+            if not args.json:
+                print(f"{Colors.BLUE}Testing {direction} from {base_url} with {args.streams} streams "
+                      f"for {args.duration:g}s...{Colors.RESET}")
+            size = args.download_size if direction == "download" else args.upload_size
+            report["phases"].append(run_direction(base_url, direction, args.streams, args.duration,
+                                                  size, args.chunk_size))
+    except (OSError, http.client.HTTPException, SpeedTestError) as e:
+        print(f"{Colors.RED}Speed test failed: {e}{Colors.RESET}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Speed test interrupted.{Colors.RESET}")
+        sys.exit(130)
+    finally:
+        if server:
+            server.shutdown()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        display_report(report)
+
+    sys.exit(0 if all(phase["bytes"] and not phase["errors"] for phase in report["phases"]) else 1)
+
+if __name__ == "__main__":
+    main()
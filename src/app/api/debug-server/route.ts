@@ -1,73 +1,78 @@
 import { NextResponse } from "next/server";
+import { EventEmitter } from "events";
 import fs from "fs";
 import path from "path";
+import {
+  LogPage,
+  LogStore,
+  logStoreOptions,
+  projectLog,
+  selectedFields,
+} from "@/lib/log-store";
+import { encodedResponse } from "@/lib/wire-format";
 
-// Path to debug log file
-const DEBUG_LOG_FILE = path.join(process.cwd(), "debug-server-log.json");
+// Directory of the append-only log store (see src/lib/log-store.ts)
+const DEBUG_LOG_DIR =
+  process.env.DEBUG_LOG_DIR || path.join(process.cwd(), "debug-server-logs");
 
-// Initialize log file if it doesn't exist
+// Single-file log from before the segment store, imported once on startup
+const LEGACY_LOG_FILE = path.join(process.cwd(), "debug-server-log.json");
+
+// Heartbeat interval for log streams (keeps proxies from closing idle streams)
+const STREAM_HEARTBEAT_MS = 15000;
+
+// How often streams check the store for entries written by other workers
+const STREAM_FILE_CHECK_MS = 1000;
+
+// Notifies open log streams in this process when a new entry is written
+const logEvents = new EventEmitter();
+logEvents.setMaxListeners(0);
+
+// Largest page a single get_logs request may return
+const MAX_PAGE_SIZE = 500;
+
+// Most entries a single log_batch request may append
+const MAX_BATCH_SIZE = 500;
+
+const store = new LogStore(logStoreOptions(DEBUG_LOG_DIR));
+
+// Initialize server info and import the legacy log file if there is one
 try {
-  if (!fs.existsSync(DEBUG_LOG_FILE)) {
-    fs.writeFileSync(
-      DEBUG_LOG_FILE,
-      JSON.stringify({
-        logs: [],
-        server_info: {
-          start_time: new Date().toISOString(),
-          environment: process.env.NODE_ENV || "development",
-          version: "1.0.0",
-        },
-      }),
-      "utf8",
-    );
+  const meta = store.readMeta();
+  if (!meta.start_time) {
+    store.writeMeta({
+      start_time: new Date().toISOString(),
+      environment: process.env.NODE_ENV || "development",
+      version: "1.0.0",
+      ...meta,
+    });
   }
-} catch (error) {
-  console.error("Error initializing debug log file:", error);
-}
-
-// Helper function to read logs
-function readLogs() {
-  try {
-    const data = fs.readFileSync(DEBUG_LOG_FILE, "utf8");
-    return JSON.parse(data);
-  } catch (error) {
-    console.error("Error reading debug logs:", error);
-    return { logs: [], server_info: {} };
+  if (fs.existsSync(LEGACY_LOG_FILE) && store.latestId() === null) {
+    const legacy = JSON.parse(fs.readFileSync(LEGACY_LOG_FILE, "utf8"));
+    store.write((legacy.logs || []).slice().reverse());
+    fs.renameSync(LEGACY_LOG_FILE, `${LEGACY_LOG_FILE}.migrated`);
   }
+} catch (error) {
+  console.error("Error initializing debug log store:", error);
 }
 
-// Helper function to write logs
-function writeLogs(logs: any) {
+// Append entries (oldest first) to the log store; returns the number written
+function addLogEntries(
+  entries: { type: string; message: string; data?: any }[],
+) {
   try {
-    fs.writeFileSync(DEBUG_LOG_FILE, JSON.stringify(logs, null, 2), "utf8");
+    store.append(entries);
+    logEvents.emit("log");
+    return entries.length;
   } catch (error) {
-    console.error("Error writing debug logs:", error);
+    console.error("Error adding log entries:", error);
+    return 0;
   }
 }
 
 // Function to add a log entry
 function addLogEntry(type: string, message: string, data: any = null) {
-  try {
-    const logs = readLogs();
-    logs.logs.unshift({
-      id: Date.now().toString(),
-      timestamp: new Date().toISOString(),
-      type,
-      message,
-      data,
-    });
-
-    // Keep only the latest 500 logs
-    if (logs.logs.length > 500) {
-      logs.logs = logs.logs.slice(0, 500);
-    }
-
-    writeLogs(logs);
-    return true;
-  } catch (error) {
-    console.error("Error adding log entry:", error);
-    return false;
-  }
+  return addLogEntries([{ type, message, data }]) === 1;
 }
 
 // Debug server endpoint - handles both log retrieval and adding new logs
@@ -84,7 +89,7 @@ export async function POST(request: Request) {
 
     // Parse request body
     const body = await request.json();
-    const { action, type, message, data } = body;
+    const { action, type, message, data, entries } = body;
 
     // Add request metadata to logs
     console.log(`Debug server: ${action} request received`);
@@ -100,38 +105,73 @@ export async function POST(request: Request) {
 
       const success = addLogEntry(type, message, data);
       return NextResponse.json({ success });
-    } else if (action === "get_logs") {
-      // Retrieve logs with optional filtering
-      const logs = readLogs();
-
-      // Filter logs if filter is provided
-      if (data?.filter) {
-        const filter = data.filter;
-        const limit = data.limit || 100;
-
-        if (filter.type) {
-          logs.logs = logs.logs.filter((log: any) => log.type === filter.type);
-        }
+    } else if (action === "log_batch") {
+      // Add many entries (oldest first) with one write of the log file
+      if (!Array.isArray(entries) || entries.length === 0) {
+        return NextResponse.json({ error: "Missing entries" }, { status: 400 });
+      }
+      if (entries.length > MAX_BATCH_SIZE) {
+        return NextResponse.json(
+          { error: `Too many entries (max ${MAX_BATCH_SIZE})` },
+          { status: 413 },
+        );
+      }
 
-        if (filter.search) {
-          const searchTerm = filter.search.toLowerCase();
-          logs.logs = logs.logs.filter(
-            (log: any) =>
-              (log.message && log.message.toLowerCase().includes(searchTerm)) ||
-              (log.type && log.type.toLowerCase().includes(searchTerm)),
-          );
-        }
+      const valid = entries.filter(
+        (entry: any) => entry && entry.type && entry.message,
+      );
+      const accepted = valid.length ? addLogEntries(valid) : 0;
+      return NextResponse.json({
+        success: accepted === valid.length,
+        accepted,
+        rejected: entries.length - valid.length,
+      });
+    } else if (action === "get_logs") {
+      // Retrieve one page of logs with optional filtering. Pages are the
+      // bulk of the traffic, so they honour fields (projection), Accept
+      // (JSON or MessagePack) and Accept-Encoding (brotli or gzip).
+      const latestId = store.latestId();
+      const pageSize = Math.min(
+        Math.max(Number(data?.page_size ?? data?.limit) || 100, 1),
+        MAX_PAGE_SIZE,
+      );
+      const fields = selectedFields(data?.fields);
+      const project = (page: LogPage) =>
+        fields
+          ? { ...page, logs: page.logs.map((log) => projectLog(log, fields)) }
+          : page;
 
-        logs.logs = logs.logs.slice(0, limit);
+      // after_id (or the older since_id): entries newer than the cursor,
+      // oldest first
+      const afterId = data?.after_id ?? data?.since_id;
+      if (afterId !== undefined && afterId !== null) {
+        return encodedResponse(request, {
+          ...project(
+            store.page({ afterId, limit: pageSize, filter: data?.filter }),
+          ),
+          latest_id: latestId,
+        });
       }
 
-      return NextResponse.json(logs);
+      // Otherwise newest first, optionally starting below before_id
+      return encodedResponse(request, {
+        ...project(
+          store.page({
+            beforeId: data?.before_id,
+            limit: pageSize,
+            filter: data?.filter,
+          }),
+        ),
+        latest_id: latestId,
+        server_info: store.readMeta(),
+      });
     } else if (action === "clear_logs") {
       // Clear all logs
-      const logs = readLogs();
-      logs.logs = [];
-      logs.server_info.last_cleared = new Date().toISOString();
-      writeLogs(logs);
+      store.clear();
+      store.writeMeta({
+        ...store.readMeta(),
+        last_cleared: new Date().toISOString(),
+      });
       return NextResponse.json({ success: true });
     } else if (action === "test_formspree") {
       // Test FormSpree connectivity
@@ -216,17 +256,100 @@ export async function POST(request: Request) {
   }
 }
 
-// Simple GET endpoint to check if debug server is running
-export async function GET() {
+// Server-Sent Events stream of new log entries, starting after since_id
+function streamLogs(request: Request, sinceId: string) {
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream({
+    start(controller) {
+      let cursor = Number(sinceId) || 0;
+      let closed = false;
+
+      const send = (chunk: string) => {
+        if (!closed) {
+          controller.enqueue(encoder.encode(chunk));
+        }
+      };
+
+      // Push every entry newer than the cursor
+      const flush = () => {
+        for (const log of store.entriesAfter(cursor)) {
+          cursor = Number(log.id);
+          send(`id: ${log.id}\nevent: log\ndata: ${JSON.stringify(log)}\n\n`);
+        }
+      };
+
+      // Pick up entries written by other server processes
+      const checkFile = () => {
+        try {
+          if (Number(store.latestId()) > cursor) {
+            flush();
+          }
+        } catch {}
+      };
+
+      const fileTimer = setInterval(checkFile, STREAM_FILE_CHECK_MS);
+      const heartbeatTimer = setInterval(
+        () => send(": heartbeat\n\n"),
+        STREAM_HEARTBEAT_MS,
+      );
+      logEvents.on("log", flush);
+
+      cleanup = () => {
+        if (closed) return;
+        closed = true;
+        clearInterval(fileTimer);
+        clearInterval(heartbeatTimer);
+        logEvents.off("log", flush);
+        try {
+          controller.close();
+        } catch {}
+      };
+      request.signal.addEventListener("abort", cleanup);
+
+      send(`retry: 1000\n\n`);
+      flush();
+    },
+    cancel() {
+      cleanup();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache, no-transform",
+      Connection: "keep-alive",
+      "X-Accel-Buffering": "no",
+    },
+  });
+}
+
+// Simple GET endpoint to check if debug server is running.
+// With ?stream=1 it serves a Server-Sent Events stream of new log entries.
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url);
+  if (searchParams.get("stream")) {
+    const apiKey = process.env.DEBUG_API_KEY || "debug-server-key";
+    if (request.headers.get("authorization") !== `Bearer ${apiKey}`) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+    }
+    const sinceId =
+      request.headers.get("last-event-id") ||
+      searchParams.get("since_id") ||
+      "0";
+    return streamLogs(request, sinceId);
+  }
+
   try {
     // Log the request for debugging
     console.log("Debug server GET request received");
 
-    const logs = readLogs();
     return NextResponse.json({
       status: "Debug server running",
-      server_info: logs.server_info,
-      log_count: logs.logs.length,
+      server_info: store.readMeta(),
+      log_count: store.count(),
     });
   } catch (error) {
     console.error("Error in debug server GET route:", error);
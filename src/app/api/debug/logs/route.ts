@@ -1,21 +1,34 @@
 import { NextResponse } from "next/server";
 import fs from "fs";
 import path from "path";
+import { LogStore, logStoreOptions } from "@/lib/log-store";
 
-// Path to log file
+// Path to log file (submissions and stats written by /api/form-submit)
 const LOG_FILE = path.join(process.cwd(), "form-submissions-log.json");
 
+// Log store written by the /api/debug proxy
+const PROXY_LOG_DIR = path.join(process.cwd(), "form-proxy-logs");
+
+const store = new LogStore(logStoreOptions(PROXY_LOG_DIR));
+
+// Entries returned from the proxy store (and the file's older proxy logs)
+const MAX_LOGS = 100;
+
 // Endpoint to get logs
 export async function GET() {
   try {
-    if (!fs.existsSync(LOG_FILE)) {
-      return NextResponse.json({ logs: [] });
-    }
+    const file = fs.existsSync(LOG_FILE)
+      ? JSON.parse(fs.readFileSync(LOG_FILE, "utf8"))
+      : {};
 
-    const data = fs.readFileSync(LOG_FILE, "utf8");
-    const logs = JSON.parse(data);
+    // Proxy logs now live in the store; ones logged to the file before it
+    // are listed after them
+    const logs = [
+      ...store.page({ limit: MAX_LOGS }).logs,
+      ...(file.logs || []),
+    ];
 
-    return NextResponse.json(logs);
+    return NextResponse.json({ ...file, logs: logs.slice(0, MAX_LOGS) });
   } catch (error) {
     console.error("Error getting logs:", error);
     return NextResponse.json(
@@ -31,8 +44,22 @@ export async function GET() {
 // Endpoint to clear logs
 export async function DELETE() {
   try {
+    store.clear();
     if (fs.existsSync(LOG_FILE)) {
-      fs.writeFileSync(LOG_FILE, JSON.stringify({ logs: [] }), "utf8");
+      // Keep the shape /api/form-submit appends to
+      fs.writeFileSync(
+        LOG_FILE,
+        JSON.stringify({
+          submissions: [],
+          stats: {
+            total_submissions: 0,
+            successful_submissions: 0,
+            failed_submissions: 0,
+            last_submission: null,
+          },
+        }),
+        "utf8",
+      );
     }
 
     return NextResponse.json({ success: true });
@@ -1,55 +1,22 @@
 import { NextResponse } from "next/server";
-import fs from "fs";
 import path from "path";
+import { LogStore, logStoreOptions } from "@/lib/log-store";
 
-// Path to log file
-const LOG_FILE = path.join(process.cwd(), "form-submissions-log.json");
+// Append-only store for proxied submissions (read by /api/debug/logs)
+const PROXY_LOG_DIR = path.join(process.cwd(), "form-proxy-logs");
 
-// Initialize log file if it doesn't exist
-try {
-  if (!fs.existsSync(LOG_FILE)) {
-    fs.writeFileSync(LOG_FILE, JSON.stringify({ logs: [] }), "utf8");
-  }
-} catch (error) {
-  console.error("Error initializing log file:", error);
-}
-
-// Helper function to read logs
-function readLogs() {
-  try {
-    const data = fs.readFileSync(LOG_FILE, "utf8");
-    return JSON.parse(data);
-  } catch (error) {
-    console.error("Error reading logs:", error);
-    return { logs: [] };
-  }
-}
-
-// Helper function to write logs
-function writeLogs(logs: any) {
-  try {
-    fs.writeFileSync(LOG_FILE, JSON.stringify(logs, null, 2), "utf8");
-  } catch (error) {
-    console.error("Error writing logs:", error);
-  }
-}
+const store = new LogStore(logStoreOptions(PROXY_LOG_DIR));
 
 // Function to log a form submission
 function logSubmission(data: any) {
   try {
-    const logs = readLogs();
-    logs.logs.unshift({
-      id: Date.now().toString(),
-      timestamp: new Date().toISOString(),
-      data,
-    });
-
-    // Keep only the latest 100 logs
-    if (logs.logs.length > 100) {
-      logs.logs = logs.logs.slice(0, 100);
-    }
-
-    writeLogs(logs);
+    store.append([
+      {
+        type: data.type || "request",
+        message: data.method ? `${data.method} ${data.contentType}` : "",
+        data,
+      },
+    ]);
   } catch (error) {
     console.error("Error logging submission:", error);
   }
@@ -154,8 +121,7 @@ export async function POST(request: Request) {
 // Endpoint to get logs
 export async function GET() {
   try {
-    const logs = readLogs();
-    return NextResponse.json(logs);
+    return NextResponse.json({ logs: store.page({ limit: 100 }).logs });
   } catch (error) {
     console.error("Error getting logs:", error);
     return NextResponse.json({ error: "Error getting logs" }, { status: 500 });
@@ -1,20 +1,15 @@
 import { NextResponse } from "next/server";
+import { downloadBody, downloadSize } from "@/lib/speed-test-payload";
 
-export async function GET() {
-  // Generate a 5MB random data payload for download test
-  const size = 5 * 1024 * 1024; // 5MB in bytes
-  const buffer = new ArrayBuffer(size);
-  const view = new Uint8Array(buffer);
+export async function GET(request: Request) {
+  // 5MB of random data by default; scripted clients can ask for ?size=BYTES
+  const size = downloadSize(new URL(request.url).searchParams.get("size"));
 
-  // Fill with random data
-  for (let i = 0; i < size; i++) {
-    view[i] = Math.floor(Math.random() * 256);
-  }
-
-  return new NextResponse(buffer, {
+  return new NextResponse(downloadBody(size), {
     status: 200,
     headers: {
       "Content-Type": "application/octet-stream",
+      "Content-Length": String(size),
       "Cache-Control": "no-store, no-cache, must-revalidate, proxy-revalidate",
       Pragma: "no-cache",
       Expires: "0",
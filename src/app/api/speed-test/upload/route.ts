@@ -2,10 +2,21 @@ import { NextResponse } from "next/server";
 
 export async function POST(request: Request) {
   try {
-    // Just receive the data, the actual test is measuring how long it takes to upload
-    await request.arrayBuffer();
+    // Just receive the data, the actual test is measuring how long it takes
+    // to upload. Drain the stream instead of buffering the whole body.
+    let bytes = 0;
+    if (request.body) {
+      const reader = request.body.getReader();
+      for (
+        let chunk = await reader.read();
+        !chunk.done;
+        chunk = await reader.read()
+      ) {
+        bytes += chunk.value.length;
+      }
+    }
 
-    return new NextResponse(JSON.stringify({ success: true }), {
+    return new NextResponse(JSON.stringify({ success: true, bytes }), {
       status: 200,
       headers: { "Content-Type": "application/json" },
     });
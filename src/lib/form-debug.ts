@@ -46,6 +46,7 @@ export async function submitFormWithDebug(
 
     if (useFormspree) {
       // Make the actual FormSpree request via our proxy to avoid CORS issues
+      const started = Date.now();
       const response = await fetch("/api/debug/form-proxy", {
         method: "POST",
         headers: {
@@ -56,6 +57,7 @@ export async function submitFormWithDebug(
           form_name: formName,
         }),
       });
+      const durationMs = Date.now() - started;
 
       // Get the response data
       let responseData;
@@ -75,6 +77,7 @@ export async function submitFormWithDebug(
           status_text: response.statusText,
           response_data: responseData,
           form_name: formName,
+          duration_ms: durationMs,
         },
       );
 
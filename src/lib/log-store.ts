@@ -0,0 +1,499 @@
+/**
+ * Append-only segmented log store
+ *
+ * Log entries are appended as newline-delimited JSON to segment files in a
+ * directory. Each segment has a fixed-width index next to it, so appends
+ * never rewrite existing data and cursor reads binary search the index
+ * instead of parsing every entry:
+ *
+ *   <dir>/<first id, 16 digits>.log   one JSON entry per line
+ *   <dir>/<first id, 16 digits>.idx   24-byte records: int64 id, int64
+ *                                     timestamp (epoch ms), int64 byte offset
+ *                                     of the entry in the .log (little-endian)
+ *   <dir>/meta.json                   server_info (start time, last cleared)
+ *
+ * The active (newest) segment is rotated once it reaches maxSegmentBytes.
+ * Retention drops whole segments, oldest first, once the store holds more
+ * than maxEntries entries or a segment's newest entry is older than
+ * maxAgeDays. log_store.py reads the same files and compacts them.
+ */
+
+import fs from "fs";
+import path from "path";
+
+export const INDEX_RECORD_SIZE = 24;
+
+// Index records read per chunk when scanning a segment
+const SCAN_CHUNK = 256;
+
+export interface LogEntry {
+  id: string;
+  timestamp: string;
+  type: string;
+  message: string;
+  data: any;
+}
+
+export interface NewLogEntry {
+  type: string;
+  message: string;
+  data?: any;
+}
+
+export interface LogFilter {
+  type?: string;
+  search?: string;
+}
+
+export interface LogPage {
+  logs: LogEntry[];
+  has_more: boolean;
+  next_cursor: string | null;
+}
+
+export interface LogStoreOptions {
+  dir: string;
+  maxSegmentBytes: number;
+  maxEntries: number;
+  maxAgeDays: number;
+}
+
+// Store options, overridable with DEBUG_LOG_SEGMENT_BYTES,
+// DEBUG_LOG_MAX_ENTRIES and DEBUG_LOG_RETENTION_DAYS (0 disables the age limit)
+export function logStoreOptions(dir: string): LogStoreOptions {
+  const env = (name: string, fallback: number) => {
+    const value = Number(process.env[name]);
+    return Number.isFinite(value) && process.env[name] !== ""
+      ? value
+      : fallback;
+  };
+  return {
+    dir,
+    maxSegmentBytes: env("DEBUG_LOG_SEGMENT_BYTES", 1024 * 1024),
+    maxEntries: env("DEBUG_LOG_MAX_ENTRIES", 10000),
+    maxAgeDays: env("DEBUG_LOG_RETENTION_DAYS", 30),
+  };
+}
+
+interface IndexRecord {
+  id: number;
+  ts: number;
+  offset: number;
+}
+
+function segmentName(firstId: number) {
+  return firstId.toString().padStart(16, "0");
+}
+
+// Entry fields a get_logs request may select with `fields`
+export const LOG_FIELDS = ["id", "timestamp", "type", "message", "data"];
+
+// Valid requested fields, always including id (the paging cursor); null for all
+export function selectedFields(fields: unknown): string[] | null {
+  if (!Array.isArray(fields)) {
+    return null;
+  }
+  const selected = LOG_FIELDS.filter(
+    (field) => field === "id" || fields.includes(field),
+  );
+  return selected.length === LOG_FIELDS.length ? null : selected;
+}
+
+// Keep only the selected fields of an entry
+export function projectLog(log: LogEntry, fields: string[]) {
+  const projected: Partial<LogEntry> = {};
+  for (const field of fields) {
+    (projected as any)[field] = (log as any)[field];
+  }
+  return projected;
+}
+
+// Apply the optional type and search filters of a get_logs request
+export function matchesFilter(log: LogEntry, filter?: LogFilter | null) {
+  if (filter?.type && log.type !== filter.type) {
+    return false;
+  }
+  if (filter?.search) {
+    const searchTerm = filter.search.toLowerCase();
+    return Boolean(
+      (log.message && log.message.toLowerCase().includes(searchTerm)) ||
+        (log.type && log.type.toLowerCase().includes(searchTerm)),
+    );
+  }
+  return true;
+}
+
+export class LogStore {
+  readonly options: LogStoreOptions;
+  private lastId = 0;
+
+  constructor(options: LogStoreOptions) {
+    this.options = options;
+    fs.mkdirSync(options.dir, { recursive: true });
+  }
+
+  private logPath(segment: string) {
+    return path.join(this.options.dir, `${segment}.log`);
+  }
+
+  private indexPath(segment: string) {
+    return path.join(this.options.dir, `${segment}.idx`);
+  }
+
+  // Segment names, oldest first
+  segments() {
+    return fs
+      .readdirSync(this.options.dir)
+      .filter((name) => name.endsWith(".idx"))
+      .map((name) => name.slice(0, -4))
+      .sort();
+  }
+
+  private recordCount(segment: string) {
+    try {
+      return Math.floor(
+        fs.statSync(this.indexPath(segment)).size / INDEX_RECORD_SIZE,
+      );
+    } catch {
+      return 0;
+    }
+  }
+
+  private readRecords(fd: number, start: number, count: number) {
+    const buffer = Buffer.alloc(count * INDEX_RECORD_SIZE);
+    const bytes = fs.readSync(
+      fd,
+      buffer,
+      0,
+      buffer.length,
+      start * INDEX_RECORD_SIZE,
+    );
+    const records: IndexRecord[] = [];
+    for (
+      let pos = 0;
+      pos + INDEX_RECORD_SIZE <= bytes;
+      pos += INDEX_RECORD_SIZE
+    ) {
+      records.push({
+        id: Number(buffer.readBigInt64LE(pos)),
+        ts: Number(buffer.readBigInt64LE(pos + 8)),
+        offset: Number(buffer.readBigInt64LE(pos + 16)),
+      });
+    }
+    return records;
+  }
+
+  // First record index in the segment with an id above the cursor
+  // (binary search)
+  private upperBound(fd: number, count: number, cursor: number) {
+    let low = 0;
+    let high = count;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.readRecords(fd, mid, 1)[0].id <= cursor) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  // Parse the entries for records [start, end) of a segment
+  private readEntries(
+    segment: string,
+    indexFd: number,
+    start: number,
+    end: number,
+    count: number,
+  ) {
+    if (start >= end) {
+      return [];
+    }
+    const first = this.readRecords(indexFd, start, 1)[0].offset;
+    const fd = fs.openSync(this.logPath(segment), "r");
+    try {
+      const stop =
+        end < count
+          ? this.readRecords(indexFd, end, 1)[0].offset
+          : fs.fstatSync(fd).size;
+      const buffer = Buffer.alloc(stop - first);
+      fs.readSync(fd, buffer, 0, buffer.length, first);
+      // Lines past the last indexed record (an interrupted append) are ignored
+      return buffer
+        .toString("utf8")
+        .split("\n")
+        .slice(0, end - start)
+        .map((line) => JSON.parse(line) as LogEntry);
+    } finally {
+      fs.closeSync(fd);
+    }
+  }
+
+  // Last segment whose first id is at or below the cursor
+  private segmentFor(segments: string[], cursor: number) {
+    let low = 0;
+    let high = segments.length - 1;
+    let found = 0;
+    while (low <= high) {
+      const mid = (low + high) >> 1;
+      if (Number(segments[mid]) <= cursor) {
+        found = mid;
+        low = mid + 1;
+      } else {
+        high = mid - 1;
+      }
+    }
+    return found;
+  }
+
+  // Entries newer than the cursor, oldest first, read lazily chunk by chunk
+  *entriesAfter(afterId: string | number): Generator<LogEntry> {
+    const cursor = Number(afterId) || 0;
+    const segments = this.segments();
+    for (let i = this.segmentFor(segments, cursor); i < segments.length; i++) {
+      let fd: number;
+      try {
+        fd = fs.openSync(this.indexPath(segments[i]), "r");
+      } catch {
+        continue; // removed by retention or compaction
+      }
+      try {
+        const count = Math.floor(fs.fstatSync(fd).size / INDEX_RECORD_SIZE);
+        for (
+          let start = this.upperBound(fd, count, cursor);
+          start < count;
+          start += SCAN_CHUNK
+        ) {
+          yield* this.readEntries(
+            segments[i],
+            fd,
+            start,
+            Math.min(start + SCAN_CHUNK, count),
+            count,
+          );
+        }
+      } finally {
+        fs.closeSync(fd);
+      }
+    }
+  }
+
+  // Entries older than the cursor (or all entries), newest first
+  *entriesBefore(beforeId?: string | number | null): Generator<LogEntry> {
+    const cursor =
+      beforeId === undefined || beforeId === null
+        ? Infinity
+        : Number(beforeId) || 0;
+    const segments = this.segments();
+    if (segments.length === 0) {
+      return;
+    }
+    const last =
+      cursor === Infinity
+        ? segments.length - 1
+        : this.segmentFor(segments, cursor - 1);
+    for (let i = last; i >= 0; i--) {
+      let fd: number;
+      try {
+        fd = fs.openSync(this.indexPath(segments[i]), "r");
+      } catch {
+        continue;
+      }
+      try {
+        const count = Math.floor(fs.fstatSync(fd).size / INDEX_RECORD_SIZE);
+        let end =
+          cursor === Infinity ? count : this.upperBound(fd, count, cursor - 1);
+        while (end > 0) {
+          const start = Math.max(end - SCAN_CHUNK, 0);
+          yield* this.readEntries(segments[i], fd, start, end, count).reverse();
+          end = start;
+        }
+      } finally {
+        fs.closeSync(fd);
+      }
+    }
+  }
+
+  // One page of a get_logs request: after_id pages run oldest first,
+  // otherwise newest first
+  page(options: {
+    afterId?: string | number | null;
+    beforeId?: string | number | null;
+    limit: number;
+    filter?: LogFilter | null;
+  }): LogPage {
+    const source =
+      options.afterId !== undefined && options.afterId !== null
+        ? this.entriesAfter(options.afterId)
+        : this.entriesBefore(options.beforeId);
+    const logs: LogEntry[] = [];
+    let hasMore = false;
+    for (const log of source) {
+      if (!matchesFilter(log, options.filter)) {
+        continue;
+      }
+      if (logs.length === options.limit) {
+        hasMore = true;
+        break;
+      }
+      logs.push(log);
+    }
+    return {
+      logs,
+      has_more: hasMore,
+      next_cursor: hasMore ? logs[logs.length - 1].id : null,
+    };
+  }
+
+  latestId() {
+    const segments = this.segments();
+    for (let i = segments.length - 1; i >= 0; i--) {
+      const count = this.recordCount(segments[i]);
+      if (count > 0) {
+        const fd = fs.openSync(this.indexPath(segments[i]), "r");
+        try {
+          return this.readRecords(fd, count - 1, 1)[0].id.toString();
+        } finally {
+          fs.closeSync(fd);
+        }
+      }
+    }
+    return null;
+  }
+
+  count() {
+    return this.segments().reduce(
+      (total, segment) => total + this.recordCount(segment),
+      0,
+    );
+  }
+
+  // Append entries (oldest first) with fresh, strictly increasing ids
+  append(entries: NewLogEntry[]) {
+    const timestamp = new Date().toISOString();
+    this.lastId = Math.max(this.lastId, Number(this.latestId()) || 0);
+    const logs = entries.map((entry) => {
+      this.lastId = Math.max(Date.now(), this.lastId + 1);
+      return {
+        id: this.lastId.toString(),
+        timestamp,
+        type: entry.type,
+        message: entry.message,
+        data: entry.data ?? null,
+      };
+    });
+    this.write(logs);
+    return logs;
+  }
+
+  // Write complete entries, which must have ids above the newest stored id
+  write(logs: LogEntry[]) {
+    if (logs.length === 0) {
+      return;
+    }
+    const segments = this.segments();
+    let segment = segments[segments.length - 1];
+    let size = 0;
+    if (segment !== undefined) {
+      try {
+        size = fs.statSync(this.logPath(segment)).size;
+      } catch {}
+    }
+    const rotate =
+      segment === undefined || size >= this.options.maxSegmentBytes;
+    if (rotate) {
+      segment = segmentName(Number(logs[0].id));
+      size = 0;
+    }
+
+    const lines: Buffer[] = [];
+    const index = Buffer.alloc(logs.length * INDEX_RECORD_SIZE);
+    logs.forEach((log, i) => {
+      const line = Buffer.from(JSON.stringify(log) + "\n", "utf8");
+      const pos = i * INDEX_RECORD_SIZE;
+      index.writeBigInt64LE(BigInt(log.id), pos);
+      index.writeBigInt64LE(BigInt(Date.parse(log.timestamp) || 0), pos + 8);
+      index.writeBigInt64LE(BigInt(size), pos + 16);
+      lines.push(line);
+      size += line.length;
+    });
+
+    // Data first, so an interrupted append never indexes a missing line
+    fs.appendFileSync(this.logPath(segment), Buffer.concat(lines));
+    fs.appendFileSync(this.indexPath(segment), index);
+
+    if (rotate) {
+      this.enforceRetention();
+    }
+  }
+
+  // Drop whole segments beyond maxEntries or older than maxAgeDays (never the
+  // active one)
+  enforceRetention() {
+    const segments = this.segments();
+    const counts = segments.map((segment) => this.recordCount(segment));
+    let total = counts.reduce((sum, count) => sum + count, 0);
+    const cutoff =
+      this.options.maxAgeDays > 0
+        ? Date.now() - this.options.maxAgeDays * 86400000
+        : 0;
+
+    for (let i = 0; i < segments.length - 1; i++) {
+      let expired = false;
+      if (cutoff && counts[i] > 0) {
+        const fd = fs.openSync(this.indexPath(segments[i]), "r");
+        try {
+          expired = this.readRecords(fd, counts[i] - 1, 1)[0].ts < cutoff;
+        } finally {
+          fs.closeSync(fd);
+        }
+      }
+      if (!expired && total - counts[i] < this.options.maxEntries) {
+        break;
+      }
+      this.removeSegment(segments[i]);
+      total -= counts[i];
+    }
+  }
+
+  private removeSegment(segment: string) {
+    for (const file of [this.indexPath(segment), this.logPath(segment)]) {
+      try {
+        fs.unlinkSync(file);
+      } catch {}
+    }
+  }
+
+  clear() {
+    for (const segment of this.segments()) {
+      this.removeSegment(segment);
+    }
+  }
+
+  // Path of a file that changes whenever entries are appended (for change
+  // polling)
+  activeIndexPath() {
+    const segments = this.segments();
+    return segments.length
+      ? this.indexPath(segments[segments.length - 1])
+      : null;
+  }
+
+  // server_info kept next to the segments
+  readMeta(): Record<string, any> {
+    try {
+      return JSON.parse(
+        fs.readFileSync(path.join(this.options.dir, "meta.json"), "utf8"),
+      );
+    } catch {
+      return {};
+    }
+  }
+
+  writeMeta(meta: Record<string, any>) {
+    const file = path.join(this.options.dir, "meta.json");
+    fs.writeFileSync(`${file}.tmp`, JSON.stringify(meta, null, 2), "utf8");
+    fs.renameSync(`${file}.tmp`, file);
+  }
+}
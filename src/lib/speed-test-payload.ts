@@ -0,0 +1,41 @@
+/**
+ * Payload for /api/speed-test/download
+ *
+ * The bytes are random so nothing between the server and the client can
+ * compress them, but they don't need to be new on every request: one block
+ * is filled with crypto.randomFillSync the first time it is needed and every
+ * download is a view of it. Filling 5 MB with a per-byte Math.random loop on
+ * each request cost more CPU than sending it (see
+ * benchmarks/bench_speed_payload.mjs).
+ */
+import { randomFillSync } from "crypto";
+
+export const DEFAULT_DOWNLOAD_BYTES = 5 * 1024 * 1024;
+
+// The route is public, so ?size= can't ask for more than the component's
+// download; clients that want more volume use parallel or repeated requests
+export const MAX_DOWNLOAD_BYTES = DEFAULT_DOWNLOAD_BYTES;
+
+let block: Uint8Array | null = null;
+
+function payloadBlock() {
+  if (!block) {
+    block = randomFillSync(new Uint8Array(DEFAULT_DOWNLOAD_BYTES));
+  }
+  return block;
+}
+
+// The ?size= of a download in bytes, clamped to MAX_DOWNLOAD_BYTES
+export function downloadSize(value: string | null) {
+  const size = value === null ? DEFAULT_DOWNLOAD_BYTES : Number(value);
+  if (!Number.isFinite(size) || size < 0) {
+    return DEFAULT_DOWNLOAD_BYTES;
+  }
+  return Math.min(Math.floor(size), MAX_DOWNLOAD_BYTES);
+}
+
+// A body of `size` (at most MAX_DOWNLOAD_BYTES) random bytes without
+// copying or generating any
+export function downloadBody(size: number) {
+  return payloadBlock().subarray(0, size);
+}
@@ -0,0 +1,194 @@
+/**
+ * Response encoding for the debug-server protocol
+ *
+ * get_logs pages can carry large `data` payloads, so they are sent as
+ * MessagePack instead of JSON when the client accepts application/msgpack,
+ * and compressed with brotli or gzip according to Accept-Encoding. Clients
+ * that send neither header get plain JSON, as before.
+ */
+import { promisify } from "util";
+import zlib from "zlib";
+
+export const MSGPACK_TYPE = "application/msgpack";
+
+// Smaller bodies aren't worth compressing
+const MIN_COMPRESS_BYTES = 1024;
+
+// Brotli's default quality (11) is meant for static assets; 4 compresses
+// better than gzip at a similar speed
+const BROTLI_QUALITY = 4;
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+// Whether an Accept or Accept-Encoding header allows a value (q=0 refuses it)
+export function accepts(header: string | null, value: string) {
+  if (!header) {
+    return false;
+  }
+  return header.split(",").some((part) => {
+    const [token, ...params] = part.trim().toLowerCase().split(";");
+    if (token.trim() !== value) {
+      return false;
+    }
+    const q = params
+      .map((param) => param.trim())
+      .find((param) => param.startsWith("q="));
+    return !q || Number(q.slice(2)) > 0;
+  });
+}
+
+// Growable buffer for the MessagePack encoder
+class Writer {
+  buffer = Buffer.allocUnsafe(4096);
+  length = 0;
+
+  reserve(bytes: number) {
+    if (this.length + bytes > this.buffer.length) {
+      const grown = Buffer.allocUnsafe(
+        Math.max(this.buffer.length * 2, this.length + bytes),
+      );
+      this.buffer.copy(grown, 0, 0, this.length);
+      this.buffer = grown;
+    }
+    const offset = this.length;
+    this.length += bytes;
+    return offset;
+  }
+
+  byte(value: number) {
+    const offset = this.reserve(1);
+    this.buffer[offset] = value;
+  }
+
+  header(
+    small: number,
+    tag8: number | null,
+    tag16: number,
+    tag32: number,
+    size: number,
+    smallLimit: number,
+  ) {
+    if (size < smallLimit) {
+      this.byte(small | size);
+    } else if (tag8 !== null && size < 0x100) {
+      this.byte(tag8);
+      this.byte(size);
+    } else if (size < 0x10000) {
+      this.byte(tag16);
+      const offset = this.reserve(2);
+      this.buffer.writeUInt16BE(size, offset);
+    } else {
+      this.byte(tag32);
+      const offset = this.reserve(4);
+      this.buffer.writeUInt32BE(size, offset);
+    }
+  }
+}
+
+function writeNumber(writer: Writer, value: number) {
+  if (!Number.isInteger(value)) {
+    writer.byte(0xcb);
+    const offset = writer.reserve(8);
+    writer.buffer.writeDoubleBE(value, offset);
+  } else if (value >= 0 && value < 0x80) {
+    writer.byte(value);
+  } else if (value < 0 && value >= -32) {
+    writer.byte(value & 0xff);
+  } else if (value >= 0 && value <= 0xffffffff) {
+    writer.byte(0xce);
+    const offset = writer.reserve(4);
+    writer.buffer.writeUInt32BE(value, offset);
+  } else if (value >= -0x80000000 && value < 0) {
+    writer.byte(0xd2);
+    const offset = writer.reserve(4);
+    writer.buffer.writeInt32BE(value, offset);
+  } else if (Number.isSafeInteger(value)) {
+    writer.byte(0xd3);
+    const offset = writer.reserve(8);
+    writer.buffer.writeBigInt64BE(BigInt(value), offset);
+  } else {
+    writer.byte(0xcb);
+    const offset = writer.reserve(8);
+    writer.buffer.writeDoubleBE(value, offset);
+  }
+}
+
+function writeValue(writer: Writer, value: any) {
+  if (value === null || value === undefined) {
+    writer.byte(0xc0);
+  } else if (value === false || value === true) {
+    writer.byte(value ? 0xc3 : 0xc2);
+  } else if (typeof value === "number") {
+    writeNumber(writer, value);
+  } else if (typeof value === "string") {
+    const size = Buffer.byteLength(value);
+    writer.header(0xa0, 0xd9, 0xda, 0xdb, size, 32);
+    const offset = writer.reserve(size);
+    writer.buffer.write(value, offset, size, "utf8");
+  } else if (value instanceof Uint8Array) {
+    writer.header(0, 0xc4, 0xc5, 0xc6, value.length, 0);
+    const offset = writer.reserve(value.length);
+    writer.buffer.set(value, offset);
+  } else if (Array.isArray(value)) {
+    writer.header(0x90, null, 0xdc, 0xdd, value.length, 16);
+    for (const item of value) {
+      writeValue(writer, item);
+    }
+  } else if (typeof value.toJSON === "function") {
+    writeValue(writer, value.toJSON());
+  } else {
+    // Like JSON.stringify, drop keys whose value is undefined
+    const keys = Object.keys(value).filter((key) => value[key] !== undefined);
+    writer.header(0x80, null, 0xde, 0xdf, keys.length, 16);
+    for (const key of keys) {
+      writeValue(writer, key);
+      writeValue(writer, value[key]);
+    }
+  }
+}
+
+// MessagePack encoding of a JSON-compatible value
+export function encodeMsgpack(value: unknown): Buffer {
+  const writer = new Writer();
+  writeValue(writer, value);
+  return writer.buffer.subarray(0, writer.length);
+}
+
+// A JSON or MessagePack response, compressed if the client accepts it
+export async function encodedResponse(
+  request: Request,
+  body: unknown,
+  init: ResponseInit = {},
+) {
+  const msgpack = accepts(request.headers.get("accept"), MSGPACK_TYPE);
+  let payload: Buffer = msgpack
+    ? encodeMsgpack(body)
+    : Buffer.from(JSON.stringify(body), "utf8");
+  const headers = new Headers(init.headers);
+  headers.set("Content-Type", msgpack ? MSGPACK_TYPE : "application/json");
+  headers.set("Vary", "Accept, Accept-Encoding");
+
+  const acceptEncoding = request.headers.get("accept-encoding");
+  if (payload.length >= MIN_COMPRESS_BYTES) {
+    if (accepts(acceptEncoding, "br")) {
+      payload = await brotliCompress(payload, {
+        params: {
+          [zlib.constants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY,
+          [zlib.constants.BROTLI_PARAM_SIZE_HINT]: payload.length,
+        },
+      });
+      headers.set("Content-Encoding", "br");
+    } else if (accepts(acceptEncoding, "gzip")) {
+      payload = await gzip(payload);
+      headers.set("Content-Encoding", "gzip");
+    }
+  }
+  return new Response(
+    new Uint8Array(payload.buffer, payload.byteOffset, payload.length),
+    {
+      ...init,
+      headers,
+    },
+  );
+}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Deployment targets shared by debug_client.py and form_test.py.
+
+A target is a name and a site's base URL. Targets come from a
+comma-separated --server/--url value, or from a file with one target per
+line ("name url" or just "url"; blank lines and # comments are ignored).
+Either the site URL or its debug server URL may be given; each tool takes
+the URL it needs. Without a name, a target is named after its host.
+
+Example targets file:
+  # name        url
+  preview       https://preview.example.com
+  staging       https://staging.example.com
+  prod-eu       https://eu.example.com/api/debug-server
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEBUG_SERVER_PATH = "/api/debug-server"
+
+class Target:
+    """One deployment: a display name and the site's base URL"""
+
+    def __init__(self, name: str, base_url: str):
+        self.name = name
+        self.base_url = base_url
+
+    @property
+    def debug_server_url(self) -> str:
+        return self.base_url + DEBUG_SERVER_PATH
+
+    def __repr__(self) -> str:
+        return f"Target({self.name!r}, {self.base_url!r})"
+
+def parse_target(spec: str, name: Optional[str] = None) -> Target:
+    """Target for a URL (site or debug server), optionally written as name=url"""
+    spec = spec.strip()
+    if name is None and "=" in spec.split("://", 1)[0]:
+        name, spec = (part.strip() for part in spec.split("=", 1))
+    url = spec.rstrip("/")
+    if url.endswith(DEBUG_SERVER_PATH):
+        url = url[:-len(DEBUG_SERVER_PATH)]
+    return Target(name or urlsplit(url).netloc or url, url)
+
+def read_targets_file(path: str) -> List[Target]:
+    targets = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            targets.append(parse_target(parts[-1], parts[0] if len(parts) > 1 else None))
+    return targets
+
+def load_targets(spec: Optional[str], targets_file: Optional[str] = None) -> List[Target]:
+    """Targets from a comma-separated spec and/or a targets file, with unique names"""
+    targets = [parse_target(part) for part in (spec or "").split(",") if part.strip()]
+    if targets_file:
+        targets += read_targets_file(targets_file)
+    seen: dict = {}
+    for target in targets:
+        count = seen[target.name] = seen.get(target.name, 0) + 1
+        if count > 1:
+            target.name = f"{target.name}#{count}"
+    return targets
+
+def fan_out(targets: List[Target], fn: Callable[[Target], Any],
+            max_workers: Optional[int] = None) -> List[Tuple[Target, Any, Optional[BaseException]]]:
+    """Call fn(target) for every target concurrently.
+
+    Returns (target, result, error) in target order; error is the exception
+    fn raised (including SystemExit), with result None. Total time is that
+    of the slowest target.
+    """
+    def call(target: Target) -> Tuple[Target, Any, Optional[BaseException]]:
+        try:
+            return target, fn(target), None
+        except (Exception, SystemExit) as e:
+            return target, None, e
+
+    if len(targets) == 1:
+        return [call(targets[0])]
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets), thread_name_prefix="target") as executor:
+        return list(executor.map(call, targets))
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
 Simple script to test a single form submission directly to FormSpree
+
+Usage:
+  python test_single_form.py [--stats] [--metrics-file PATH] [--statsd HOST:PORT]
 """
 
-import requests
+import argparse
 import json
+import os
 import sys
 
-# FormSpree endpoint
-FORMSPREE_ENDPOINT = "https://formspree.io/f/xzzeddgr"
+from instrumentation import add_instrumentation_arguments, instrumented_session, setup_instrumentation, timed
+
+# FormSpree endpoint. FORMSPREE_BASE_URL redirects it to a local stand-in
+# (see mock_server.py); FORM_TOOLS_BASE_URL deliberately doesn't, since it
+# may point at a real deployment
+FORMSPREE_BASE_URL = os.environ.get("FORMSPREE_BASE_URL", "https://formspree.io").rstrip("/")
+FORMSPREE_ENDPOINT = f"{FORMSPREE_BASE_URL}/f/xzzeddgr"
 
 # Test data
 test_data = {
@@ -21,14 +30,15 @@ def test_form():
     print("Testing form submission directly to FormSpree...")
     
     # Send the request
-    response = requests.post(
-        FORMSPREE_ENDPOINT,
-        json=test_data,
-        headers={
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-    )
+    with instrumented_session() as session, timed("formspree.submit") as timing:
+        response = timing.set_response(session.post(
+            FORMSPREE_ENDPOINT,
+            json=test_data,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            }
+        ))
     
     # Print result
     print(f"Status code: {response.status_code}")
@@ -43,5 +53,8 @@ def test_form():
     return response.status_code == 200
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test a single form submission directly to FormSpree")
+    add_instrumentation_arguments(parser)
+    setup_instrumentation(parser.parse_args())
     success = test_form()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Tests for replay.py against the local stand-in server (mock_server.py)
+
+Usage:
+  python -m unittest discover tests
+"""
+
+import copy
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import start_server  # noqa: E402
+from replay import Replayer, extract_submissions  # noqa: E402
+
+FORM_DATA = {"name": "Replay Test", "email": "replay@example.com", "message": "Hello"}
+
+# What form-debug.ts writes for one submission through /api/debug/form-proxy:
+# the attempt, then the response with the proxy's whole body as response_data
+FORM_DEBUG_LOGS = [
+    {
+        "id": "1700000000000",
+        "timestamp": "2023-11-14T22:13:20.000Z",
+        "type": "info",
+        "message": "Form submission attempt: contactPage",
+        "data": {
+            "submission_time": "2023-11-14T22:13:20.000Z",
+            "form_data": FORM_DATA,
+            "form_name": "contactPage",
+        },
+    },
+    {
+        "id": "1700000000412",
+        "timestamp": "2023-11-14T22:13:20.412Z",
+        "type": "success",
+        "message": "FormSpree response for contactPage: 200",
+        "data": {
+            "status": 200,
+            "status_text": "OK",
+            "response_data": {
+                "success": True,
+                "status": 200,
+                "data": {"next": "https://formspree.io/thanks", "ok": True},
+            },
+            "form_name": "contactPage",
+            "duration_ms": 412,
+        },
+    },
+]
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.server, self.url = start_server()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def replay(self, target, logs=FORM_DEBUG_LOGS):
+        submissions = extract_submissions(logs)
+        self.assertEqual(len(submissions), 1)
+        return Replayer(self.url, target=target, speed=0).run(submissions)["results"][0]
+
+    def test_unchanged_response_has_no_diff(self):
+        for target in ("form-proxy", "form-submit"):
+            with self.subTest(target=target):
+                result = self.replay(target)
+                self.assertEqual(result["outcome"], "same")
+                self.assertEqual(result["diff"], [])
+
+    def test_changed_response_is_diffed(self):
+        logs = copy.deepcopy(FORM_DEBUG_LOGS)
+        logs[1]["data"]["response_data"]["data"]["next"] = "https://example.com/thanks"
+        result = self.replay("form-proxy", logs)
+        self.assertEqual(result["outcome"], "same")
+        self.assertEqual(len(result["diff"]), 1)
+        self.assertTrue(result["diff"][0].startswith("next: "))
+
+if __name__ == "__main__":
+    unittest.main()